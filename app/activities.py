@@ -1,17 +1,33 @@
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from application_sdk.activities import ActivitiesInterface
 from application_sdk.activities.common.models import ActivityStatistics
 from application_sdk.activities.common.utils import auto_heartbeater
-from application_sdk.clients.atlan import AtlanClient
 from application_sdk.observability.decorators.observability_decorator import observability
 from application_sdk.observability.logger_adaptor import get_logger
 from application_sdk.observability.metrics_adaptor import get_metrics
 from application_sdk.observability.traces_adaptor import get_traces
 from temporalio import activity
-import yake
-from app.clients import GitHubClient
-import json
+from app.cache import get_response_cache
+from app.checkpoint import get_pagination_checkpointer
+from app.clients import ENRICHMENT_FIELDS, GitHubClient, RepositoryFilter, get_connection_pool
+from app.coalescing import get_request_coalescer
+from app.incremental import (
+    get_full_listing_interval,
+    get_snapshot_store,
+    merge_repositories,
+    needs_full_listing,
+    reconcile_repositories,
+)
+from app.instrumentation import get_request_instrumentation
+from app.keywords import get_keyword_engine
+from app.ratelimit import get_rate_limit_scheduler
+from app.records import repository_key
+from app.storage import is_reference, load_records, store_records
+from app.tokens import get_token_pool
+from app.writers import RecordWriter, output_file_name, write_json
+from dataclasses import asdict
+import asyncio
 import os
 
 logger = get_logger(__name__)
@@ -21,18 +37,98 @@ traces = get_traces()
 
 username = os.getenv("GITHUB_USERNAME")
 pat = os.getenv("GITHUB_PAT")
+page_concurrency = int(os.getenv("GITHUB_PAGE_CONCURRENCY", "4"))
+api_mode = os.getenv("GITHUB_API_MODE", "rest")
+output_format = os.getenv("GITHUB_OUTPUT_FORMAT", "json")
+output_compression = os.getenv("GITHUB_OUTPUT_COMPRESSION", "none")
+parquet_output = os.getenv("GITHUB_PARQUET_OUTPUT", "false").lower() in ("1", "true", "yes")
+enrich_concurrency = int(os.getenv("GITHUB_ENRICH_CONCURRENCY", "16"))
+readme_max_chars = int(os.getenv("GITHUB_README_MAX_CHARS", "20000"))
+# Repositories enriched between two enrichment checkpoints.
+enrich_checkpoint_repos = int(os.getenv("GITHUB_ENRICH_CHECKPOINT_REPOS", "100"))
+
+
+def _get_github_client(**kwargs: Any) -> GitHubClient:
+    """
+    Builds a GitHubClient wired to the worker-wide connection pool, response cache, rate-limit
+    budget (or token pool, when several tokens are configured), request coalescer and request
+    instrumentation.
+
+    :param kwargs: Extra GitHubClient options, e.g. page_concurrency.
+    :return: The configured client.
+    """
+    return GitHubClient(
+        pat=pat,
+        pool=get_connection_pool(),
+        cache=get_response_cache(),
+        scheduler=get_rate_limit_scheduler(),
+        tokens=get_token_pool(),
+        api_mode=api_mode,
+        instrumentation=get_request_instrumentation(),
+        coalescer=get_request_coalescer(),
+        **kwargs,
+    )
+
+
+def _get_username(workflow_args: Dict[str, Any]) -> Optional[str]:
+    """
+    Resolves the account to extract: the workflow's ``username`` argument, else GITHUB_USERNAME.
+    """
+    return workflow_args.get("username") or username
+
+
+def _repository_filter(workflow_args: Dict[str, Any]) -> RepositoryFilter:
+    """
+    Builds the repository filter from the workflow arguments ``repo_type``, ``visibility``,
+    ``sort``, ``direction``, ``exclude_forks`` and ``exclude_archived``.
+    """
+    return RepositoryFilter(
+        type=workflow_args.get("repo_type"),
+        visibility=workflow_args.get("visibility") or "public",
+        sort=workflow_args.get("sort"),
+        direction=workflow_args.get("direction"),
+        exclude_forks=bool(workflow_args.get("exclude_forks")),
+        exclude_archived=bool(workflow_args.get("exclude_archived")),
+    )
+
+
+def _output_path(output_dir: str, file_name: str) -> str:
+    """
+    Places an output file under the account's output directory (the working directory by default).
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, file_name)
+
+
+def _record_writer(output_dir: str, stem: str) -> RecordWriter:
+    """
+    Builds the streaming writer of a record list output, in the configured format and compression.
+    """
+    return RecordWriter(
+        _output_path(output_dir, output_file_name(stem, output_format, output_compression)),
+        output_format=output_format,
+        compression=output_compression,
+    )
+
+
 class GitHubActivities(ActivitiesInterface):
     
     @observability(logger=logger, metrics=metrics, traces=traces)
     @activity.defn
     @auto_heartbeater
     async def preflight_check(self, workflow_args: Dict[str, Any]) -> Optional[ActivityStatistics]:
-        """Performs a preflight check using the provided PAT."""
+        """
+        Performs a preflight check using the provided PAT.
+
+        The profile fetched here is kept by the worker's request coalescer, so the user
+        metadata activity that follows is usually served without a second API call.
+        """
         try:
-            if not pat:
+            if not pat and get_token_pool() is None:
                 raise ValueError("Personal Access Token (PAT) is missing.")
-            client = GitHubClient(pat=pat)
-            await client.get_user_metadata(username=username)
+            client = _get_github_client()
+            await client.get_user_metadata(username=_get_username(workflow_args))
             logger.info("Preflight check passed successfully.")
             return None
         except Exception as e:
@@ -49,87 +145,219 @@ class GitHubActivities(ActivitiesInterface):
         :param workflow_args: The workflow arguments, including the GitHub username and PAT.
         :return: A dictionary containing the user's metadata.
         """
-        client = GitHubClient(pat=pat)
-        user_metadata= await client.get_user_metadata(username=username)
-        output_file = "github_user_metadata.json"
-        with open(output_file, "w") as f:
-            json.dump(user_metadata, f, indent=4)
+        account = _get_username(workflow_args)
+        client = _get_github_client()
+        user_metadata= await client.get_user_metadata(username=account)
+        output_file = _output_path(workflow_args.get("output_dir", ""), "github_user_metadata.json")
+        await write_json(output_file, user_metadata)
         
-        print(f"Successfully extracted metadata for '{username}' and saved it to '{output_file}'.")
+        print(f"Successfully extracted metadata for '{account}' and saved it to '{output_file}'.")
         return user_metadata
 
+    # Heartbeats are sent by the pagination checkpointer instead of @auto_heartbeater,
+    # whose detail-less heartbeats would overwrite the checkpoint.
     @observability(logger=logger, metrics=metrics, traces=traces)
     @activity.defn
-    @auto_heartbeater
-    async def fetch_repositories_metadata_activity(self, workflow_args: Dict[str, Any]) -> list[Dict[str, Any]]:
+    async def fetch_repositories_metadata_activity(self, workflow_args: Dict[str, Any]) -> Union[list[Dict[str, Any]], Dict[str, Any]]:
         """
-        Fetches metadata for all public repositories of a user or organization.
+        Fetches metadata for the repositories of a user or organization: all public ones, unless
+        the workflow arguments filter them (``repo_type``, ``visibility``, ``sort``, ``direction``,
+        ``exclude_forks``, ``exclude_archived``). Organizations are listed through their own endpoint.
+
+        With ``incremental`` set in the workflow arguments and a previous snapshot of the
+        account available, only repositories updated since the snapshot's watermark are
+        fetched and merged into it. Unchanged repositories keep their ``auto_tags``. Every
+        ``GITHUB_FULL_LISTING_EVERY`` runs, and whenever the filters changed, every repository
+        is listed instead and the snapshot reconciled with it, dropping deleted, renamed and
+        filtered-out repositories.
+
+        Pagination progress is checkpointed in heartbeat details, so a retried attempt
+        resumes from the last completed page instead of the first one.
+
+        With ``claim_check`` set in the workflow arguments, the list is written to the
+        claim-check store and only a reference to it is returned.
         
         :param workflow_args: The workflow arguments, including the GitHub username and PAT.
-        :return: A list of dictionaries, each containing a repository's metadata.
+        :return: A list of dictionaries, each containing a repository's metadata, or a reference to it.
         """
-        client = GitHubClient(pat=pat)
-        repository_metadata = await client.get_repositories_metadata(username=username)
-        output_file = "github_repo_metadata.json"
-        with open(output_file, "w") as f:
-            json.dump(repository_metadata, f, indent=4)
+        account = _get_username(workflow_args)
+        client = _get_github_client(page_concurrency=page_concurrency)
+        snapshot = await get_snapshot_store().load(account) if workflow_args.get("incremental") else None
+        writer = _record_writer(workflow_args.get("output_dir", ""), "github_repo_metadata")
+        filters = _repository_filter(workflow_args)
+        listing_args: Dict[str, Any] = {"filters": filters}
+        if api_mode != "graphql":
+            # Served from the request memo when the user metadata activity just fetched it.
+            owner = await client.get_user_metadata(account)
+            listing_args["owner_type"] = owner.get("type")
+            listing_args["public_repos"] = owner.get("public_repos")
+        async with get_pagination_checkpointer() as checkpointer, writer:
+            checkpoint = checkpointer.restore()
+            if snapshot and not needs_full_listing(snapshot, asdict(filters), get_full_listing_interval()):
+                excluded: list[str] = []
+                changed = await client.get_repositories_metadata(
+                    username=account, updated_since=snapshot["watermark"], checkpoint=checkpoint, excluded=excluded, **listing_args
+                )
+                repository_metadata = merge_repositories(snapshot["repos"], changed, excluded)
+                logger.info(
+                    f"Incremental extraction for '{account}': {len(changed)} of {len(repository_metadata)} repositories changed "
+                    f"since {snapshot['watermark']}."
+                )
+                writer.write(repository_metadata)
+            elif snapshot:
+                current = await client.get_repositories_metadata(username=account, checkpoint=checkpoint, **listing_args)
+                repository_metadata = reconcile_repositories(snapshot["repos"], current)
+                logger.info(
+                    f"Full listing for '{account}': reconciled the snapshot of {len(snapshot['repos'])} repositories "
+                    f"with {len(repository_metadata)} listed."
+                )
+                writer.write(repository_metadata)
+            else:
+                # Stream pages to the output file as they complete, starting with those of a resumed attempt.
+                writer.write(checkpoint.repos)
+                checkpoint.add_listener(lambda _, page_repos: writer.write(page_repos))
+                repository_metadata = await client.get_repositories_metadata(username=account, checkpoint=checkpoint, **listing_args)
+                # Anything the listing returned without reporting it as a page.
+                writer.write(repository_metadata[writer.count:])
         
-        print(f"Successfully extracted metadata for '{username}' and saved it to '{output_file}'.")
+        print(f"Successfully extracted metadata for '{account}' and saved it to '{writer.path}'.")
+        if workflow_args.get("claim_check"):
+            return await store_records(repository_metadata, "repositories")
         return repository_metadata
     
+    # Heartbeats are sent by the pagination checkpointer, as in fetch_repositories_metadata_activity.
+    @observability(logger=logger, metrics=metrics, traces=traces)
+    @activity.defn
+    async def enrich_repositories_activity(
+        self, workflow_args: Dict[str, Any], repo_metadata: Union[list[Dict[str, Any]], Dict[str, Any]]
+    ) -> Union[list[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Adds per-repository details to the listed repositories: language bytes, topics,
+        contributor count and README text.
+
+        ``enrich`` in the workflow arguments selects the fields: ``true`` for all of them or a
+        list of field names. Repositories that already carry every selected field (e.g. carried
+        over unchanged from an incremental snapshot) are not fetched again.
+
+        Repositories are enriched in chunks of GITHUB_ENRICH_CHECKPOINT_REPOS, and every
+        finished chunk is checkpointed in heartbeat details, so a retried attempt (e.g. after
+        hitting the activity timeout on a large organization) only enriches the rest.
+
+        :param workflow_args: The workflow arguments, including the GitHub username and ``enrich``.
+        :param repo_metadata: A list of dictionaries, each containing a repository's metadata, or a claim-check reference to it.
+        :return: The enriched list, or a reference to it when given one.
+        """
+        enrich = workflow_args.get("enrich")
+        fields = ENRICHMENT_FIELDS if enrich is True else tuple(enrich or ())
+        reference = repo_metadata if is_reference(repo_metadata) else None
+        repo_metadata = await load_records(repo_metadata)
+        pending = [repo for repo in repo_metadata if any(field not in repo for field in fields)]
+        if pending and fields:
+            client = _get_github_client(readme_max_chars=readme_max_chars)
+            async with get_pagination_checkpointer() as checkpointer:
+                checkpoint = checkpointer.restore()
+                enriched = {repository_key(repo): repo for repo in checkpoint.repos}
+                for repo in pending:
+                    repo.update(enriched.get(repository_key(repo), {}))
+                remaining = [repo for repo in pending if repository_key(repo) not in enriched]
+                for start in range(0, len(remaining), enrich_checkpoint_repos):
+                    chunk = remaining[start:start + enrich_checkpoint_repos]
+                    await client.enrich_repositories(_get_username(workflow_args), chunk, fields, concurrency=enrich_concurrency)
+                    checkpoint.advance(len(checkpoint.repos) + len(chunk), chunk)
+        logger.info(f"Enriched {len(pending)} of {len(repo_metadata)} repositories with {', '.join(fields) or 'no fields'}.")
+        if reference is not None:
+            return await store_records(repo_metadata, "repositories_enriched")
+        return repo_metadata
+
     @observability(logger=logger, metrics=metrics, traces=traces)
     @activity.defn
     @auto_heartbeater
-    async def extract_keywords_activity(self, repo_metadata: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+    async def extract_keywords_activity(
+        self, repo_metadata: Union[list[Dict[str, Any]], Dict[str, Any]], output_dir: str = ""
+    ) -> Union[list[Dict[str, Any]], Dict[str, Any]]:
         """
         Extracts keywords from repository descriptions and adds them as tags.
+        Repositories enriched with their README are scored on the description and the README text.
+        Repositories that already carry ``auto_tags`` are left as they are.
         
-        :param repo_metadata: A list of dictionaries, each containing a repository's metadata.
-        :return: The updated list of dictionaries with added keyword tags.
+        :param repo_metadata: A list of dictionaries, each containing a repository's metadata, or a claim-check reference to it.
+        :param output_dir: Directory for the output file; the working directory by default.
+        :return: The updated list of dictionaries with added keyword tags, or a reference to it when given one.
         """
-        kw_extractor = yake.KeywordExtractor(top=5) # Initialize YAKE with a limit of 5 keywords
-        for repo in repo_metadata:
-            description = repo.get("description")
-            if description:
-                keywords = [kw[0] for kw in kw_extractor.extract_keywords(description)]
-                repo["auto_tags"] = keywords
-            else:
-                repo["auto_tags"] = []
+        reference = repo_metadata if is_reference(repo_metadata) else None
+        repo_metadata = await load_records(repo_metadata)
+        # YAKE is CPU-bound; the engine scores batches in worker processes so the event loop stays free.
+        # Repositories carried over unchanged from an incremental snapshot are already tagged.
+        pending = [repo for repo in repo_metadata if "auto_tags" not in repo]
+        keyword_engine = get_keyword_engine()
+        texts = ["\n\n".join(filter(None, [repo.get("description"), repo.get("readme")])) for repo in pending]
+        keywords = await keyword_engine.extract(texts)
+        for repo, repo_keywords in zip(pending, keywords):
+            repo["auto_tags"] = repo_keywords
+        if keyword_engine.cache is not None:
+            logger.info(f"Keyword cache stats: {keyword_engine.cache.stats()}")
 
-        output_file = "github_repo_metadata_with_tags.json"
-        with open(output_file, "w") as f:
-            json.dump(repo_metadata, f, indent=4)
+        async with _record_writer(output_dir, "github_repo_metadata_with_tags") as writer:
+            writer.write(repo_metadata)
         
-        logger.info(f"Successfully extracted keywords and saved the updated metadata to '{output_file}'.")
+        logger.info(f"Successfully extracted keywords and saved the updated metadata to '{writer.path}'.")
+        if reference is not None:
+            return await store_records(repo_metadata, "repositories_with_tags")
         return repo_metadata
     
     @observability(logger=logger, metrics=metrics, traces=traces)
     @activity.defn
     @auto_heartbeater
-    async def fetch_data_quality_metrics_activity(self, raw_data) -> Dict[str, Any]:
+    async def fetch_data_quality_metrics_activity(self, raw_data, output_dir: str = "") -> Dict[str, Any]:
         """
         Calculates data quality metrics from the extracted metadata.
+
+        The repositories are converted to an Arrow table once and every metric is computed
+        over its columns. With GITHUB_PARQUET_OUTPUT set, the table is also written as
+        ``github_repo_metadata.parquet`` next to the other output files.
         
-        :param raw_data: A dictionary containing 'user_data' and 'repo_data'.
+        :param raw_data: A dictionary containing 'user_data' and 'repo_data' (inline or a claim-check reference).
+        :param output_dir: Directory for the output file; the working directory by default.
         :return: A dictionary containing the calculated data quality metrics.
         """
+        # pyarrow is imported on first use to keep it out of worker startup.
+        from app.columnar import compute_quality_metrics, repositories_to_table, write_parquet
+
         print("type of raw_data in activity:", type(raw_data))
         user_metadata = raw_data.get("user_data", {})
-        repo_metadata = raw_data.get("repo_data", [])
-        # Calculate metrics
-        quality_metrics = {
-            "total_public_repos": len(repo_metadata),
-            "total_followers": user_metadata.get("followers", 0),
-            "total_following": user_metadata.get("following", 0),
-            "average_stars_per_repo": sum(repo.get("star_count", 0) for repo in repo_metadata) / len(repo_metadata) if repo_metadata else 0,
-            "total_public_gists": user_metadata.get("public_gists", 0),
-            "repos_with_description_percentage": (sum(1 for repo in repo_metadata if repo.get("description")) / len(repo_metadata)) * 100 if repo_metadata else 0,
-            "repos_with_auto_tags_percentage": (sum(1 for repo in repo_metadata if repo.get("auto_tags")) / len(repo_metadata)) * 100 if repo_metadata else 0,
-        }
-
-        output_file = "github_quality_metrics.json"
-        with open(output_file, "w") as f:
-            json.dump(quality_metrics, f, indent=4)
+        repo_metadata = await load_records(raw_data.get("repo_data", []))
+        table = await asyncio.to_thread(repositories_to_table, repo_metadata, user_metadata.get("login"))
+        quality_metrics = await asyncio.to_thread(compute_quality_metrics, table, user_metadata)
+        if parquet_output:
+            await write_parquet(table, _output_path(output_dir, "github_repo_metadata.parquet"))
+
+        output_file = _output_path(output_dir, "github_quality_metrics.json")
+        await write_json(output_file, quality_metrics)
 
         logger.info("Successfully calculated data quality metrics and saved them to '%s'.", output_file)
-        return quality_metrics
\ No newline at end of file
+        return quality_metrics
+
+    @observability(logger=logger, metrics=metrics, traces=traces)
+    @activity.defn
+    @auto_heartbeater
+    async def save_repository_snapshot_activity(
+        self, workflow_args: Dict[str, Any], repo_metadata: Union[list[Dict[str, Any]], Dict[str, Any]]
+    ) -> Optional[str]:
+        """
+        Stores the tagged repositories as the account's snapshot for the next incremental run.
+
+        The snapshot records the filters of the run and how many incremental runs happened
+        since the last full listing, which decide whether the next run lists everything.
+
+        :param workflow_args: The workflow arguments, including the GitHub username.
+        :param repo_metadata: The full list of tagged repository metadata, or a claim-check reference to it.
+        :return: The new ``updated_at`` watermark of the account.
+        """
+        account = _get_username(workflow_args)
+        store = get_snapshot_store()
+        filters = asdict(_repository_filter(workflow_args))
+        # The same decision fetch_repositories_metadata_activity made from the previous snapshot.
+        previous = await store.load(account) if workflow_args.get("incremental") else None
+        full = previous is None or needs_full_listing(previous, filters, get_full_listing_interval())
+        runs_since_full = 0 if full else previous.get("runs_since_full", 0) + 1
+        return await store.save(account, await load_records(repo_metadata), filters, runs_since_full)
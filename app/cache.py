@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+logger = get_logger(__name__)
+
+# Response headers worth replaying when a cached body is served for a 304.
+CACHED_RESPONSE_HEADERS = ("etag", "last-modified", "link", "content-type")
+
+
+@dataclass
+class CachedResponse:
+    """
+    A GitHub API response kept for conditional revalidation.
+
+    Attributes:
+        content: The raw response body.
+        headers: The subset of response headers needed to replay the response (see CACHED_RESPONSE_HEADERS).
+    """
+
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self.headers.get("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self.headers.get("last-modified")
+
+
+def build_cache_key(url: str, authorization: Optional[str]) -> str:
+    """
+    Builds a cache key from a request URL and the identity it was made with.
+
+    The credential itself is never stored; only a short digest of it is used so that
+    responses fetched with different tokens (and therefore different visibility) do not mix.
+
+    :param url: The request URL, including its query string.
+    :param authorization: The Authorization header value, if any.
+    :return: The cache key.
+    """
+    identity = hashlib.sha256(authorization.encode()).hexdigest()[:16] if authorization else "anonymous"
+    return f"{identity}:{url}"
+
+
+class ResponseCache(ABC):
+    """
+    Interface for conditional-request cache backends used by GitHubClient.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Returns the cached response for a key, or None on a miss.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, response: CachedResponse) -> None:
+        """
+        Stores a response, evicting the least recently used entries beyond the size bound.
+        """
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    LRU cache kept in the worker's memory, bounded by entry count and by total body size.
+
+    Listing pages and README bodies run to hundreds of KB, so the byte bound is what keeps a
+    long-running worker's memory in check. A body larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of cached responses.
+            max_bytes: Maximum total size of the cached response bodies.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous.content)
+        if len(response.content) > self.max_bytes:
+            return
+        self._entries[key] = response
+        self.size += len(response.content)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted.content)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Size-bounded LRU cache persisted to a local SQLite file, so it survives worker restarts.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        """
+        Args:
+            path: Path of the SQLite database file. Created if it does not exist.
+            max_entries: Maximum number of cached responses.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, content BLOB NOT NULL, headers TEXT NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _get(self, key: str) -> Optional[CachedResponse]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT content, headers FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return CachedResponse(content=row[0], headers=json.loads(row[1]))
+
+    def _set(self, key: str, response: CachedResponse) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, headers, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response.content, json.dumps(response.headers), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        await asyncio.to_thread(self._set, key, response)
+
+
+_response_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Gets or creates the process-wide response cache.
+
+    The backend is selected from the environment on first use:
+    ``GITHUB_CACHE_BACKEND`` (``memory``, ``sqlite`` or ``none``; default ``memory``),
+    ``GITHUB_CACHE_PATH`` (SQLite file, default ``.github_cache/responses.sqlite``),
+    ``GITHUB_CACHE_MAX_ENTRIES`` and ``GITHUB_CACHE_MAX_MB`` (body budget of the memory backend, default 64).
+
+    :return: The shared cache, or None when caching is disabled.
+    """
+    global _response_cache_instance
+    if _response_cache_instance is None:
+        backend = os.getenv("GITHUB_CACHE_BACKEND", "memory").lower()
+        max_entries = os.getenv("GITHUB_CACHE_MAX_ENTRIES")
+        if backend == "sqlite":
+            _response_cache_instance = SQLiteResponseCache(
+                path=os.getenv("GITHUB_CACHE_PATH", os.path.join(".github_cache", "responses.sqlite")),
+                max_entries=int(max_entries or 10000),
+            )
+        elif backend == "memory":
+            _response_cache_instance = InMemoryResponseCache(
+                max_entries=int(max_entries or 1024),
+                max_bytes=int(float(os.getenv("GITHUB_CACHE_MAX_MB", "64")) * 1024 * 1024),
+            )
+        elif backend != "none":
+            raise ValueError(f"Unknown GITHUB_CACHE_BACKEND '{backend}'. Expected 'memory', 'sqlite' or 'none'.")
+    return _response_cache_instance
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from application_sdk.observability.logger_adaptor import get_logger
+from temporalio import activity
+
+from app.clients import PaginationCheckpoint
+from app.records import dumps, loads
+
+logger = get_logger(__name__)
+
+# Matches auto_heartbeater: without a configured heartbeat timeout, assume two minutes.
+DEFAULT_HEARTBEAT_TIMEOUT = timedelta(seconds=120)
+
+# Checkpoint files left behind by activities that stopped retrying are removed after this long.
+DEFAULT_MAX_AGE = timedelta(days=1)
+
+
+class ActivityPaginationCheckpointer:
+    """
+    Checkpoints the pagination progress of an activity through Temporal heartbeats.
+
+    Collected repositories are appended to a local NDJSON file as pages complete, and each
+    heartbeat carries a small reference to it: the position to resume from, the file path and
+    the number of records it holds. A retried attempt of the same activity reads the last
+    heartbeat details and resumes from the last completed page, as long as it runs on a worker
+    that can see the file; otherwise it starts from the first page.
+
+    Pages are appended in a worker thread, one at a time and in order, and a page is only
+    heartbeated once it is on disk. A file is kept when its activity fails, for the retry; the
+    files of activities that never come back are removed once they are older than ``max_age``.
+
+    Use it as an async context manager inside an activity. It replaces @auto_heartbeater for
+    that activity, since the decorator's empty heartbeats would overwrite the checkpoint.
+    Outside of an activity it is a no-op.
+    """
+
+    def __init__(self, base_dir: str, max_age: timedelta = DEFAULT_MAX_AGE):
+        """
+        Args:
+            base_dir: Directory for the checkpoint files.
+            max_age: Age after which a checkpoint file is considered abandoned and removed.
+        """
+        self.base_dir = base_dir
+        self.max_age = max_age
+        self.path: Optional[str] = None
+        self._details: Optional[Dict[str, Any]] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._write_task: Optional[asyncio.Task] = None
+
+    def _remove_abandoned(self) -> None:
+        """
+        Removes checkpoint files not written to for longer than ``max_age``.
+        """
+        cutoff = time.time() - self.max_age.total_seconds()
+        for entry in os.scandir(self.base_dir):
+            try:
+                if entry.is_file() and entry.name.endswith(".ndjson") and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    logger.info(f"Removed abandoned pagination checkpoint '{entry.path}'.")
+            except FileNotFoundError:
+                # Removed concurrently by another activity.
+                pass
+
+    def restore(self) -> PaginationCheckpoint:
+        """
+        Builds the checkpoint to paginate with, resumed from the last heartbeat if there is one.
+
+        :return: A PaginationCheckpoint that reports progress back to this checkpointer.
+        """
+        if not activity.in_activity():
+            return PaginationCheckpoint()
+
+        info = activity.info()
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._remove_abandoned()
+        self.path = os.path.join(self.base_dir, f"{info.workflow_id}-{info.workflow_run_id}-{info.activity_id}.ndjson")
+
+        repos = []
+        position = None
+        details = info.heartbeat_details[0] if info.heartbeat_details else None
+        if details and details.get("path") == self.path and os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if len(repos) == details["count"]:
+                        break
+                    repos.append(loads(line))
+            if len(repos) == details["count"]:
+                position = details["position"]
+                logger.info(f"Resuming pagination at {position!r} with {len(repos)} repositories from attempt {info.attempt - 1}.")
+            else:
+                repos = []
+
+        # Drop records written after the last heartbeat; they will be fetched again.
+        with open(self.path, "wb") as f:
+            for repo in repos:
+                f.write(dumps(repo) + b"\n")
+        checkpoint = PaginationCheckpoint(position=position, repos=repos)
+        checkpoint.add_listener(self._on_advance)
+        return checkpoint
+
+    def _on_advance(self, checkpoint: PaginationCheckpoint, page_repos: List[Dict[str, Any]]) -> None:
+        """
+        Queues the newly completed repositories for appending to the checkpoint file.
+        """
+        details = {"position": checkpoint.position, "path": self.path, "count": len(checkpoint.repos)}
+        self._write_task = asyncio.create_task(self._append(self._write_task, page_repos, details))
+
+    def _write(self, page_repos: List[Dict[str, Any]]) -> None:
+        with open(self.path, "ab") as f:
+            f.write(b"".join(dumps(repo) + b"\n" for repo in page_repos))
+
+    async def _append(
+        self, previous: Optional[asyncio.Task], page_repos: List[Dict[str, Any]], details: Dict[str, Any]
+    ) -> None:
+        """
+        Appends a page after the previous one, off the event loop, then heartbeats the reference.
+        """
+        if previous is not None:
+            await previous
+        await asyncio.to_thread(self._write, page_repos)
+        self._details = details
+        activity.heartbeat(details)
+
+    async def _heartbeat_periodically(self, delay: float) -> None:
+        """
+        Keeps heartbeating the latest checkpoint while no page completes (e.g. during rate-limit waits).
+        """
+        while True:
+            await asyncio.sleep(delay)
+            if self._details is not None:
+                activity.heartbeat(self._details)
+            else:
+                activity.heartbeat()
+
+    async def __aenter__(self) -> "ActivityPaginationCheckpointer":
+        if activity.in_activity():
+            timeout = activity.info().heartbeat_timeout or DEFAULT_HEARTBEAT_TIMEOUT
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_periodically(timeout.total_seconds() / 3))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        if self._write_task is not None:
+            try:
+                await self._write_task
+            except Exception:
+                if exc_type is None:
+                    raise
+                # The activity already failed; the retry resumes from the last page written.
+        # Keep the file for a retried attempt; remove it once the listing succeeded.
+        if exc_type is None and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def get_pagination_checkpointer() -> ActivityPaginationCheckpointer:
+    """
+    Returns a checkpointer writing under ``GITHUB_STATE_DIR/checkpoints`` (default ``.github_state/checkpoints``).
+    Abandoned checkpoint files are removed after ``GITHUB_CHECKPOINT_MAX_AGE_HOURS`` (default ``24``).
+    """
+    return ActivityPaginationCheckpointer(
+        os.path.join(os.getenv("GITHUB_STATE_DIR", ".github_state"), "checkpoints"),
+        max_age=timedelta(hours=float(os.getenv("GITHUB_CHECKPOINT_MAX_AGE_HOURS", "24"))),
+    )
@@ -1,13 +1,408 @@
 
+import asyncio
+import importlib.util
+import math
+import os
+import uuid
 import httpx
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 import time
 
 from application_sdk.clients.base import BaseClient
 from application_sdk.observability.logger_adaptor import get_logger
 
+from app.cache import CACHED_RESPONSE_HEADERS, CachedResponse, ResponseCache, build_cache_key
+from app.coalescing import RequestCoalescer
+from app.instrumentation import RequestInstrumentation
+from app.ratelimit import RateLimitScheduler, is_rate_limited, rate_limit_resource
+from app.records import Repository, User, decode, decode_list, dumps, loads, project
+from app.tokens import TokenPool
+
 logger = get_logger(__name__)
 
+GITHUB_API_URL = "https://api.github.com"
+REPOS_PER_PAGE = 100
+
+# Per-repository details fetched by GitHubClient.enrich_repositories, one sub-resource request each.
+ENRICHMENT_FIELDS = ("languages", "topics", "contributor_count", "readme")
+
+GRAPHQL_USER_QUERY = """
+query($login: String!) {
+  repositoryOwner(login: $login) {
+    __typename
+    login
+    id
+    url
+    avatarUrl
+    repositories(privacy: PUBLIC, ownerAffiliations: OWNER) { totalCount }
+    ... on User {
+      name
+      bio
+      company
+      location
+      email
+      websiteUrl
+      twitterUsername
+      createdAt
+      followers { totalCount }
+      following { totalCount }
+      gists(privacy: PUBLIC) { totalCount }
+    }
+    ... on Organization {
+      name
+      description
+      location
+      email
+      websiteUrl
+      twitterUsername
+      createdAt
+    }
+  }
+}
+"""
+
+GRAPHQL_REPOSITORIES_QUERY = """
+query($login: String!, $cursor: String, $orderBy: RepositoryOrder!, $privacy: RepositoryPrivacy, $isFork: Boolean, $isArchived: Boolean) {
+  repositoryOwner(login: $login) {
+    repositories(
+      first: 100, after: $cursor, privacy: $privacy, ownerAffiliations: OWNER, orderBy: $orderBy,
+      isFork: $isFork, isArchived: $isArchived
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        primaryLanguage { name }
+        stargazerCount
+        forkCount
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        createdAt
+        updatedAt
+        url
+        isFork
+        isArchived
+        isPrivate
+      }
+    }
+  }
+}
+"""
+
+
+class GitHubConnectionPool:
+    """
+    Process-wide pool of keep-alive (and, when available, HTTP/2) connections to the GitHub API.
+
+    httpx transports are bound to the event loop they were first used on, so the pool keeps
+    one transport per running loop. Every GitHubClient borrowing from the pool gets a
+    lightweight httpx.AsyncClient carrying its own auth headers on top of that shared
+    transport, so activities reuse warm connections instead of paying a new TCP+TLS
+    handshake each time. Call aclose() once when the worker shuts down.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        base_url: str = GITHUB_API_URL,
+        transport_factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+    ):
+        """
+        Initializes the pool configuration. Connections are opened lazily on first use.
+
+        Args:
+            max_connections: Upper bound on open connections per event loop.
+            max_keepalive_connections: Upper bound on idle connections kept alive per event loop.
+            keepalive_expiry: Seconds an idle connection is kept before being closed.
+            http2: Whether to negotiate HTTP/2. Ignored with a warning if the ``h2`` package is missing.
+            base_url: Base URL shared by all clients handed out by the pool.
+            transport_factory: Optional factory of the per-loop transport, replacing the
+                pooled HTTP transport (e.g. with an in-process fake API for benchmarks).
+        """
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1.")
+            http2 = False
+        self.http2 = http2
+        self.base_url = base_url
+        self.transport_factory = transport_factory
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._transports: Dict[asyncio.AbstractEventLoop, httpx.AsyncBaseTransport] = {}
+        self._clients: Dict[Tuple[asyncio.AbstractEventLoop, Tuple[Tuple[str, str], ...]], httpx.AsyncClient] = {}
+
+    def get_client(self, headers: Optional[Dict[str, str]] = None) -> httpx.AsyncClient:
+        """
+        Returns a client for the running event loop that shares the pooled transport.
+
+        :param headers: Default headers (e.g. Authorization) for the returned client.
+        :return: An httpx.AsyncClient. Callers must not close it; the pool owns its lifecycle.
+        """
+        loop = asyncio.get_running_loop()
+        self._prune_closed_loops()
+        transport = self._transports.get(loop)
+        if transport is None:
+            if self.transport_factory is not None:
+                transport = self.transport_factory()
+            else:
+                transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits)
+            self._transports[loop] = transport
+        key = (loop, tuple(sorted((headers or {}).items())))
+        client = self._clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(headers=headers or {}, base_url=self.base_url, transport=transport)
+            self._clients[key] = client
+        return client
+
+    def _prune_closed_loops(self) -> None:
+        """
+        Drops transports and clients belonging to event loops that no longer exist.
+        """
+        for loop in [loop for loop in self._transports if loop.is_closed()]:
+            del self._transports[loop]
+        for key in [key for key in self._clients if key[0].is_closed()]:
+            del self._clients[key]
+
+    async def aclose(self) -> None:
+        """
+        Closes every pooled connection. Transports owned by other, still running event loops
+        (e.g. the worker thread's loop) are closed on their own loop.
+        """
+        current_loop = asyncio.get_running_loop()
+        transports, self._transports = self._transports, {}
+        self._clients = {}
+        for loop, transport in transports.items():
+            try:
+                if loop is current_loop:
+                    await transport.aclose()
+                elif loop.is_running():
+                    future = asyncio.run_coroutine_threadsafe(transport.aclose(), loop)
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout=10)
+            except Exception as e:
+                logger.warning(f"Failed to close pooled GitHub connections: {e}")
+        logger.info("Closed pooled GitHub API connections.")
+
+
+_connection_pool_instance: Optional[GitHubConnectionPool] = None
+
+
+def get_connection_pool() -> GitHubConnectionPool:
+    """
+    Gets or creates the process-wide GitHubConnectionPool.
+
+    Pool limits are read from the environment on first use:
+    ``GITHUB_HTTP_MAX_CONNECTIONS``, ``GITHUB_HTTP_MAX_KEEPALIVE``,
+    ``GITHUB_HTTP_KEEPALIVE_EXPIRY`` and ``GITHUB_HTTP2``.
+
+    :return: The shared connection pool.
+    """
+    global _connection_pool_instance
+    if _connection_pool_instance is None:
+        _connection_pool_instance = GitHubConnectionPool(
+            max_connections=int(os.getenv("GITHUB_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("GITHUB_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("GITHUB_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=os.getenv("GITHUB_HTTP2", "true").lower() == "true",
+        )
+    return _connection_pool_instance
+
+
+async def close_connection_pool() -> None:
+    """
+    Closes the process-wide connection pool, if one was created.
+    """
+    global _connection_pool_instance
+    if _connection_pool_instance is not None:
+        await _connection_pool_instance.aclose()
+        _connection_pool_instance = None
+
+
+class PaginationCheckpoint:
+    """
+    Progress of a paginated repository listing: where to continue and what was collected so far.
+
+    ``position`` is the next page number for REST listings, or the cursor to continue after
+    for GraphQL listings (None means the start). Listeners are called with the checkpoint and
+    the page's repositories after every completed page, e.g. to persist the progress for a
+    retried attempt or to stream the repositories to an output file.
+    """
+
+    def __init__(self, position: Any = None, repos: Optional[list[Dict[str, Any]]] = None):
+        self.position = position
+        self.repos: list[Dict[str, Any]] = repos if repos is not None else []
+        self._listeners: list[Callable[["PaginationCheckpoint", list[Dict[str, Any]]], None]] = []
+
+    def add_listener(self, listener: Callable[["PaginationCheckpoint", list[Dict[str, Any]]], None]) -> None:
+        """
+        Registers a callback invoked after every completed page.
+        """
+        self._listeners.append(listener)
+
+    def advance(self, position: Any, page_repos: list[Dict[str, Any]]) -> None:
+        """
+        Records a completed page.
+
+        :param position: Where to continue after this page.
+        :param page_repos: The repositories of the page.
+        """
+        self.repos.extend(page_repos)
+        self.position = position
+        for listener in self._listeners:
+            listener(self, page_repos)
+
+
+# Values of the listing filters accepted by GitHub (see RepositoryFilter).
+REPOSITORY_TYPES = ("all", "owner", "member", "public", "private", "forks", "sources")
+REPOSITORY_VISIBILITIES = ("all", "public", "private")
+REPOSITORY_SORTS = ("created", "updated", "pushed", "full_name")
+
+# The ``type`` values each listing endpoint accepts.
+_ENDPOINT_TYPES = {
+    "users": ("all", "owner", "member"),
+    "orgs": ("all", "public", "private", "forks", "sources", "member"),
+    "user": ("all", "owner", "public", "private", "member"),
+}
+
+_GRAPHQL_ORDER_FIELDS = {"created": "CREATED_AT", "updated": "UPDATED_AT", "pushed": "PUSHED_AT", "full_name": "NAME"}
+
+
+@dataclass
+class RepositoryFilter:
+    """
+    Which repositories a listing returns, and in which order.
+
+    Every criterion GitHub can apply on the listing endpoint in use is sent as a query
+    parameter (or GraphQL argument). The rest are applied to each page as it is decoded,
+    so filtered-out repositories are never converted, streamed or processed further.
+
+    Attributes:
+        type: GitHub's ``type`` filter: ``all``, ``owner`` or ``member`` for any account, plus
+            ``public``, ``private``, ``forks`` and ``sources`` (non-forks) for organizations
+            and the authenticated user.
+        visibility: ``public`` (default, as before), ``private`` or ``all``. Private
+            repositories are only listed for organizations and the authenticated user.
+        sort: ``created``, ``updated``, ``pushed`` or ``full_name``. None keeps GitHub's order.
+        direction: ``asc`` or ``desc``. None keeps GitHub's default for the sort.
+        exclude_forks: Drop forked repositories.
+        exclude_archived: Drop archived repositories.
+    """
+
+    type: Optional[str] = None
+    visibility: str = "public"
+    sort: Optional[str] = None
+    direction: Optional[str] = None
+    exclude_forks: bool = False
+    exclude_archived: bool = False
+
+    def __post_init__(self) -> None:
+        if self.type is not None and self.type not in REPOSITORY_TYPES:
+            raise ValueError(f"Unsupported repository type '{self.type}'. Expected one of {', '.join(REPOSITORY_TYPES)}.")
+        if self.visibility not in REPOSITORY_VISIBILITIES:
+            raise ValueError(
+                f"Unsupported repository visibility '{self.visibility}'. Expected one of {', '.join(REPOSITORY_VISIBILITIES)}."
+            )
+        if self.sort is not None and self.sort not in REPOSITORY_SORTS:
+            raise ValueError(f"Unsupported repository sort '{self.sort}'. Expected one of {', '.join(REPOSITORY_SORTS)}.")
+        if self.direction is not None and self.direction not in ("asc", "desc"):
+            raise ValueError(f"Unsupported sort direction '{self.direction}'. Expected 'asc' or 'desc'.")
+
+    def query(self, endpoint: str) -> Dict[str, str]:
+        """
+        Returns the query parameters a REST listing endpoint supports for this filter.
+
+        :param endpoint: ``users`` (``/users/{username}/repos``), ``orgs`` (``/orgs/{org}/repos``)
+            or ``user`` (``/user/repos``).
+        :return: The parameters, in a stable order.
+        """
+        params: Dict[str, str] = {}
+        if self.type in _ENDPOINT_TYPES[endpoint]:
+            params["type"] = self.type
+        elif endpoint == "orgs" and self.type is None:
+            # One ``type`` value per request: visibility first, so private data is not downloaded needlessly.
+            if self.visibility != "all":
+                params["type"] = self.visibility
+            elif self.exclude_forks:
+                params["type"] = "sources"
+        elif endpoint == "user" and self.type is None:
+            # ``type`` cannot be combined with ``visibility`` and ``affiliation`` on /user/repos.
+            params["visibility"] = self.visibility
+            params["affiliation"] = "owner"
+        if self.sort:
+            params["sort"] = self.sort
+        if self.direction:
+            params["direction"] = self.direction
+        return params
+
+    def graphql_variables(self) -> Dict[str, Any]:
+        """
+        Returns the GraphQL ``repositories`` arguments for this filter; GraphQL supports all of them.
+        """
+        is_fork = None
+        if self.exclude_forks or self.type == "sources":
+            is_fork = False
+        elif self.type == "forks":
+            is_fork = True
+        visibility = self.type if self.type in ("public", "private") else self.visibility
+        privacy = {"public": "PUBLIC", "private": "PRIVATE"}.get(visibility)
+        variables: Dict[str, Any] = {"privacy": privacy, "isFork": is_fork, "isArchived": False if self.exclude_archived else None}
+        if self.sort:
+            variables["orderBy"] = {
+                "field": _GRAPHQL_ORDER_FIELDS[self.sort],
+                "direction": (self.direction or ("asc" if self.sort == "full_name" else "desc")).upper(),
+            }
+        return variables
+
+    def matches(self, repo: Repository) -> bool:
+        """
+        Tells whether a decoded repository passes the filter. Criteria already applied by
+        GitHub always pass; ``owner`` and ``member`` cannot be checked on the repository.
+        """
+        if repo.fork and (self.exclude_forks or self.type == "sources"):
+            return False
+        if not repo.fork and self.type == "forks":
+            return False
+        if repo.archived and self.exclude_archived:
+            return False
+        visibility = self.type if self.type in ("public", "private") else self.visibility
+        if visibility == "public" and repo.private:
+            return False
+        if visibility == "private" and repo.private is False:
+            return False
+        return True
+
+
+@dataclass
+class RepositoryListing:
+    """
+    A REST repository listing: the endpoint chosen for the account and the filter applied to it.
+
+    Attributes:
+        path: ``/users/{username}/repos``, ``/orgs/{org}/repos`` or ``/user/repos``.
+        params: Query parameters sent with every page, before ``page`` and ``per_page``.
+        filter: The filter, applied client-side to the decoded pages.
+    """
+
+    path: str
+    params: Dict[str, str]
+    filter: RepositoryFilter
+
+    def url(self, page: int, per_page: int) -> str:
+        query = "".join(f"{name}={value}&" for name, value in self.params.items())
+        return f"{self.path}?{query}page={page}&per_page={per_page}"
+
+    def select(self, repos: list[Repository]) -> list[Dict[str, Any]]:
+        """
+        Converts the repositories of a decoded page that pass the filter.
+        """
+        return [repo.to_dict() for repo in repos if self.filter.matches(repo)]
+
 
 class GitHubClient(BaseClient):
     """
@@ -16,15 +411,61 @@ class GitHubClient(BaseClient):
     user and repository information.
     """
 
-    def __init__(self, pat: Optional[str] = None):
+    def __init__(
+        self,
+        pat: Optional[str] = None,
+        page_concurrency: int = 1,
+        pool: Optional[GitHubConnectionPool] = None,
+        cache: Optional[ResponseCache] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        max_rate_limit_retries: int = 3,
+        api_mode: str = "rest",
+        instrumentation: Optional[RequestInstrumentation] = None,
+        readme_max_chars: int = 20000,
+        coalescer: Optional[RequestCoalescer] = None,
+        tokens: Optional[TokenPool] = None,
+    ):
         """
         Initializes the GitHub client with a raw PAT.
         
         Args:
             pat: The GitHub Personal Access Token.
+            page_concurrency: Maximum number of repository pages fetched concurrently.
+                A value of 1 keeps the sequential page-by-page walk.
+            pool: Optional shared connection pool to borrow connections from. Without it,
+                the client opens its own connections.
+            cache: Optional conditional-request cache. When set, requests carry
+                If-None-Match / If-Modified-Since and 304 responses are served from it.
+            scheduler: Optional rate-limit scheduler pacing every request. Share one
+                instance across clients so they draw from the same quota.
+            max_rate_limit_retries: How many times a rate-limited request is retried
+                after the scheduler's back-off before the error is raised.
+            api_mode: ``rest`` (default) or ``graphql``. GraphQL mode fetches the same
+                fields with cursor-paginated queries and produces identical output.
+            instrumentation: Optional recorder of per-request metrics and spans. The calls
+                of one client are grouped under one trace.
+            readme_max_chars: README text kept per repository by enrich_repositories.
+            coalescer: Optional singleflight and short-TTL memo. Share one instance across
+                clients so identical GET and GraphQL calls of a worker share one request.
+            tokens: Optional pool of tokens used instead of ``pat``. Each request is sent
+                with the token that has the most quota left and paced by that token's own
+                scheduler, so ``scheduler`` is not used.
         """
+        if api_mode not in ("rest", "graphql"):
+            raise ValueError(f"Unsupported api_mode '{api_mode}'. Expected 'rest' or 'graphql'.")
         super().__init__()
         self.pat = pat
+        self.page_concurrency = max(1, page_concurrency)
+        self.pool = pool
+        self.cache = cache
+        self.scheduler = scheduler
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.api_mode = api_mode
+        self.instrumentation = instrumentation
+        self.readme_max_chars = readme_max_chars
+        self.coalescer = coalescer
+        self.tokens = tokens
+        self.trace_id = str(uuid.uuid4())
         self.client: Optional[httpx.AsyncClient] = None
 
     async def _get_client(self) -> httpx.AsyncClient:
@@ -33,14 +474,165 @@ class GitHubClient(BaseClient):
         """
         if self.client is None:
             headers = {}
-            if self.pat:
+            # With a token pool, the Authorization header is set per request.
+            if self.pat and self.tokens is None:
                 headers["Authorization"] = f"token {self.pat}"
                 logger.info("Using PAT for GitHub API authentication.")
-            
-            self.client = httpx.AsyncClient(headers=headers, base_url="https://api.github.com")
+
+            if self.pool is not None:
+                self.client = self.pool.get_client(headers=headers)
+            else:
+                self.client = httpx.AsyncClient(headers=headers, base_url=GITHUB_API_URL)
 
         return self.client
 
+    async def _identity(self) -> Optional[str]:
+        """
+        Returns the identity requests are made with, for cache and coalescing keys.
+        """
+        if self.tokens is not None:
+            return self.tokens.identity
+        client = await self._get_client()
+        return client.headers.get("Authorization")
+
+    async def _send(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        method: str = "GET",
+        json: Optional[Dict[str, Any]] = None,
+    ) -> httpx.Response:
+        """
+        Sends a request, pacing it through the rate-limit scheduler when one is configured.
+
+        Requests rejected by a primary or secondary rate limit are retried (up to
+        ``max_rate_limit_retries`` times) once the scheduler's back-off has elapsed,
+        instead of failing and burning a workflow retry attempt. With a token pool, each
+        attempt goes out with the token that has the most headroom, so a retry moves on to
+        another token while the rate-limited one is parked, and a token rejected with a 401
+        is dropped and the request sent again with another one.
+
+        :param url: The API path, including its query string.
+        :param headers: Optional per-request headers.
+        :param method: ``GET`` or ``POST``.
+        :param json: Optional JSON body, for POST requests.
+        :return: The HTTP response. Error statuses are not raised here.
+        """
+        client = await self._get_client()
+        send = client.get if method == "GET" else client.post
+        kwargs: Dict[str, Any] = {"headers": headers} if headers else {}
+        if json is not None:
+            kwargs["json"] = json
+        paced = self.scheduler is not None or self.tokens is not None
+        resource = rate_limit_resource(url)
+        attempts = self.max_rate_limit_retries + 1 if paced else 1
+        attempt = 0
+        while True:
+            credential = None
+            if self.tokens is not None:
+                credential, wait = await self.tokens.acquire(resource)
+                kwargs["headers"] = {**(headers or {}), "Authorization": credential.authorization}
+            else:
+                wait = await self.scheduler.acquire(resource) if self.scheduler is not None else 0.0
+            start = time.perf_counter()
+            try:
+                response = await send(url, **kwargs)
+            except Exception as e:
+                if credential is not None:
+                    self.tokens.release(credential)
+                if self.instrumentation is not None:
+                    self.instrumentation.record_request(
+                        self.trace_id, method, url, time.perf_counter() - start, attempt=attempt, throttle_wait=wait, error=e
+                    )
+                raise
+            if self.instrumentation is not None:
+                self.instrumentation.record_request(
+                    self.trace_id, method, url, time.perf_counter() - start, response, attempt=attempt, throttle_wait=wait
+                )
+            if credential is not None:
+                self.tokens.release(credential, response, resource)
+                # A revoked token does not use up a retry while other tokens remain.
+                if response.status_code == 401 and self.tokens.available():
+                    continue
+            elif self.scheduler is not None:
+                self.scheduler.update(response, resource)
+            attempt += 1
+            if not paced or not is_rate_limited(response) or attempt >= attempts:
+                break
+            logger.warning(f"Rate limited on {url} ({response.status_code}); retrying after back-off.")
+        return response
+
+    async def _coalesce(self, request: str, call: Callable[[], Awaitable[Any]], memoize: bool = False) -> Any:
+        """
+        Runs a call through the coalescer, keyed by the request and the credential it is made with.
+
+        :param request: Identity of the request, e.g. method, path and headers.
+        :param call: Makes the request.
+        :param memoize: Whether the coalescer may keep the response for its TTL; only for small ones.
+        :return: The call's result, possibly shared with other callers.
+        """
+        if self.coalescer is None:
+            return await call()
+        return await self.coalescer.run(build_cache_key(request, await self._identity()), call, memoize)
+
+    async def _get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        Performs a GET request against the GitHub API and raises on error statuses.
+
+        With a coalescer configured, identical concurrent GETs share one request. Profile
+        responses (``/users/{username}`` and ``/user``) are also reused for the coalescer's
+        TTL; larger ones such as listing pages are not kept. Callers must not modify them.
+
+        :param url: The API path, including its query string.
+        :param headers: Optional per-request headers, e.g. a media type in Accept.
+        :return: The HTTP response.
+        """
+        request = f"GET {url} {sorted((headers or {}).items())}" if headers else f"GET {url}"
+        memoize = url == "/user" or (url.startswith("/users/") and url.count("/") == 2 and "?" not in url)
+        return await self._coalesce(request, lambda: self._get_uncoalesced(url, headers), memoize)
+
+    async def _get_uncoalesced(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """
+        Sends the GET request of _get and raises on error statuses.
+
+        With a response cache configured, the request is made conditional on the cached
+        ETag / Last-Modified values, and a 304 Not Modified (which does not count against
+        the rate limit) is answered from the cache.
+
+        :param url: The API path, including its query string.
+        :param headers: Optional per-request headers, e.g. a media type in Accept.
+        :return: The HTTP response.
+        """
+        if self.cache is None:
+            response = await self._send(url, headers)
+            response.raise_for_status()
+            return response
+
+        key = build_cache_key(url, await self._identity())
+        cached = await self.cache.get(key)
+        conditional_headers = dict(headers or {})
+        if cached is not None:
+            if cached.etag:
+                conditional_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                conditional_headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self._send(url, conditional_headers)
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Serving {url} from the response cache (304 Not Modified).")
+            return httpx.Response(200, content=cached.content, headers=cached.headers, request=response.request)
+
+        response.raise_for_status()
+        if "etag" in response.headers or "last-modified" in response.headers:
+            await self.cache.set(
+                key,
+                CachedResponse(
+                    content=response.content,
+                    headers={name: response.headers[name] for name in CACHED_RESPONSE_HEADERS if name in response.headers},
+                ),
+            )
+        return response
+
     async def get_user_metadata(self, username: str) -> Dict[str, Any]:
         """
         Fetches metadata for a given GitHub user or organization, with fallback values.
@@ -48,34 +640,14 @@ class GitHubClient(BaseClient):
         :param username: The GitHub username or organization name.
         :return: A dictionary containing the user's metadata with default values for missing data.
         """
-        client = await self._get_client()
         url = f"/users/{username}"
         try:
-            response = await client.get(url)
-            response.raise_for_status()
-            user_data = response.json()
-            print(user_data)
-            return {
-                "name": user_data.get("name") or user_data.get("login") or "N/A",
-                "node_id": user_data.get("node_id", "N/A"),
-                "profile_url": user_data.get("html_url") or "N/A",
-                'avatar_url': user_data.get("avatar_url") or "N/A",
-                "bio": user_data.get("bio") or "No bio provided.",
-                "type": user_data.get("type", "N/A"),
-                "company": user_data.get("company") or "N/A",
-                "location": user_data.get("location") or "N/A",
-                "email": user_data.get("email") or "N/A",
-                "blog": user_data.get("blog") or "N/A",
-                "twitter_username": user_data.get("twitter_username") or "N/A",
-                "created_at": user_data.get("created_at") or "N/A",
-                "followers": user_data.get("followers", 0),
-                "following": user_data.get("following", 0),
-                "followers_url": user_data.get("followers_url", "N/A"),
-                "following_url": user_data.get("following_url", "N/A"),
-                "public_repos": user_data.get("public_repos", 0),
-                "public_gists": user_data.get("public_gists", 0),
-                "created_at": user_data.get("created_at") or "N/A",
-            }
+            if self.api_mode == "graphql":
+                return project(User, await self._get_user_graphql(username)).to_dict()
+            response = await self._get(url)
+            user = decode(response.content, User)
+            logger.debug(f"Fetched user data for {username}: {user}")
+            return user.to_dict()
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error fetching user data for {username}: {e.response.status_code} - {e.response.text}")
             raise
@@ -83,45 +655,451 @@ class GitHubClient(BaseClient):
             logger.error(f"An error occurred while fetching user data for {username}: {e}")
             raise
 
-    async def get_repositories_metadata(self, username: str) -> list[Dict[str, Any]]:
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Runs a query against the GitHub GraphQL API.
+
+        :param query: The GraphQL query document.
+        :param variables: The query variables.
+        :return: The ``data`` member of the response.
+        :raises RuntimeError: If GitHub reports errors for the query.
+        """
+        body = {"query": query, "variables": variables}
+        # Queries are read-only, so identical ones are coalesced like GETs.
+        response = await self._coalesce(
+            f"POST /graphql {dumps(body).decode()}", lambda: self._send_graphql(body), memoize=query == GRAPHQL_USER_QUERY
+        )
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", str(error)) for error in payload["errors"])
+            raise RuntimeError(f"GitHub GraphQL query failed: {messages}")
+        return payload["data"]
+
+    async def _send_graphql(self, body: Dict[str, Any]) -> httpx.Response:
+        """
+        Sends a GraphQL request body and raises on error statuses.
+        """
+        response = await self._send("/graphql", method="POST", json=body)
+        response.raise_for_status()
+        return response
+
+    async def _get_user_graphql(self, username: str) -> Dict[str, Any]:
+        """
+        Fetches a user or organization profile with GraphQL, shaped like the REST ``/users/{username}`` object.
+
+        :param username: The GitHub username or organization name.
+        :return: A REST-shaped user object.
+        """
+        data = await self._graphql(GRAPHQL_USER_QUERY, {"login": username})
+        owner = data.get("repositoryOwner")
+        if owner is None:
+            raise ValueError(f"GitHub account '{username}' was not found.")
+        login = owner["login"]
+        is_user = owner["__typename"] == "User"
+        return {
+            "login": login,
+            "name": owner.get("name"),
+            "node_id": owner.get("id"),
+            "html_url": owner.get("url"),
+            "avatar_url": owner.get("avatarUrl"),
+            "bio": owner.get("bio") if is_user else owner.get("description"),
+            "type": owner["__typename"],
+            "company": owner.get("company"),
+            "location": owner.get("location"),
+            "email": owner.get("email"),
+            "blog": owner.get("websiteUrl"),
+            "twitter_username": owner.get("twitterUsername"),
+            "created_at": owner.get("createdAt"),
+            "followers": (owner.get("followers") or {}).get("totalCount", 0),
+            "following": (owner.get("following") or {}).get("totalCount", 0),
+            "followers_url": f"{GITHUB_API_URL}/users/{login}/followers",
+            "following_url": f"{GITHUB_API_URL}/users/{login}/following{{/other_user}}",
+            "public_repos": owner["repositories"]["totalCount"],
+            "public_gists": (owner.get("gists") or {}).get("totalCount", 0),
+        }
+
+    async def _get_repositories_graphql(
+        self,
+        username: str,
+        checkpoint: PaginationCheckpoint,
+        updated_since: Optional[str] = None,
+        filters: Optional[RepositoryFilter] = None,
+    ) -> list[Dict[str, Any]]:
         """
-        Fetches all public repositories for a given user or organization.
+        Fetches the repositories owned by a user or organization with cursor-paginated GraphQL queries.
+
+        Only the fields we extract are requested, and each node is shaped like a REST repository
+        object, so the result matches the REST path exactly. Open issue counts include open pull
+        requests, as REST's ``open_issues_count`` does. Privacy, fork and archived filters and
+        the sort order are all applied by GitHub.
+
+        :param username: The GitHub username or organization name.
+        :param checkpoint: Pagination progress; its position is the cursor to resume after.
+        :param updated_since: Optional watermark; repositories are then walked most recently
+            updated first and pagination stops at the first one updated before it.
+        :param filters: Optional filter; defaults to public repositories ordered by name.
+        :return: A list of repository metadata dictionaries.
+        """
+        cursor = checkpoint.position
+        filters = filters or RepositoryFilter()
+        variables = {"orderBy": {"field": "NAME", "direction": "ASC"}, **filters.graphql_variables()}
+        if updated_since:
+            variables["orderBy"] = {"field": "UPDATED_AT", "direction": "DESC"}
+        while True:
+            data = await self._graphql(
+                GRAPHQL_REPOSITORIES_QUERY, {"login": username, "cursor": cursor, **variables}
+            )
+            owner = data.get("repositoryOwner")
+            if owner is None:
+                raise ValueError(f"GitHub account '{username}' was not found.")
+            connection = owner["repositories"]
+            page_repos = []
+            for node in connection["nodes"]:
+                if updated_since and node["updatedAt"] < updated_since:
+                    checkpoint.advance(None, page_repos)
+                    return checkpoint.repos
+                repo = Repository(
+                    name=node["name"],
+                    full_name=node.get("nameWithOwner"),
+                    description=node.get("description"),
+                    language=(node.get("primaryLanguage") or {}).get("name"),
+                    stargazers_count=node["stargazerCount"],
+                    forks_count=node["forkCount"],
+                    open_issues_count=node["issues"]["totalCount"] + node["pullRequests"]["totalCount"],
+                    created_at=node["createdAt"],
+                    updated_at=node["updatedAt"],
+                    html_url=node["url"],
+                    fork=node.get("isFork"),
+                    archived=node.get("isArchived"),
+                    private=node.get("isPrivate"),
+                )
+                # GitHub already applied the filter; this only guards against it being widened.
+                if filters.matches(repo):
+                    page_repos.append(repo.to_dict())
+            cursor = connection["pageInfo"]["endCursor"]
+            checkpoint.advance(cursor, page_repos)
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+        return checkpoint.repos
+
+    @staticmethod
+    def _get_last_page(response: httpx.Response) -> Optional[int]:
+        """
+        Reads the last page number from the ``Link`` header of a paginated response.
+
+        :param response: The response of the first page request.
+        :return: The last page number, or None if the header does not advertise one.
+        """
+        last = response.links.get("last")
+        if not last or not last.get("url"):
+            return None
+        page = httpx.URL(last["url"]).params.get("page")
+        return int(page) if page and page.isdigit() else None
+
+    async def _fetch_repositories_page(self, listing: RepositoryListing, page: int, per_page: int) -> httpx.Response:
+        """
+        Fetches a single page of a repository listing.
+
+        :param listing: The listing endpoint and its query parameters.
+        :param page: The 1-based page number.
+        :param per_page: The number of repositories per page.
+        :return: The raw HTTP response for the page.
+        """
+        return await self._get(listing.url(page, per_page))
+
+    async def _is_authenticated_user(self, username: str) -> bool:
+        """
+        Tells whether the client's token belongs to the given user.
+
+        Only a single personal access token can be matched; a token pool never is, since
+        its tokens may belong to different users.
+        """
+        if self.tokens is not None or not self.pat:
+            return False
+        response = await self._get("/user")
+        return str(loads(response.content).get("login", "")).lower() == username.lower()
+
+    async def _repository_listing(
+        self, username: str, owner_type: Optional[str], filters: RepositoryFilter, updated_since: Optional[str]
+    ) -> RepositoryListing:
+        """
+        Picks the REST listing endpoint for an account and the query parameters it supports.
+
+        Organizations are listed through ``/orgs/{org}/repos``, which filters by visibility
+        and forks server-side. Private repositories of a user are only listed through
+        ``/user/repos``, for the user the token belongs to; every other account goes through
+        ``/users/{username}/repos``.
+
+        :param username: The GitHub username or organization name.
+        :param owner_type: The account's ``type`` (``User`` or ``Organization``), if known.
+        :param filters: The filter to apply.
+        :param updated_since: Optional watermark; it forces the most recently updated first order.
+        :return: The listing.
+        """
+        if updated_since:
+            filters = replace(filters, sort="updated", direction="desc")
+        if owner_type == "Organization":
+            return RepositoryListing(f"/orgs/{username}/repos", filters.query("orgs"), filters)
+        if filters.visibility != "public" or filters.type == "private":
+            if await self._is_authenticated_user(username):
+                return RepositoryListing("/user/repos", filters.query("user"), filters)
+            logger.warning(
+                f"Private repositories of '{username}' can only be listed with the user's own token; listing public ones."
+            )
+        return RepositoryListing(f"/users/{username}/repos", filters.query("users"), filters)
+
+    async def get_repositories_metadata(
+        self,
+        username: str,
+        public_repos: Optional[int] = None,
+        updated_since: Optional[str] = None,
+        checkpoint: Optional[PaginationCheckpoint] = None,
+        owner_type: Optional[str] = None,
+        filters: Optional[RepositoryFilter] = None,
+        excluded: Optional[list[str]] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Fetches the repositories of a given user or organization; by default, all public ones.
+
+        When the client is configured with ``page_concurrency`` greater than 1, the
+        first page is fetched on its own to discover the page count (from the
+        ``Link`` header, or from ``public_repos`` when given), and the remaining
+        pages are fetched concurrently. Results are always returned in page order.
+
+        With ``updated_since``, only repositories updated at or after that watermark are
+        returned: pages are requested most recently updated first and pagination stops at
+        the first older repository.
 
         :param username: The GitHub username or organization name.
+        :param public_repos: Optional repository count, e.g. from get_user_metadata, used to size the
+            fan-out of unfiltered public listings when the ``Link`` header is missing.
+        :param updated_since: Optional ``updated_at`` watermark of a previous extraction.
+        :param checkpoint: Optional pagination progress to resume from and to report progress to.
+            It must come from a listing made with the same mode and arguments.
+        :param owner_type: The account's ``type`` from get_user_metadata (``User`` or
+            ``Organization``). Organizations are listed through ``/orgs/{org}/repos``.
+        :param filters: Optional filter on the repositories returned, applied server-side where
+            the endpoint supports it and to each page as it is decoded otherwise.
+        :param excluded: Optional list receiving the keys (see repository_key) of the repositories
+            updated since ``updated_since`` that the filter dropped client-side (REST listings only).
         :return: A list of dictionaries, where each dictionary contains a repository's metadata.
         """
-        client = await self._get_client()
-        repos = []
-        page = 1
-        per_page = 100
+        checkpoint = checkpoint or PaginationCheckpoint()
+        filters = filters or RepositoryFilter()
+        pages = 0
+
+        def count_page(_checkpoint: PaginationCheckpoint, _page_repos: list[Dict[str, Any]]) -> None:
+            nonlocal pages
+            pages += 1
+
+        checkpoint.add_listener(count_page)
+        try:
+            if self.api_mode == "graphql":
+                repos = await self._get_repositories_graphql(username, checkpoint, updated_since, filters)
+            else:
+                listing = await self._repository_listing(username, owner_type, filters, updated_since)
+                if updated_since:
+                    repos = await self._get_repositories_updated_since(listing, checkpoint, updated_since, excluded)
+                elif self.page_concurrency > 1:
+                    repos = await self._get_repositories_concurrently(listing, checkpoint, public_repos)
+                else:
+                    repos = await self._get_repositories_sequentially(listing, checkpoint)
+            if self.instrumentation is not None:
+                self.instrumentation.record_listing(self.api_mode, pages, len(repos))
+            return repos
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error fetching repositories for {username}: {e.response.status_code} - {e.response.text}")
+            raise
+        except Exception as e:
+            logger.error(f"An error occurred while fetching repositories for {username}: {e}")
+            raise
+
+    async def _get_repositories_sequentially(
+        self, listing: RepositoryListing, checkpoint: PaginationCheckpoint
+    ) -> list[Dict[str, Any]]:
+        """
+        Walks repository pages one at a time until an empty page is returned.
+
+        :param listing: The listing endpoint and filter.
+        :param checkpoint: Pagination progress; its position is the next page to fetch.
+        :return: A list of repository metadata dictionaries.
+        """
+        page = checkpoint.position or 1
         while True:
-            url = f"/users/{username}/repos?page={page}&per_page={per_page}"
-            try:
-                response = await client.get(url)
-                response.raise_for_status()
-                page_repos = response.json()
-                if not page_repos:
-                    break
-                
-                for repo in page_repos:
-                    repos.append({
-                        "name": repo.get("name"),
-                        "description": repo.get("description"),
-                        "language": repo.get("language"),
-                        "star_count": repo.get("stargazers_count"),
-                        "fork_count": repo.get("forks_count"),
-                        "issue_count": repo.get("open_issues_count"),
-                        "created_at": repo.get("created_at"),
-                        "updated_at": repo.get("updated_at"),
-                        "url": repo.get("html_url"),
-                    })
-                
-                page += 1
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error fetching repositories for {username}: {e.response.status_code} - {e.response.text}")
-                raise
-            except Exception as e:
-                logger.error(f"An error occurred while fetching repositories for {username}: {e}")
-                raise
+            response = await self._fetch_repositories_page(listing, page, REPOS_PER_PAGE)
+            page_repos = decode_list(response.content, Repository)
+            if not page_repos:
+                break
+            page += 1
+            checkpoint.advance(page, listing.select(page_repos))
+        return checkpoint.repos
+
+    async def _get_repositories_updated_since(
+        self,
+        listing: RepositoryListing,
+        checkpoint: PaginationCheckpoint,
+        updated_since: str,
+        excluded: Optional[list[str]] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Walks repository pages most recently updated first, stopping at the watermark.
+
+        Repositories updated exactly at the watermark are included again; merging by name
+        makes that harmless and guards against updates landing in the same second.
+
+        :param listing: The listing endpoint and filter, sorted most recently updated first.
+        :param checkpoint: Pagination progress; its position is the next page to fetch.
+        :param updated_since: The ``updated_at`` watermark.
+        :param excluded: Optional list receiving the keys of updated repositories the filter dropped.
+        :return: The repositories updated at or after the watermark.
+        """
+        page = checkpoint.position or 1
+        while True:
+            response = await self._fetch_repositories_page(listing, page, REPOS_PER_PAGE)
+            page_repos = decode_list(response.content, Repository)
+            parsed = []
+            for repo in page_repos:
+                if (repo.updated_at or "") < updated_since:
+                    checkpoint.advance(None, parsed)
+                    return checkpoint.repos
+                if listing.filter.matches(repo):
+                    parsed.append(repo.to_dict())
+                elif excluded is not None:
+                    excluded.append(repo.full_name or repo.name)
+            page += 1
+            checkpoint.advance(page, parsed)
+            if len(page_repos) < REPOS_PER_PAGE:
+                return checkpoint.repos
+
+    async def _get_repositories_concurrently(
+        self, listing: RepositoryListing, checkpoint: PaginationCheckpoint, public_repos: Optional[int]
+    ) -> list[Dict[str, Any]]:
+        """
+        Fetches the first pending page, then fans out over the remaining pages with bounded concurrency.
+
+        Pages may complete out of order; the checkpoint only advances over the contiguous
+        run of completed pages, so a resumed listing never skips a page.
+
+        :param listing: The listing endpoint and filter.
+        :param checkpoint: Pagination progress; its position is the next page to fetch.
+        :param public_repos: Optional repository count used when the ``Link`` header is missing.
+        :return: A list of repository metadata dictionaries in page order.
+        """
+        start_page = checkpoint.position or 1
+        first = await self._fetch_repositories_page(listing, start_page, REPOS_PER_PAGE)
+        first_repos = decode_list(first.content, Repository)
+        checkpoint.advance(start_page + 1, listing.select(first_repos))
+        if len(first_repos) < REPOS_PER_PAGE:
+            return checkpoint.repos
+
+        last_page = self._get_last_page(first)
+        # public_repos only counts public repositories, so it sizes unfiltered public listings only.
+        counts_public = listing.filter.visibility == "public" and listing.filter.type in (None, "public")
+        if last_page is None and public_repos and counts_public:
+            last_page = math.ceil(public_repos / REPOS_PER_PAGE)
+        if last_page is None:
+            # Nothing tells us how many pages there are; keep walking them in order.
+            return await self._get_repositories_sequentially(listing, checkpoint)
+
+        semaphore = asyncio.Semaphore(self.page_concurrency)
+        completed: Dict[int, list[Dict[str, Any]]] = {}
+
+        async def fetch(page: int) -> None:
+            async with semaphore:
+                response = await self._fetch_repositories_page(listing, page, REPOS_PER_PAGE)
+                completed[page] = listing.select(decode_list(response.content, Repository))
+            while checkpoint.position in completed:
+                next_page = checkpoint.position
+                checkpoint.advance(next_page + 1, completed.pop(next_page))
+
+        tasks = [asyncio.create_task(fetch(page)) for page in range(start_page + 1, last_page + 1)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Do not leave the other pages running (and spending quota) once one has failed.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return checkpoint.repos
+
+    async def _get_optional(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """
+        Performs a GET request for a sub-resource that a repository may not have.
+
+        :param url: The API path, including its query string.
+        :param headers: Optional per-request headers.
+        :return: The HTTP response, or None when GitHub reports the resource as missing
+            (404), the repository as empty (409), unavailable (451) or too large to list (403).
+        """
+        try:
+            return await self._get(url, headers)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (404, 409, 451) or (e.response.status_code == 403 and not is_rate_limited(e.response)):
+                logger.debug(f"Skipping unavailable resource {url}: {e.response.status_code}")
+                return None
+            raise
+
+    async def _get_repository_field(self, owner: str, repo: str, field: str) -> Any:
+        """
+        Fetches one enrichment field of a repository.
+
+        :param owner: The repository owner.
+        :param repo: The repository name.
+        :param field: One of ENRICHMENT_FIELDS.
+        :return: The field value, or None if the repository does not have it.
+        """
+        base = f"/repos/{owner}/{repo}"
+        if field == "languages":
+            response = await self._get_optional(f"{base}/languages")
+            return response.json() if response is not None else None
+        if field == "topics":
+            response = await self._get_optional(f"{base}/topics")
+            return response.json().get("names", []) if response is not None else None
+        if field == "contributor_count":
+            # One contributor per page: the last page number of the Link header is the count.
+            response = await self._get_optional(f"{base}/contributors?per_page=1&anon=1")
+            if response is None:
+                return None
+            if response.status_code == 204:
+                return 0
+            last_page = self._get_last_page(response)
+            return last_page if last_page is not None else len(response.json())
+        if field == "readme":
+            response = await self._get_optional(f"{base}/readme", {"Accept": "application/vnd.github.raw+json"})
+            return response.text[:self.readme_max_chars] if response is not None else None
+        raise ValueError(f"Unknown enrichment field '{field}'. Expected one of {', '.join(ENRICHMENT_FIELDS)}.")
+
+    async def enrich_repositories(
+        self, owner: str, repos: list[Dict[str, Any]], fields: Tuple[str, ...] = ENRICHMENT_FIELDS, concurrency: int = 16
+    ) -> list[Dict[str, Any]]:
+        """
+        Adds per-repository details (language bytes, topics, contributor count, README text) to each repository.
+
+        Repositories are addressed by their ``full_name``, since listings such as
+        ``repo_type=member`` include repositories of other owners; records without it are
+        assumed to belong to ``owner``.
+
+        Every (repository, field) pair is one request. A fixed set of workers drains them with
+        at most ``concurrency`` requests in flight, through the same connection pool, cache and
+        rate-limit scheduler as the listing. Fields a repository does not have are set to None.
+
+        :param owner: The account whose repositories are listed; the owner of records without ``full_name``.
+        :param repos: Repository metadata dictionaries; updated in place.
+        :param fields: The fields to fetch, a subset of ENRICHMENT_FIELDS.
+        :param concurrency: Maximum number of requests in flight.
+        :return: The same repository list.
+        """
+        unknown = set(fields) - set(ENRICHMENT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown enrichment fields {sorted(unknown)}. Expected a subset of {', '.join(ENRICHMENT_FIELDS)}.")
+        pending = iter([(repo, field) for repo in repos for field in fields])
+
+        async def worker() -> None:
+            for repo, field in pending:
+                repo_owner, _, name = (repo.get("full_name") or f"{owner}/{repo['name']}").partition("/")
+                repo[field] = await self._get_repository_field(repo_owner, name, field)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(repos) * len(fields))))))
+        return repos
 
-        return repos
\ No newline at end of file
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestCoalescer:
+    """
+    Singleflight with a short-TTL memo for identical GitHub API calls made by one worker.
+
+    Concurrent calls under the same key share one in-flight call, and its successful result
+    is served to later calls for ``ttl`` seconds. This removes the duplicate requests a
+    workflow run makes within seconds, e.g. the preflight check and the user metadata
+    activity both fetching ``/users/{username}``, or accounts repeated in a batch.
+
+    Only calls made with ``memoize=True`` are kept in the memo; callers reserve it for small
+    results such as user profiles, so large listing pages are coalesced but never retained.
+    Failures are shared with the calls waiting on them but never memoized. In-flight calls
+    are tracked per event loop, because their futures cannot be awaited from another loop,
+    and the memo is guarded by a lock since activities run on several loops and threads.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 256):
+        """
+        Args:
+            ttl: Seconds a result is served from the memo. 0 only coalesces concurrent calls.
+            max_entries: Maximum number of memoized results; the oldest are evicted first.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.coalesced = 0
+        self._memo: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Future[Any]"] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._memo[key]
+                return False, None
+            return True, value
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._memo[key] = (time.monotonic() + self.ttl, value)
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]], memoize: bool = True) -> Any:
+        """
+        Returns the memoized result for a key, joins the call in flight for it, or makes the call.
+
+        :param key: Identity of the call, including the credential it is made with.
+        :param call: Makes the call; invoked at most once per key at a time.
+        :param memoize: Whether to keep the result for ``ttl`` seconds once the call is done.
+        :return: The call's result. Callers share it and must not modify it.
+        """
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            logger.debug(f"Serving {key} from the request memo.")
+            return value
+
+        flight_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            in_flight = self._in_flight.get(flight_key)
+            if in_flight is None:
+                future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+                self._in_flight[flight_key] = future
+        if in_flight is not None:
+            self.coalesced += 1
+            logger.debug(f"Joining the in-flight request for {key}.")
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The call was cancelled together with the caller that made it; make it again.
+                return await self.run(key, call, memoize)
+
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody joined the call.
+            future.exception()
+            raise
+        else:
+            if memoize:
+                self._remember(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[flight_key]
+
+    def clear(self) -> None:
+        """
+        Drops every memoized result.
+        """
+        with self._lock:
+            self._memo.clear()
+
+
+_coalescer_instance: Optional[RequestCoalescer] = None
+
+
+def get_request_coalescer() -> Optional[RequestCoalescer]:
+    """
+    Gets or creates the process-wide RequestCoalescer.
+
+    Settings are read from the environment on first use: ``GITHUB_REQUEST_MEMO_TTL``
+    (seconds, default ``30``) and ``GITHUB_REQUEST_MEMO_SIZE`` (default ``256``). Set
+    ``GITHUB_REQUEST_COALESCING=false`` to disable both coalescing and the memo.
+
+    :return: The shared coalescer, or None if disabled.
+    """
+    global _coalescer_instance
+    if os.getenv("GITHUB_REQUEST_COALESCING", "true").lower() != "true":
+        return None
+    if _coalescer_instance is None:
+        _coalescer_instance = RequestCoalescer(
+            ttl=float(os.getenv("GITHUB_REQUEST_MEMO_TTL", "30")),
+            max_entries=int(os.getenv("GITHUB_REQUEST_MEMO_SIZE", "256")),
+        )
+    return _coalescer_instance
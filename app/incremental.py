@@ -0,0 +1,171 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+from app.records import repository_key
+
+logger = get_logger(__name__)
+
+
+def get_watermark(repos: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Returns the most recent ``updated_at`` of a list of repositories.
+
+    GitHub timestamps are ISO-8601 UTC strings of a fixed format, so they order lexicographically.
+
+    :param repos: Repository metadata dictionaries.
+    :return: The watermark, or None if no repository carries a timestamp.
+    """
+    timestamps = [repo["updated_at"] for repo in repos if repo.get("updated_at")]
+    return max(timestamps) if timestamps else None
+
+
+def merge_repositories(
+    previous: List[Dict[str, Any]], changed: List[Dict[str, Any]], removed: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """
+    Merges repositories updated since the last run into the previous snapshot.
+
+    Changed repositories replace their previous entry in place (dropping its stale
+    ``auto_tags`` so keywords are extracted again); new repositories are appended.
+    Unchanged repositories keep their ``auto_tags``. Repositories updated since the last run
+    that no longer pass the listing's filters (e.g. newly archived) are dropped.
+
+    Deleted and renamed repositories do not show up in the changes, so their old entries
+    stay until the next full listing (see needs_full_listing and reconcile_repositories).
+
+    :param previous: The repositories of the previous snapshot.
+    :param changed: The repositories updated since the snapshot's watermark.
+    :param removed: Keys (see repository_key) of updated repositories the listing filtered out.
+    :return: The merged repository list.
+    """
+    changed_by_key = {repository_key(repo): repo for repo in changed}
+    removed = set(removed) - changed_by_key.keys()
+    merged = [
+        changed_by_key.pop(repository_key(repo), repo) for repo in previous if repository_key(repo) not in removed
+    ]
+    merged.extend(changed_by_key.values())
+    return merged
+
+
+def reconcile_repositories(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Replaces a snapshot with a full listing, keeping the work already done on unchanged repositories.
+
+    Repositories missing from the listing (deleted, renamed, or no longer passing the filters)
+    are dropped. A repository whose ``updated_at`` did not change keeps its previous entry,
+    with its ``auto_tags`` and enrichment fields.
+
+    :param previous: The repositories of the previous snapshot.
+    :param current: All repositories of the account, as listed now.
+    :return: The reconciled repository list, in listing order.
+    """
+    previous_by_key = {repository_key(repo): repo for repo in previous}
+    reconciled = []
+    for repo in current:
+        kept = previous_by_key.get(repository_key(repo))
+        reconciled.append(kept if kept is not None and kept.get("updated_at") == repo.get("updated_at") else repo)
+    return reconciled
+
+
+def needs_full_listing(snapshot: Optional[Dict[str, Any]], filters: Dict[str, Any], every: int) -> bool:
+    """
+    Tells whether the next run of an account lists every repository instead of the changes only.
+
+    That is the case without a usable snapshot, when the listing's filters changed since the
+    snapshot, and every ``every`` runs, which drops deleted and renamed repositories. The
+    answer only depends on the snapshot, so the snapshot activity can tell which kind of run it saves.
+
+    :param snapshot: The account's snapshot, or None.
+    :param filters: The repository filter of the run, as a dictionary.
+    :param every: Runs between two full listings; 1 lists everything every time, 0 never reconciles.
+    :return: True for a full listing.
+    """
+    if not snapshot or not snapshot.get("watermark") or snapshot.get("filters") != filters:
+        return True
+    # Snapshots from before repositories carried their owner cannot be merged by repository_key.
+    if any("full_name" not in repo for repo in snapshot["repos"]):
+        return True
+    return every > 0 and snapshot.get("runs_since_full", 0) + 1 >= every
+
+
+class SnapshotStore:
+    """
+    Keeps the last extracted repositories of each account, with their ``updated_at`` watermark,
+    as one JSON file per account on local disk.
+    """
+
+    def __init__(self, base_dir: str):
+        """
+        Args:
+            base_dir: Directory holding the snapshot files. Created on first save.
+        """
+        self.base_dir = base_dir
+
+    def _path(self, account: str) -> str:
+        return os.path.join(self.base_dir, f"{account.lower()}.json")
+
+    def _load(self, account: str) -> Optional[Dict[str, Any]]:
+        path = self._path(account)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save(self, account: str, snapshot: Dict[str, Any]) -> None:
+        os.makedirs(self.base_dir, exist_ok=True)
+        path = self._path(account)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    async def load(self, account: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads the snapshot of an account.
+
+        :param account: The GitHub username or organization name.
+        :return: A dictionary with ``watermark`` and ``repos``, or None if the account was never extracted.
+        """
+        return await asyncio.to_thread(self._load, account)
+
+    async def save(
+        self, account: str, repos: List[Dict[str, Any]], filters: Optional[Dict[str, Any]] = None, runs_since_full: int = 0
+    ) -> Optional[str]:
+        """
+        Replaces the snapshot of an account. The file is swapped in atomically.
+
+        :param account: The GitHub username or organization name.
+        :param repos: The full, keyword-tagged repository list.
+        :param filters: The repository filter the list was made with, as a dictionary.
+        :param runs_since_full: Incremental runs since the last full listing (0 if this run was one).
+        :return: The new watermark.
+        """
+        watermark = get_watermark(repos)
+        snapshot = {
+            "account": account,
+            "watermark": watermark,
+            "filters": filters,
+            "runs_since_full": runs_since_full,
+            "repos": repos,
+        }
+        await asyncio.to_thread(self._save, account, snapshot)
+        logger.info(f"Saved snapshot of {len(repos)} repositories for '{account}' (watermark {watermark}).")
+        return watermark
+
+
+def get_full_listing_interval() -> int:
+    """
+    Returns ``GITHUB_FULL_LISTING_EVERY``: incremental runs between two full listings (default ``10``).
+    """
+    return int(os.getenv("GITHUB_FULL_LISTING_EVERY", "10"))
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """
+    Returns the snapshot store under ``GITHUB_STATE_DIR`` (default ``.github_state``).
+    """
+    return SnapshotStore(os.getenv("GITHUB_STATE_DIR", ".github_state"))
@@ -0,0 +1,186 @@
+import os
+import re
+import uuid
+from typing import Any, Dict, Optional
+
+import httpx
+
+from application_sdk.observability.logger_adaptor import get_logger
+from application_sdk.observability.metrics_adaptor import MetricType, get_metrics
+from application_sdk.observability.traces_adaptor import get_traces
+
+logger = get_logger(__name__)
+
+# Path patterns mapped to the endpoint templates used as metric labels, so metrics are not
+# split by account name, page number or query string.
+ENDPOINT_TEMPLATES = [
+    (re.compile(r"^/user$"), "/user"),
+    (re.compile(r"^/user/repos$"), "/user/repos"),
+    (re.compile(r"^/graphql$"), "/graphql"),
+    (re.compile(r"^/users/[^/]+$"), "/users/{username}"),
+    (re.compile(r"^/users/[^/]+/repos$"), "/users/{username}/repos"),
+    (re.compile(r"^/orgs/[^/]+/repos$"), "/orgs/{org}/repos"),
+    (re.compile(r"^/repos/[^/]+/[^/]+$"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/([^/]+)$"), "/repos/{owner}/{repo}/\\1"),
+]
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Returns the endpoint template of a request URL or path, e.g. ``/users/{username}/repos``.
+
+    :param url: The requested path (or absolute URL), with or without query string.
+    :return: The template, or the bare path when no template matches.
+    """
+    path = httpx.URL(url).path or "/"
+    for pattern, template in ENDPOINT_TEMPLATES:
+        match = pattern.match(path)
+        if match:
+            return match.expand(template)
+    return path
+
+
+class RequestInstrumentation:
+    """
+    Records per-request metrics and spans of GitHubClient through the SDK's metrics and traces adaptors.
+
+    For every HTTP call it records:
+
+    - ``github_request_duration_ms`` (histogram) by endpoint template, method and status,
+    - ``github_response_bytes`` (histogram) by endpoint template,
+    - ``github_request_retries`` (counter) for attempts repeated after a rate limit,
+    - ``github_cache_hits`` (counter) for 304 Not Modified answers served from the response cache,
+    - ``github_rate_limit_remaining`` (gauge) from the ``X-RateLimit-Remaining`` header,
+    - ``github_throttle_wait_ms`` (histogram) for time held back by the rate-limit scheduler,
+    - a CLIENT span carrying the same attributes.
+
+    Listings additionally record ``github_listing_pages`` (histogram). Labels are completed by
+    the adaptor with the workflow and activity context, which gives the per-activity view.
+    """
+
+    def __init__(self, metrics: Any = None, traces: Any = None):
+        """
+        Args:
+            metrics: Metrics adaptor. Defaults to get_metrics().
+            traces: Traces adaptor. Defaults to get_traces().
+        """
+        self.metrics = metrics or get_metrics()
+        self.traces = traces or get_traces()
+
+    def _metric(self, name: str, value: float, metric_type: MetricType, labels: Dict[str, str], description: str, unit: str) -> None:
+        try:
+            self.metrics.record_metric(
+                name=name, value=value, metric_type=metric_type, labels=labels, description=description, unit=unit
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record metric {name}: {e}")
+
+    def record_request(
+        self,
+        trace_id: str,
+        method: str,
+        url: str,
+        duration: float,
+        response: Optional[httpx.Response] = None,
+        attempt: int = 0,
+        throttle_wait: float = 0.0,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Records the metrics and the span of one HTTP call.
+
+        :param trace_id: Trace grouping the calls of one client.
+        :param method: The HTTP method.
+        :param url: The requested path, including its query string.
+        :param duration: Seconds from sending the request to receiving the response headers.
+        :param response: The response, or None if the call raised.
+        :param attempt: 0 for the first attempt, then the retry number.
+        :param throttle_wait: Seconds the rate-limit scheduler held the request back.
+        :param error: The exception raised by the call, if any.
+        """
+        endpoint = endpoint_template(url)
+        status = str(response.status_code) if response is not None else "error"
+        labels = {"endpoint": endpoint, "method": method}
+        duration_ms = duration * 1000
+
+        self._metric(
+            "github_request_duration_ms", duration_ms, MetricType.HISTOGRAM, {**labels, "status": status},
+            "Latency of GitHub API requests", "ms",
+        )
+        if attempt:
+            self._metric("github_request_retries", 1, MetricType.COUNTER, dict(labels), "GitHub API requests retried after a rate limit", "count")
+        if throttle_wait > 0:
+            self._metric(
+                "github_throttle_wait_ms", throttle_wait * 1000, MetricType.HISTOGRAM, dict(labels),
+                "Time GitHub API requests waited on the rate-limit scheduler", "ms",
+            )
+
+        attributes: Dict[str, Any] = {
+            "http.method": method,
+            "http.route": endpoint,
+            "http.status_code": status,
+            "attempt": attempt,
+            "throttle_wait_ms": throttle_wait * 1000,
+        }
+        if response is not None:
+            size = len(response.content)
+            attributes["response_bytes"] = size
+            self._metric("github_response_bytes", size, MetricType.HISTOGRAM, dict(labels), "Size of GitHub API response bodies", "bytes")
+            if response.status_code == 304:
+                attributes["cache_hit"] = True
+                self._metric("github_cache_hits", 1, MetricType.COUNTER, dict(labels), "GitHub API responses served from the cache", "count")
+            remaining = response.headers.get("x-ratelimit-remaining")
+            if remaining is not None and remaining.isdigit():
+                attributes["rate_limit_remaining"] = int(remaining)
+                self._metric(
+                    "github_rate_limit_remaining", int(remaining), MetricType.GAUGE,
+                    {"resource": response.headers.get("x-ratelimit-resource", "core")},
+                    "Remaining GitHub API quota per rate-limit resource", "count",
+                )
+
+        try:
+            self.traces.record_trace(
+                name=f"GitHub {method} {endpoint}",
+                trace_id=trace_id,
+                span_id=str(uuid.uuid4()),
+                kind="CLIENT",
+                status_code="ERROR" if error is not None or (response is not None and response.is_error) else "OK",
+                status_message=str(error) if error is not None else None,
+                attributes=attributes,
+                duration_ms=duration_ms,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record trace for GitHub {method} {endpoint}: {e}")
+
+    def record_listing(self, api_mode: str, pages: int, repositories: int) -> None:
+        """
+        Records the number of pages a repository listing took.
+
+        :param api_mode: ``rest`` or ``graphql``.
+        :param pages: Pages fetched by this listing (excluding pages restored from a checkpoint).
+        :param repositories: Repositories returned.
+        """
+        self._metric(
+            "github_listing_pages", pages, MetricType.HISTOGRAM, {"api_mode": api_mode},
+            "Pages fetched per repository listing", "count",
+        )
+        logger.debug(f"Repository listing fetched {pages} pages ({repositories} repositories).")
+
+
+_instrumentation_instance: Optional[RequestInstrumentation] = None
+
+
+def get_request_instrumentation() -> Optional[RequestInstrumentation]:
+    """
+    Gets or creates the process-wide RequestInstrumentation.
+
+    Returns None when ``GITHUB_REQUEST_METRICS`` is ``false`` (default ``true``).
+
+    :return: The shared instrumentation, or None if disabled.
+    """
+    global _instrumentation_instance
+    if os.getenv("GITHUB_REQUEST_METRICS", "true").lower() != "true":
+        return None
+    if _instrumentation_instance is None:
+        _instrumentation_instance = RequestInstrumentation()
+    return _instrumentation_instance
@@ -0,0 +1,316 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+logger = get_logger(__name__)
+
+# Settings passed to yake.KeywordExtractor; the explicit values are YAKE's defaults plus our top-5 limit.
+KEYWORD_EXTRACTOR_CONFIG: Dict[str, Any] = {"lan": "en", "n": 3, "top": 5}
+
+# Warm extractor (a yake.KeywordExtractor) of a pool process, created once by _init_worker.
+_worker_extractor: Optional[Any] = None
+
+
+def _new_extractor(config: Dict[str, Any]) -> Any:
+    """
+    Builds a yake.KeywordExtractor. YAKE (and its NLP dependencies) is imported on first
+    use, so importing this module does not slow down worker startup.
+    """
+    yake = importlib.import_module("yake")
+    return yake.KeywordExtractor(**config)
+
+
+def _init_worker(config: Dict[str, Any]) -> None:
+    """
+    Initializer of the pool processes: builds the extractor once per process.
+    """
+    global _worker_extractor
+    _worker_extractor = _new_extractor(config)
+
+
+def _extract_batch(descriptions: List[str], config: Dict[str, Any]) -> List[List[str]]:
+    """
+    Extracts keywords for a batch of descriptions.
+
+    Runs in a pool process (reusing its warm extractor) or, for small inputs, in a thread
+    of the worker process (with a fresh extractor).
+
+    :param descriptions: Non-empty repository descriptions.
+    :param config: yake.KeywordExtractor settings.
+    :return: The keywords of each description, in input order.
+    """
+    extractor = _worker_extractor or _new_extractor(config)
+    return [[kw[0] for kw in extractor.extract_keywords(description)] for description in descriptions]
+
+
+class KeywordCache:
+    """
+    Content-addressed memo of extracted keywords.
+
+    Entries are keyed by a hash of the description text and the extractor settings, so a
+    description that did not change between runs is never re-scored, and changing the
+    language, n-gram size or top-k invalidates old entries. Lookups go to an in-memory LRU
+    tier first and then, when a path is given, to a SQLite tier that survives worker restarts.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Size bound of the in-memory LRU tier.
+            path: Optional SQLite file backing the persistent tier. Created if it does not exist.
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, List[str]]" = OrderedDict()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS keywords (key TEXT PRIMARY KEY, keywords TEXT NOT NULL)")
+
+    @staticmethod
+    def build_key(description: str, config: Dict[str, Any]) -> str:
+        """
+        Builds the cache key of a description scored with the given extractor settings.
+        """
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode())
+        digest.update(b"\0")
+        digest.update(description.encode())
+        return digest.hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _read_persistent(self, keys: List[str]) -> Dict[str, List[str]]:
+        found: Dict[str, List[str]] = {}
+        with self._connect() as conn:
+            # Stay below SQLite's bound-parameter limit.
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, keywords in conn.execute(
+                    f"SELECT key, keywords FROM keywords WHERE key IN ({placeholders})", chunk
+                ):
+                    found[key] = json.loads(keywords)
+        return found
+
+    def _write_persistent(self, entries: Dict[str, List[str]]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO keywords (key, keywords) VALUES (?, ?)",
+                [(key, json.dumps(keywords)) for key, keywords in entries.items()],
+            )
+
+    def _remember(self, key: str, keywords: List[str]) -> None:
+        self._entries[key] = keywords
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, List[str]]:
+        """
+        Looks up several keys at once and updates the hit/miss counters.
+
+        :param keys: Cache keys built with build_key.
+        :return: The cached keywords of the keys that were found.
+        """
+        found: Dict[str, List[str]] = {}
+        missing = []
+        for key in keys:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                found[key] = self._entries[key]
+            else:
+                missing.append(key)
+        if missing and self.path:
+            persisted = await asyncio.to_thread(self._read_persistent, missing)
+            for key, keywords in persisted.items():
+                self._remember(key, keywords)
+            found.update(persisted)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def set_many(self, entries: Dict[str, List[str]]) -> None:
+        """
+        Stores freshly extracted keywords in every tier.
+
+        :param entries: Keywords by cache key.
+        """
+        for key, keywords in entries.items():
+            self._remember(key, keywords)
+        if entries and self.path:
+            await asyncio.to_thread(self._write_persistent, entries)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit/miss counters and the size of the in-memory tier.
+        """
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class KeywordEngine:
+    """
+    Runs YAKE keyword extraction off the event loop.
+
+    Descriptions are split into batches that are scored in parallel by a pool of worker
+    processes, each keeping a warm extractor. Inputs that fit in a single batch are scored
+    in a thread instead, which avoids the inter-process overhead for small accounts. Either
+    way the activity's event loop stays free for heartbeats and other activities. Each batch
+    is cached as soon as it is scored, so a retried extraction only scores the rest.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        batch_size: int = 200,
+        config: Optional[Dict[str, Any]] = None,
+        cache: Optional[KeywordCache] = None,
+        max_chars: int = 5000,
+    ):
+        """
+        Args:
+            max_workers: Number of pool processes. Defaults to the number of CPUs.
+            batch_size: Number of descriptions sent to a process at a time.
+            config: yake.KeywordExtractor settings. Defaults to KEYWORD_EXTRACTOR_CONFIG.
+            cache: Optional memo of previously extracted keywords; only cache misses are scored.
+            max_chars: Characters of each text scored; YAKE's cost grows with the text length.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.max_chars = max_chars
+        self.config = dict(config or KEYWORD_EXTRACTOR_CONFIG)
+        self.cache = cache
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Starts the process pool on first use. Processes are spawned rather than forked,
+        since the worker process runs threads (Temporal, gRPC) that are unsafe to fork.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+        return self._executor
+
+    async def extract(self, descriptions: List[Optional[str]]) -> List[List[str]]:
+        """
+        Extracts keywords for each description.
+
+        :param descriptions: Repository descriptions; empty or missing ones get no keywords.
+            Only their first ``max_chars`` characters are scored.
+        :return: One keyword list per description, in input order.
+        """
+        results: List[List[str]] = [[] for _ in descriptions]
+        indexed = [(i, text[:self.max_chars]) for i, text in enumerate(descriptions) if text]
+        if self.cache is not None and indexed:
+            keys = {text: KeywordCache.build_key(text, self.config) for _, text in indexed}
+            cached = await self.cache.get_many(list(dict.fromkeys(keys.values())))
+            remaining = []
+            for i, text in indexed:
+                if keys[text] in cached:
+                    results[i] = list(cached[keys[text]])
+                else:
+                    remaining.append((i, text))
+            indexed = remaining
+        if not indexed:
+            return results
+
+        async def remember(batch: List[str], batch_keywords: List[List[str]]) -> None:
+            if self.cache is not None:
+                await self.cache.set_many({
+                    KeywordCache.build_key(text, self.config): keywords for text, keywords in zip(batch, batch_keywords)
+                })
+
+        texts = list(dict.fromkeys(text for _, text in indexed))
+        keywords_by_text = dict(zip(texts, await self._score(texts, remember)))
+        for i, text in indexed:
+            results[i] = list(keywords_by_text[text])
+        return results
+
+    async def _score(
+        self, texts: List[str], on_batch: Callable[[List[str], List[List[str]]], Awaitable[None]]
+    ) -> List[List[str]]:
+        """
+        Scores descriptions with YAKE, in a thread for a single batch or in the process pool otherwise.
+
+        :param texts: Non-empty descriptions.
+        :param on_batch: Called with each batch and its keywords as soon as the batch is scored.
+        :return: The keywords of each description, in input order.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def score_batch(batch: List[str]) -> List[List[str]]:
+            if len(texts) <= self.batch_size:
+                batch_keywords = await asyncio.to_thread(_extract_batch, batch, self.config)
+            else:
+                batch_keywords = await loop.run_in_executor(self._get_executor(), _extract_batch, batch, self.config)
+            await on_batch(batch, batch_keywords)
+            return batch_keywords
+
+        batches = await asyncio.gather(*(
+            score_batch(texts[start:start + self.batch_size]) for start in range(0, len(texts), self.batch_size)
+        ))
+        return [kws for batch in batches for kws in batch]
+
+    def shutdown(self) -> None:
+        """
+        Stops the pool processes, if they were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_keyword_engine_instance: Optional[KeywordEngine] = None
+
+
+def get_keyword_engine() -> KeywordEngine:
+    """
+    Gets or creates the process-wide KeywordEngine.
+
+    Settings are read from the environment on first use:
+    ``KEYWORD_WORKERS`` (default: CPU count), ``KEYWORD_BATCH_SIZE`` (default 200),
+    ``KEYWORD_CACHE_MAX_ENTRIES`` (in-memory memo size, default 10000; 0 disables the memo),
+    ``KEYWORD_CACHE_PATH`` (optional SQLite file for the persistent memo tier) and
+    ``KEYWORD_MAX_CHARS`` (characters of each text scored, default 5000).
+
+    :return: The shared keyword engine.
+    """
+    global _keyword_engine_instance
+    if _keyword_engine_instance is None:
+        workers = os.getenv("KEYWORD_WORKERS")
+        cache_entries = int(os.getenv("KEYWORD_CACHE_MAX_ENTRIES", "10000"))
+        _keyword_engine_instance = KeywordEngine(
+            max_workers=int(workers) if workers else None,
+            batch_size=int(os.getenv("KEYWORD_BATCH_SIZE", "200")),
+            cache=KeywordCache(max_entries=cache_entries, path=os.getenv("KEYWORD_CACHE_PATH")) if cache_entries > 0 else None,
+            max_chars=int(os.getenv("KEYWORD_MAX_CHARS", "5000")),
+        )
+    return _keyword_engine_instance
+
+
+def shutdown_keyword_engine() -> None:
+    """
+    Shuts down the process-wide KeywordEngine, if one was created.
+    """
+    global _keyword_engine_instance
+    if _keyword_engine_instance is not None:
+        _keyword_engine_instance.shutdown()
+        _keyword_engine_instance = None
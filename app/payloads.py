@@ -0,0 +1,196 @@
+import dataclasses
+import gzip
+import importlib
+import importlib.util
+import os
+from typing import Any, List, Optional, Sequence
+
+from application_sdk.observability.logger_adaptor import get_logger
+from application_sdk.observability.metrics_adaptor import MetricType, get_metrics
+from temporalio.api.common.v1 import Payload
+from temporalio.client import Client
+from temporalio.converter import (
+    CompositePayloadConverter,
+    DataConverter,
+    DefaultPayloadConverter,
+    JSONPlainPayloadConverter,
+    PayloadCodec,
+    value_to_type,
+)
+
+from app.records import loads, orjson
+
+logger = get_logger(__name__)
+
+PAYLOAD_COMPRESSIONS = ("zstd", "gzip", "none")
+
+
+class FastJSONPayloadConverter(JSONPlainPayloadConverter):
+    """
+    ``json/plain`` payload converter serializing with orjson.
+
+    Payloads decode to the same values as those of the default converter, and each converter
+    decodes the other's payloads, so workers with and without it can share a task queue. The
+    bytes are not always identical: both write compact JSON with sorted keys, but orjson writes
+    non-ASCII characters as UTF-8 where the default encoder escapes them, and may format
+    values such as datetimes differently. Values orjson cannot serialize (e.g. non-string
+    dictionary keys) go through the default JSON encoder.
+    """
+
+    def to_payload(self, value: Any) -> Optional[Payload]:
+        if orjson is None:
+            return super().to_payload(value)
+        try:
+            data = orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            return super().to_payload(value)
+        return Payload(metadata={"encoding": self.encoding.encode()}, data=data)
+
+    def from_payload(self, payload: Payload, type_hint: Optional[type] = None) -> Any:
+        try:
+            value = loads(payload.data)
+        except ValueError as err:
+            raise RuntimeError("Failed parsing") from err
+        if type_hint:
+            value = value_to_type(type_hint, value, self._custom_type_converters)
+        return value
+
+
+class FastPayloadConverter(CompositePayloadConverter):
+    """
+    The default payload converter chain with FastJSONPayloadConverter in place of the JSON converter.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(*(
+            FastJSONPayloadConverter() if isinstance(converter, JSONPlainPayloadConverter) else converter
+            for converter in DefaultPayloadConverter.default_encoding_payload_converters
+        ))
+
+
+class CompressionPayloadCodec(PayloadCodec):
+    """
+    Compresses workflow and activity payloads above a size threshold with zstd or gzip.
+
+    A compressed payload wraps the serialized original under the ``binary/zstd`` or
+    ``binary/gzip`` encoding, so decoding restores it exactly and activity code never sees
+    the difference. Payloads that are small, or that would not shrink, pass through
+    unchanged, and payloads in either encoding are decoded whatever the configured
+    algorithm, so workers can switch algorithms without breaking running workflows. The
+    original and compressed sizes are recorded as ``temporal_payload_bytes`` and
+    ``temporal_payload_compressed_bytes`` (histograms), with their ratio as
+    ``temporal_payload_compression_ratio``.
+    """
+
+    def __init__(self, algorithm: str = "zstd", threshold: int = 4096, level: Optional[int] = None, metrics: Any = None):
+        """
+        Args:
+            algorithm: ``zstd`` (needs the ``zstandard`` package) or ``gzip``.
+            threshold: Serialized payload size in bytes from which payloads are compressed.
+            level: Compression level. Defaults to 3 for zstd and 6 for gzip.
+            metrics: Metrics adaptor. Defaults to get_metrics().
+        """
+        if algorithm not in ("zstd", "gzip"):
+            raise ValueError(f"Unsupported payload compression '{algorithm}'. Expected 'zstd' or 'gzip'.")
+        if algorithm == "zstd" and importlib.util.find_spec("zstandard") is None:
+            raise ValueError("zstd payload compression requires the 'zstandard' package.")
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = level if level is not None else (3 if algorithm == "zstd" else 6)
+        self.encoding = f"binary/{algorithm}".encode()
+        self.metrics = metrics or get_metrics()
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            zstandard = importlib.import_module("zstandard")
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    @staticmethod
+    def _decompress(encoding: bytes, data: bytes) -> bytes:
+        if encoding == b"binary/zstd":
+            zstandard = importlib.import_module("zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def _metric(self, name: str, value: float, description: str, unit: str) -> None:
+        try:
+            self.metrics.record_metric(
+                name=name, value=value, metric_type=MetricType.HISTOGRAM, labels={"algorithm": self.algorithm},
+                description=description, unit=unit,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record metric {name}: {e}")
+
+    def _encode_payload(self, payload: Payload) -> Payload:
+        data = payload.SerializeToString()
+        if len(data) < self.threshold:
+            return payload
+        compressed = self._compress(data)
+        self._metric("temporal_payload_bytes", len(data), "Size of compressible Temporal payloads", "bytes")
+        self._metric("temporal_payload_compressed_bytes", len(compressed), "Size of Temporal payloads after compression", "bytes")
+        self._metric("temporal_payload_compression_ratio", len(data) / max(len(compressed), 1), "Compression ratio of Temporal payloads", "ratio")
+        if len(compressed) >= len(data):
+            return payload
+        return Payload(metadata={"encoding": self.encoding}, data=compressed)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._encode_payload(payload) for payload in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        decoded = []
+        for payload in payloads:
+            encoding = payload.metadata.get("encoding")
+            if encoding in (b"binary/zstd", b"binary/gzip"):
+                payload = Payload.FromString(self._decompress(encoding, payload.data))
+            decoded.append(payload)
+        return decoded
+
+
+def get_payload_codec() -> Optional[CompressionPayloadCodec]:
+    """
+    Builds the payload codec from the environment.
+
+    ``GITHUB_PAYLOAD_COMPRESSION`` selects ``zstd``, ``gzip`` or ``none`` (default: ``zstd``
+    when the ``zstandard`` package is installed, else ``gzip``), and
+    ``GITHUB_PAYLOAD_COMPRESSION_THRESHOLD`` the size in bytes from which payloads are
+    compressed (default ``4096``).
+
+    :return: The codec, or None if compression is disabled.
+    """
+    default = "zstd" if importlib.util.find_spec("zstandard") is not None else "gzip"
+    algorithm = os.getenv("GITHUB_PAYLOAD_COMPRESSION", default).lower()
+    if algorithm not in PAYLOAD_COMPRESSIONS:
+        raise ValueError(f"Unsupported payload compression '{algorithm}'. Expected one of {', '.join(PAYLOAD_COMPRESSIONS)}.")
+    if algorithm == "none":
+        return None
+    return CompressionPayloadCodec(algorithm, threshold=int(os.getenv("GITHUB_PAYLOAD_COMPRESSION_THRESHOLD", "4096")))
+
+
+def build_data_converter(payload_codec: Optional[PayloadCodec] = None) -> DataConverter:
+    """
+    Returns the data converter used for workflow and activity payloads.
+
+    :param payload_codec: Optional codec applied to payloads on their way to and from the server.
+    """
+    return dataclasses.replace(
+        DataConverter.default, payload_converter_class=FastPayloadConverter, payload_codec=payload_codec
+    )
+
+
+def install_data_converter(client: Client) -> Client:
+    """
+    Returns a client sharing the connection of ``client`` but using build_data_converter()
+    with the codec of get_payload_codec(). Workers created from the returned client, and
+    workflows started through it, use the same converter.
+
+    :param client: A connected Temporal client.
+    :return: The reconfigured client.
+    """
+    codec = get_payload_codec()
+    config = client.config()
+    config["data_converter"] = build_data_converter(codec)
+    if codec is not None:
+        logger.info(f"Compressing Temporal payloads from {codec.threshold} bytes with {codec.algorithm}.")
+    logger.info("Using the fast JSON payload converter for Temporal payloads.")
+    return Client(**config)
@@ -0,0 +1,252 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+logger = get_logger(__name__)
+
+# GitHub asks clients hitting a secondary rate limit without Retry-After to wait at least a minute.
+SECONDARY_RATE_LIMIT_WAIT_SECONDS = 60.0
+
+# The resource of REST requests, and of responses that do not name theirs.
+DEFAULT_RESOURCE = "core"
+
+
+def is_rate_limited(response: httpx.Response) -> bool:
+    """
+    Tells whether a response was rejected by a primary or secondary GitHub rate limit.
+
+    :param response: The HTTP response.
+    :return: True for a 429, or a 403 carrying Retry-After or an exhausted quota.
+    """
+    if response.status_code == 429:
+        return True
+    if response.status_code == 403:
+        return "retry-after" in response.headers or response.headers.get("x-ratelimit-remaining") == "0"
+    return False
+
+
+def rate_limit_resource(url: str) -> str:
+    """
+    Returns the GitHub rate-limit resource a request draws from, as named by ``X-RateLimit-Resource``.
+
+    :param url: The API path of the request.
+    :return: ``graphql``, ``search`` or ``core``.
+    """
+    path = url.split("?", 1)[0]
+    if path.endswith("/graphql"):
+        return "graphql"
+    if path.startswith("/search/"):
+        return "search"
+    return DEFAULT_RESOURCE
+
+
+class _Bucket:
+    """
+    The quota and token bucket of one rate-limit resource.
+    """
+
+    def __init__(self, burst: int):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0
+
+
+class RateLimitScheduler:
+    """
+    Paces GitHub API requests with token buckets that adapt to the quotas reported by GitHub.
+
+    GitHub keeps a separate quota per resource (``core`` for REST, ``graphql`` in points,
+    ``search``, ...), so the scheduler keeps one bucket per resource, keyed by the
+    ``X-RateLimit-Resource`` header of each response. Every response feeds its
+    ``X-RateLimit-Limit``, ``X-RateLimit-Remaining`` and ``X-RateLimit-Reset`` into its
+    resource's bucket. Requests are paced at the configured ceiling while plenty of quota is
+    left. Once a bucket's remaining quota drops to ``spread_below`` of its limit, its refill
+    rate becomes the lower of the ceiling and the remaining quota spread over the time left
+    until the reset, and its requests are held back entirely once the quota is down to the
+    reserve. ``Retry-After`` and secondary rate
+    limits apply to every resource. One instance is meant to be shared by all clients on a
+    worker, so concurrent activities draw from a single budget per resource.
+
+    State is guarded by a thread lock and waits are plain asyncio.sleep calls, so the
+    scheduler can be shared across event loops (e.g. the worker thread and the main thread).
+    """
+
+    def __init__(
+        self, requests_per_second: float = 10.0, burst: int = 10, reserve: int = 50, spread_below: float = 0.2
+    ):
+        """
+        Args:
+            requests_per_second: Upper bound on the sustained request rate of each resource.
+            burst: Number of requests per resource that may be sent back to back before pacing kicks in.
+            reserve: Remaining quota below which requests wait for the reset instead of being sent.
+            spread_below: Fraction of a resource's limit below which its remaining quota is
+                spread until the reset instead of being spent at the ceiling.
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.reserve = reserve
+        self.spread_below = spread_below
+        self._buckets: Dict[str, _Bucket] = {}
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _bucket(self, resource: str) -> _Bucket:
+        """
+        Returns the bucket of a resource, creating it on first use. Call with the lock held.
+        """
+        bucket = self._buckets.get(resource)
+        if bucket is None:
+            bucket = self._buckets[resource] = _Bucket(self.burst)
+        return bucket
+
+    def _current_rate(self, bucket: _Bucket) -> float:
+        """
+        Returns a bucket's refill rate: the ceiling, slowed down once the remaining quota runs
+        low so that it lasts until the reset.
+        """
+        rate = self.requests_per_second
+        limit = bucket.limit if bucket.limit is not None else bucket.remaining
+        if (
+            bucket.remaining is not None
+            and bucket.reset_at is not None
+            and bucket.remaining - self.reserve <= self.spread_below * limit
+        ):
+            seconds_to_reset = max(bucket.reset_at - time.time(), 1.0)
+            quota_rate = max(bucket.remaining - self.reserve, 1) / seconds_to_reset
+            rate = min(rate, quota_rate)
+        return rate
+
+    def _reserve(self, resource: str) -> float:
+        """
+        Takes one token from a resource's bucket and returns how long the caller has to wait for it.
+        """
+        with self._lock:
+            bucket = self._bucket(resource)
+            now = time.monotonic()
+            rate = self._current_rate(bucket)
+            bucket.tokens = min(float(self.burst), bucket.tokens + (now - bucket.last_refill) * rate)
+            bucket.last_refill = now
+            bucket.tokens -= 1
+            wait = -bucket.tokens / rate if bucket.tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now, bucket.blocked_until - now)
+
+    async def acquire(self, resource: str = DEFAULT_RESOURCE) -> float:
+        """
+        Waits until a request may be sent.
+
+        :param resource: The rate-limit resource the request draws from, see rate_limit_resource().
+        :return: The number of seconds spent waiting.
+        """
+        wait = self._reserve(resource)
+        if wait > 0:
+            logger.debug(f"Throttling GitHub API request on '{resource}' for {wait:.2f}s.")
+            await asyncio.sleep(wait)
+        return wait
+
+    def update(self, response: httpx.Response, resource: str = DEFAULT_RESOURCE) -> None:
+        """
+        Records the rate-limit headers of a response and blocks further requests if needed.
+
+        :param response: The HTTP response received from GitHub.
+        :param resource: The resource the request drew from, used when the response does not
+            carry ``X-RateLimit-Resource``.
+        """
+        headers = response.headers
+        resource = headers.get("x-ratelimit-resource", resource)
+        with self._lock:
+            bucket = self._bucket(resource)
+            if "x-ratelimit-limit" in headers:
+                bucket.limit = int(headers["x-ratelimit-limit"])
+            if "x-ratelimit-remaining" in headers:
+                bucket.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-reset" in headers:
+                bucket.reset_at = float(headers["x-ratelimit-reset"])
+
+            retry_after = headers.get("retry-after")
+            if retry_after is not None and retry_after.isdigit():
+                backoff = float(retry_after)
+                self._blocked_until = max(self._blocked_until, time.monotonic() + backoff)
+            elif bucket.remaining is not None and bucket.remaining <= self.reserve and bucket.reset_at is not None:
+                backoff = bucket.reset_at - time.time()
+                bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + backoff)
+            elif is_rate_limited(response):
+                backoff = SECONDARY_RATE_LIMIT_WAIT_SECONDS
+                self._blocked_until = max(self._blocked_until, time.monotonic() + backoff)
+            else:
+                backoff = 0.0
+
+            if backoff > 0:
+                logger.warning(
+                    f"GitHub rate limit reached on '{resource}' (remaining={bucket.remaining}); "
+                    f"pausing requests for {backoff:.0f}s."
+                )
+
+    def remaining(self, resource: str = DEFAULT_RESOURCE) -> Optional[int]:
+        """
+        Returns the last quota GitHub reported for a resource, or None before the first response.
+        """
+        with self._lock:
+            bucket = self._buckets.get(resource)
+            return bucket.remaining if bucket is not None else None
+
+    def blocked_for(self, resource: str = DEFAULT_RESOURCE) -> float:
+        """
+        Returns how many seconds requests on a resource are still held back by a rate limit or back-off.
+        """
+        with self._lock:
+            bucket = self._buckets.get(resource)
+            blocked_until = max(self._blocked_until, bucket.blocked_until if bucket is not None else 0.0)
+            return max(blocked_until - time.monotonic(), 0.0)
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the scheduler state.
+
+        :return: A dictionary keyed by resource, each with the last seen quota, reset time,
+            current rate and remaining block time.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                resource: {
+                    "limit": bucket.limit,
+                    "remaining": bucket.remaining,
+                    "reset_at": bucket.reset_at,
+                    "requests_per_second": self._current_rate(bucket),
+                    "blocked_for_seconds": max(self._blocked_until - now, bucket.blocked_until - now, 0.0),
+                }
+                for resource, bucket in self._buckets.items()
+            }
+
+
+_scheduler_instance: Optional[RateLimitScheduler] = None
+
+
+def get_rate_limit_scheduler() -> RateLimitScheduler:
+    """
+    Gets or creates the process-wide RateLimitScheduler.
+
+    Settings are read from the environment on first use:
+    ``GITHUB_MAX_REQUESTS_PER_SECOND``, ``GITHUB_REQUEST_BURST``, ``GITHUB_RATE_LIMIT_RESERVE`` and
+    ``GITHUB_RATE_LIMIT_SPREAD_BELOW``.
+
+    :return: The shared scheduler.
+    """
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = RateLimitScheduler(
+            requests_per_second=float(os.getenv("GITHUB_MAX_REQUESTS_PER_SECOND", "10")),
+            burst=int(os.getenv("GITHUB_REQUEST_BURST", "10")),
+            reserve=int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "50")),
+            spread_below=float(os.getenv("GITHUB_RATE_LIMIT_SPREAD_BELOW", "0.2")),
+        )
+    return _scheduler_instance
@@ -0,0 +1,174 @@
+import importlib.util
+import json
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+# orjson ships with the SDK's workflows extra and msgspec is a direct dependency; both fall back to the
+# stdlib so the records still decode in a partial install.
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+else:
+    orjson = None
+
+if importlib.util.find_spec("msgspec") is not None:
+    import msgspec
+else:
+    msgspec = None
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class Repository:
+    """
+    A repository object of the GitHub REST API, reduced to the fields we extract.
+
+    Field names follow the API so the object can be decoded straight from a response body.
+    """
+
+    name: Optional[str] = None
+    full_name: Optional[str] = None
+    description: Optional[str] = None
+    language: Optional[str] = None
+    stargazers_count: Optional[int] = None
+    forks_count: Optional[int] = None
+    open_issues_count: Optional[int] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    html_url: Optional[str] = None
+    # Only used to filter listings; not part of the extracted metadata.
+    fork: Optional[bool] = None
+    archived: Optional[bool] = None
+    private: Optional[bool] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the repository metadata dictionary passed between activities and written to the outputs.
+        """
+        return {
+            "name": self.name,
+            "full_name": self.full_name,
+            "description": self.description,
+            "language": self.language,
+            "star_count": self.stargazers_count,
+            "fork_count": self.forks_count,
+            "issue_count": self.open_issues_count,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "url": self.html_url,
+        }
+
+
+def repository_key(repo: Dict[str, Any]) -> str:
+    """
+    Identifies a repository metadata dictionary: ``owner/name``, or the bare name for records
+    without ``full_name``. Listings such as ``repo_type=member`` mix owners, so names alone clash.
+    """
+    return repo.get("full_name") or repo["name"]
+
+
+@dataclass(slots=True)
+class User:
+    """
+    A user or organization object of the GitHub REST API, reduced to the fields we extract.
+    """
+
+    login: Optional[str] = None
+    name: Optional[str] = None
+    node_id: Optional[str] = None
+    html_url: Optional[str] = None
+    avatar_url: Optional[str] = None
+    bio: Optional[str] = None
+    type: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    email: Optional[str] = None
+    blog: Optional[str] = None
+    twitter_username: Optional[str] = None
+    created_at: Optional[str] = None
+    followers: Optional[int] = None
+    following: Optional[int] = None
+    followers_url: Optional[str] = None
+    following_url: Optional[str] = None
+    public_repos: Optional[int] = None
+    public_gists: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns the user metadata dictionary, with fallback values for missing data.
+        """
+        return {
+            "login": self.login or "N/A",
+            "name": self.name or self.login or "N/A",
+            "node_id": self.node_id or "N/A",
+            "profile_url": self.html_url or "N/A",
+            "avatar_url": self.avatar_url or "N/A",
+            "bio": self.bio or "No bio provided.",
+            "type": self.type or "N/A",
+            "company": self.company or "N/A",
+            "location": self.location or "N/A",
+            "email": self.email or "N/A",
+            "blog": self.blog or "N/A",
+            "twitter_username": self.twitter_username or "N/A",
+            "created_at": self.created_at or "N/A",
+            "followers": self.followers or 0,
+            "following": self.following or 0,
+            "followers_url": self.followers_url or "N/A",
+            "following_url": self.following_url or "N/A",
+            "public_repos": self.public_repos or 0,
+            "public_gists": self.public_gists or 0,
+        }
+
+
+def project(record_type: Type[T], data: Dict[str, Any]) -> T:
+    """
+    Builds a record from an already decoded API object, keeping only the record's fields.
+    """
+    return record_type(**{field.name: data.get(field.name) for field in fields(record_type)})
+
+
+def decode(content: bytes, record_type: Type[T]) -> T:
+    """
+    Decodes a single API object from a response body into a record.
+
+    With msgspec installed, only the record's fields are materialized; nested objects the
+    record does not keep (owner, permissions, license, ...) are skipped while parsing.
+
+    :param content: The JSON response body.
+    :param record_type: Repository or User.
+    :return: The record.
+    """
+    if msgspec is not None:
+        return msgspec.json.decode(content, type=record_type)
+    return project(record_type, loads(content))
+
+
+def decode_list(content: bytes, record_type: Type[T]) -> List[T]:
+    """
+    Decodes a JSON array of API objects (e.g. a page of repositories) into records.
+
+    :param content: The JSON response body.
+    :param record_type: Repository or User.
+    :return: The records, in response order.
+    """
+    if msgspec is not None:
+        return msgspec.json.decode(content, type=List[record_type])
+    return [project(record_type, item) for item in loads(content)]
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serializes a JSON-compatible value to compact UTF-8 JSON, with orjson when available.
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def loads(content: bytes) -> Any:
+    """
+    Parses JSON bytes, with orjson when available.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from application_sdk.observability.logger_adaptor import get_logger
+from application_sdk.services.objectstore import ObjectStore
+
+from app.records import dumps, loads
+
+logger = get_logger(__name__)
+
+# Marker key identifying a claim-check reference among activity inputs and outputs.
+REFERENCE_KEY = "$ref"
+
+# How long stored datasets are kept: long enough for any workflow still holding their reference.
+DEFAULT_MAX_AGE = timedelta(days=7)
+
+
+class DataStore(ABC):
+    """
+    Interface for the stores holding datasets passed between activities by reference.
+    """
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes) -> None:
+        """
+        Stores bytes under a key, replacing any previous content.
+        """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes:
+        """
+        Returns the bytes stored under a key.
+        """
+
+
+class LocalDataStore(DataStore):
+    """
+    Stores datasets as files under a local directory. Suitable for a single worker node and for tests.
+
+    Nothing tells the store when a workflow no longer needs a reference, so each write removes
+    the files of its directory older than ``max_age``.
+    """
+
+    def __init__(self, base_dir: str, max_age: timedelta = DEFAULT_MAX_AGE):
+        """
+        Args:
+            base_dir: Directory holding the stored files. Created on first write.
+            max_age: Age after which a stored file is removed.
+        """
+        self.base_dir = base_dir
+        self.max_age = max_age
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.base_dir, *key.split("/"))
+
+    def _remove_expired(self, directory: str) -> None:
+        """
+        Removes stored files not written to for longer than ``max_age``.
+        """
+        cutoff = time.time() - self.max_age.total_seconds()
+        for entry in os.scandir(directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    logger.info(f"Removed expired claim-check data '{entry.path}'.")
+            except FileNotFoundError:
+                # Removed concurrently by another activity.
+                pass
+
+    def _put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._remove_expired(os.path.dirname(path))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    async def put(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(self._put, key, data)
+
+    async def get(self, key: str) -> bytes:
+        return await asyncio.to_thread(self._get, key)
+
+
+class ObjectStoreDataStore(DataStore):
+    """
+    Stores datasets in the deployment object store through the application SDK (Dapr binding),
+    so activities running on different workers can exchange references.
+
+    Stored objects are not deleted by the application; expire them with a lifecycle rule on
+    the ``claim-check/`` prefix of the bucket.
+    """
+
+    async def put(self, key: str, data: bytes) -> None:
+        # ObjectStore uploads from a local file and removes it on success only.
+        fd, tmp_path = tempfile.mkstemp(suffix=".json")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            await ObjectStore.upload_file(source=tmp_path, destination=key)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    async def get(self, key: str) -> bytes:
+        return await ObjectStore.get_content(key)
+
+
+def is_reference(value: Any) -> bool:
+    """
+    Tells whether an activity input or output is a claim-check reference.
+    """
+    return isinstance(value, dict) and REFERENCE_KEY in value
+
+
+async def store_records(records: List[Dict[str, Any]], name: str, store: Optional[DataStore] = None) -> Dict[str, Any]:
+    """
+    Writes a dataset to the store and returns a small reference to pass through Temporal instead.
+
+    :param records: The dataset to store.
+    :param name: A short label included in the key, e.g. ``repositories``.
+    :param store: The store to use. Defaults to get_data_store().
+    :return: A reference holding the key, the record count, the size in bytes and a SHA-256 checksum.
+    """
+    store = store or get_data_store()
+    data = dumps(records)
+    key = f"claim-check/{uuid.uuid4().hex}-{name}.json"
+    await store.put(key, data)
+    logger.info(f"Stored {len(records)} records ({len(data)} bytes) by reference at '{key}'.")
+    return {REFERENCE_KEY: key, "count": len(records), "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+async def load_records(value: Union[List[Dict[str, Any]], Dict[str, Any]], store: Optional[DataStore] = None) -> List[Dict[str, Any]]:
+    """
+    Resolves an activity input that is either an inline dataset or a claim-check reference.
+
+    :param value: The inline records, or a reference produced by store_records.
+    :param store: The store to use. Defaults to get_data_store().
+    :return: The records.
+    :raises ValueError: If the stored data does not match the reference's checksum.
+    """
+    if not is_reference(value):
+        return value
+    store = store or get_data_store()
+    data = await store.get(value[REFERENCE_KEY])
+    if hashlib.sha256(data).hexdigest() != value["sha256"]:
+        raise ValueError(f"Checksum mismatch for claim-check reference '{value[REFERENCE_KEY]}'.")
+    return loads(data)
+
+
+def get_data_store() -> DataStore:
+    """
+    Returns the claim-check store selected by ``GITHUB_CLAIM_CHECK_STORE``: ``local`` (default,
+    files under ``GITHUB_CLAIM_CHECK_DIR``, default ``.github_state/claim_check``, removed after
+    ``GITHUB_CLAIM_CHECK_MAX_AGE_HOURS``, default ``168``) or ``objectstore`` (the SDK's Dapr object store).
+    """
+    backend = os.getenv("GITHUB_CLAIM_CHECK_STORE", "local").lower()
+    if backend == "objectstore":
+        return ObjectStoreDataStore()
+    if backend == "local":
+        return LocalDataStore(
+            os.getenv("GITHUB_CLAIM_CHECK_DIR", os.path.join(".github_state", "claim_check")),
+            max_age=timedelta(hours=float(os.getenv("GITHUB_CLAIM_CHECK_MAX_AGE_HOURS", "168"))),
+        )
+    raise ValueError(f"Unknown GITHUB_CLAIM_CHECK_STORE '{backend}'. Expected 'local' or 'objectstore'.")
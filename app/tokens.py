@@ -0,0 +1,181 @@
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+from app.ratelimit import DEFAULT_RESOURCE, RateLimitScheduler
+
+logger = get_logger(__name__)
+
+# Hourly quota of an authenticated token (REST requests or GraphQL points), assumed until GitHub reports it.
+DEFAULT_QUOTA = 5000
+
+
+@dataclass
+class Credential:
+    """
+    One token of a TokenPool with its own rate-limit budget.
+
+    Attributes:
+        token: A personal access token or a GitHub App installation token.
+        scheduler: Paces the token's requests and tracks its quota from the response headers.
+        in_flight: Requests currently sent with the token.
+        revoked: Set once GitHub rejected the token with a 401; it is never used again.
+    """
+
+    token: str
+    scheduler: RateLimitScheduler
+    in_flight: int = 0
+    revoked: bool = False
+
+    @property
+    def authorization(self) -> str:
+        return f"token {self.token}"
+
+    @property
+    def name(self) -> str:
+        """
+        A masked form of the token, safe to log.
+        """
+        return f"...{self.token[-4:]}"
+
+    def headroom(self, resource: str = DEFAULT_RESOURCE) -> int:
+        """
+        Returns the requests the token can still make on a resource, minus those already in flight.
+        """
+        remaining = self.scheduler.remaining(resource)
+        remaining = remaining if remaining is not None else DEFAULT_QUOTA
+        return remaining - self.scheduler.reserve - self.in_flight
+
+
+class TokenPool:
+    """
+    Spreads GitHub API requests over several tokens, each with its own quota.
+
+    Every token gets its own RateLimitScheduler, so quota tracking, pacing and back-off
+    work per token and throughput grows with the number of tokens. Each request goes to
+    the available token with the most headroom. A token that is exhausted or asked to
+    back off is parked by its scheduler until its reset, while the others keep serving
+    requests. A token rejected with a 401 (revoked or expired) is dropped. One instance is
+    meant to be shared by all clients on a worker.
+    """
+
+    def __init__(self, tokens: List[str], scheduler_factory: Optional[Callable[[], RateLimitScheduler]] = None):
+        """
+        Args:
+            tokens: The tokens to use. Duplicates are ignored.
+            scheduler_factory: Builds the scheduler of each token. Defaults to RateLimitScheduler().
+        """
+        unique_tokens = list(dict.fromkeys(token for token in tokens if token))
+        if not unique_tokens:
+            raise ValueError("A token pool needs at least one token.")
+        factory = scheduler_factory or RateLimitScheduler
+        self.credentials = [Credential(token=token, scheduler=factory()) for token in unique_tokens]
+        # Stands in for the Authorization header in cache and coalescing keys: the tokens are
+        # assumed to see the same data, so responses fetched with any of them are shared.
+        self.identity = "pool:" + ",".join(sorted(credential.authorization for credential in self.credentials))
+        self._lock = threading.Lock()
+
+    def _select(self, resource: str) -> Credential:
+        """
+        Picks the token with the most headroom on a resource among those not parked, else the one unparked first.
+        """
+        with self._lock:
+            usable = [credential for credential in self.credentials if not credential.revoked]
+            if not usable:
+                raise RuntimeError("Every GitHub token in the pool was rejected as invalid or revoked.")
+            ready = [credential for credential in usable if credential.scheduler.blocked_for(resource) == 0]
+            if ready:
+                credential = max(ready, key=lambda credential: credential.headroom(resource))
+            else:
+                credential = min(usable, key=lambda credential: credential.scheduler.blocked_for(resource))
+            credential.in_flight += 1
+            return credential
+
+    async def acquire(self, resource: str = DEFAULT_RESOURCE) -> tuple[Credential, float]:
+        """
+        Picks a token for one request and waits until its scheduler lets the request go.
+
+        Call release() with the response (or None) once the request is done.
+
+        :param resource: The rate-limit resource the request draws from, see rate_limit_resource().
+        :return: The credential and the seconds spent waiting.
+        :raises RuntimeError: If every token was revoked.
+        """
+        credential = self._select(resource)
+        try:
+            wait = await credential.scheduler.acquire(resource)
+        except BaseException:
+            self.release(credential)
+            raise
+        return credential, wait
+
+    def release(
+        self, credential: Credential, response: Optional[httpx.Response] = None, resource: str = DEFAULT_RESOURCE
+    ) -> None:
+        """
+        Records the outcome of a request sent with a token.
+
+        :param credential: The credential returned by acquire().
+        :param response: The response, or None if the request failed without one.
+        :param resource: The rate-limit resource passed to acquire().
+        """
+        with self._lock:
+            credential.in_flight = max(credential.in_flight - 1, 0)
+            if response is not None and response.status_code == 401 and not credential.revoked:
+                credential.revoked = True
+                logger.warning(f"GitHub rejected token {credential.name} (401); removing it from the pool.")
+        if response is not None:
+            credential.scheduler.update(response, resource)
+
+    def available(self) -> int:
+        """
+        Returns the number of tokens not revoked.
+        """
+        with self._lock:
+            return sum(not credential.revoked for credential in self.credentials)
+
+    def state(self) -> List[Dict[str, Any]]:
+        """
+        Returns a snapshot of every token's quota per resource, with masked token values.
+        """
+        return [
+            {"token": credential.name, "revoked": credential.revoked, "in_flight": credential.in_flight, "resources": credential.scheduler.state()}
+            for credential in self.credentials
+        ]
+
+
+_token_pool_instance: Optional[TokenPool] = None
+
+
+def get_token_pool() -> Optional[TokenPool]:
+    """
+    Gets or creates the process-wide TokenPool.
+
+    Tokens are read from ``GITHUB_PATS`` (comma-separated personal access tokens and/or
+    GitHub App installation tokens) on first use, together with ``GITHUB_PAT`` if set. Each
+    token is paced with the ``GITHUB_MAX_REQUESTS_PER_SECOND``, ``GITHUB_REQUEST_BURST``,
+    ``GITHUB_RATE_LIMIT_RESERVE`` and ``GITHUB_RATE_LIMIT_SPREAD_BELOW`` settings.
+
+    :return: The shared pool, or None if ``GITHUB_PATS`` is not set.
+    """
+    global _token_pool_instance
+    tokens = [token.strip() for token in os.getenv("GITHUB_PATS", "").split(",") if token.strip()]
+    if not tokens:
+        return None
+    if _token_pool_instance is None:
+        _token_pool_instance = TokenPool(
+            [os.getenv("GITHUB_PAT", "")] + tokens,
+            scheduler_factory=lambda: RateLimitScheduler(
+                requests_per_second=float(os.getenv("GITHUB_MAX_REQUESTS_PER_SECOND", "10")),
+                burst=int(os.getenv("GITHUB_REQUEST_BURST", "10")),
+                reserve=int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "50")),
+                spread_below=float(os.getenv("GITHUB_RATE_LIMIT_SPREAD_BELOW", "0.2")),
+            ),
+        )
+        logger.info(f"Using a pool of {len(_token_pool_instance.credentials)} GitHub tokens.")
+    return _token_pool_instance
@@ -0,0 +1,276 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, List, Optional, Sequence
+
+from application_sdk.clients.utils import get_workflow_client
+from application_sdk.constants import IS_LOCKING_DISABLED, MAX_CONCURRENT_ACTIVITIES
+from application_sdk.interceptors.events import EventInterceptor, publish_event
+from application_sdk.interceptors.lock import RedisLockInterceptor
+from application_sdk.observability.logger_adaptor import get_logger
+from temporalio.client import Client
+from temporalio.worker import Worker
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+from app.activities import GitHubActivities
+from app.clients import close_connection_pool
+from app.keywords import shutdown_keyword_engine
+from app.payloads import install_data_converter
+from app.workflow import GitHubWorkflow, cpu_task_queue
+
+logger = get_logger(__name__)
+
+# Activities scheduled on the CPU task queue by workflows started with ``cpu_task_queue``.
+# Everything else (GitHub API calls, snapshots) is I/O-bound and stays on the main queue.
+CPU_ACTIVITIES = ("extract_keywords_activity", "fetch_data_quality_metrics_activity")
+
+# Modules the workflow sandbox takes from the worker process instead of re-importing them, for
+# in-process and multi-process workers alike. ``app`` is deliberately not among them, so the
+# workflow module is always imported in the sandbox.
+PASSTHROUGH_MODULES = ["application_sdk", "requests", "httpx", "urllib3", "warnings", "os", "grpc", "pyatlan", "orjson", "msgspec"]
+
+
+@dataclass
+class WorkerSettings:
+    """
+    Worker process layout and per-process concurrency limits.
+
+    Attributes:
+        processes: Worker processes polling the main task queue for workflow tasks and
+            activities. 0 keeps the single in-process worker started by the application.
+        cpu_processes: Worker processes polling ``<task queue>-cpu`` for the CPU-bound
+            activities (see CPU_ACTIVITIES) of workflows started with ``cpu_task_queue``.
+        max_concurrent_activities: Activities run at once per main-queue process.
+        max_concurrent_workflow_tasks: Workflow tasks run at once per main-queue process
+            (None keeps the Temporal default).
+        cpu_max_concurrent_activities: Activities run at once per CPU process.
+        drain_timeout: Seconds running activities get to finish on shutdown before they
+            are cancelled.
+    """
+
+    processes: int = 0
+    cpu_processes: int = 0
+    max_concurrent_activities: int = MAX_CONCURRENT_ACTIVITIES
+    max_concurrent_workflow_tasks: Optional[int] = None
+    cpu_max_concurrent_activities: int = 1
+    drain_timeout: float = 60.0
+
+
+def get_worker_settings() -> WorkerSettings:
+    """
+    Reads the worker settings from the environment: ``GITHUB_WORKER_PROCESSES``,
+    ``GITHUB_CPU_WORKER_PROCESSES``, ``GITHUB_MAX_CONCURRENT_ACTIVITIES`` (default
+    ``ATLAN_MAX_CONCURRENT_ACTIVITIES``), ``GITHUB_MAX_CONCURRENT_WORKFLOW_TASKS``,
+    ``GITHUB_CPU_MAX_CONCURRENT_ACTIVITIES`` and ``GITHUB_WORKER_DRAIN_TIMEOUT``.
+
+    :return: The settings.
+    :raises ValueError: If CPU processes are configured without main-queue processes.
+    """
+    workflow_tasks = os.getenv("GITHUB_MAX_CONCURRENT_WORKFLOW_TASKS")
+    settings = WorkerSettings(
+        processes=int(os.getenv("GITHUB_WORKER_PROCESSES", "0")),
+        cpu_processes=int(os.getenv("GITHUB_CPU_WORKER_PROCESSES", "0")),
+        max_concurrent_activities=int(os.getenv("GITHUB_MAX_CONCURRENT_ACTIVITIES", str(MAX_CONCURRENT_ACTIVITIES))),
+        max_concurrent_workflow_tasks=int(workflow_tasks) if workflow_tasks else None,
+        cpu_max_concurrent_activities=int(os.getenv("GITHUB_CPU_MAX_CONCURRENT_ACTIVITIES", "1")),
+        drain_timeout=float(os.getenv("GITHUB_WORKER_DRAIN_TIMEOUT", "60")),
+    )
+    if settings.cpu_processes and not settings.processes:
+        raise ValueError("GITHUB_CPU_WORKER_PROCESSES requires GITHUB_WORKER_PROCESSES to be at least 1.")
+    return settings
+
+
+def build_worker(
+    client: Client,
+    task_queue: str,
+    activities: Sequence[Callable[..., Any]],
+    workflow_classes: Sequence[type] = (),
+    max_concurrent_activities: int = MAX_CONCURRENT_ACTIVITIES,
+    max_concurrent_workflow_tasks: Optional[int] = None,
+    drain_timeout: float = 60.0,
+) -> Worker:
+    """
+    Builds a Temporal worker like the SDK's create_worker, with the concurrency and drain settings exposed.
+
+    Workers running workflows also get the SDK's system activities (event publishing and,
+    unless disabled, distributed locks), which workflows schedule on their own task queue.
+
+    :param client: The connected Temporal client.
+    :param task_queue: The task queue to poll.
+    :param activities: The activities to run.
+    :param workflow_classes: The workflows to run, if any.
+    :param max_concurrent_activities: Activities run at once.
+    :param max_concurrent_workflow_tasks: Workflow tasks run at once (None for the Temporal default).
+    :param drain_timeout: Seconds running activities get to finish on shutdown.
+    :return: The worker, not started.
+    """
+    activities = list(activities)
+    if workflow_classes:
+        activities.append(publish_event)
+        if not IS_LOCKING_DISABLED:
+            from application_sdk.activities.lock_management import acquire_distributed_lock, release_distributed_lock
+
+            activities.extend([acquire_distributed_lock, release_distributed_lock])
+    return Worker(
+        client,
+        task_queue=task_queue,
+        workflows=list(workflow_classes),
+        activities=activities,
+        workflow_runner=SandboxedWorkflowRunner(
+            restrictions=SandboxRestrictions.default.with_passthrough_modules(*PASSTHROUGH_MODULES)
+        ),
+        max_concurrent_activities=max_concurrent_activities,
+        max_concurrent_workflow_tasks=max_concurrent_workflow_tasks,
+        activity_executor=ThreadPoolExecutor(max_workers=max_concurrent_activities, thread_name_prefix="activity-pool-"),
+        graceful_shutdown_timeout=timedelta(seconds=drain_timeout),
+        interceptors=[
+            EventInterceptor(),
+            RedisLockInterceptor({getattr(activity, "__name__", str(activity)): activity for activity in activities}),
+        ],
+    )
+
+
+def build_role_worker(client: Client, task_queue: str, role: str, settings: WorkerSettings) -> Worker:
+    """
+    Builds the worker of one process role.
+
+    ``main`` polls the main task queue for workflow tasks and all activities; it also runs the
+    CPU-bound ones for workflows started without ``cpu_task_queue``. ``cpu`` polls the CPU
+    task queue for CPU_ACTIVITIES.
+
+    :param client: The connected Temporal client.
+    :param task_queue: The main task queue of the application.
+    :param role: ``main`` or ``cpu``.
+    :param settings: The worker settings.
+    :return: The worker, not started.
+    """
+    activities = GitHubWorkflow.get_activities(GitHubActivities())
+    if role == "cpu":
+        return build_worker(
+            client,
+            cpu_task_queue(task_queue),
+            [activity for activity in activities if activity.__name__ in CPU_ACTIVITIES],
+            max_concurrent_activities=settings.cpu_max_concurrent_activities,
+            drain_timeout=settings.drain_timeout,
+        )
+    if role != "main":
+        raise ValueError(f"Unknown worker role '{role}'. Expected 'main' or 'cpu'.")
+    return build_worker(
+        client,
+        task_queue,
+        activities,
+        workflow_classes=[GitHubWorkflow],
+        max_concurrent_activities=settings.max_concurrent_activities,
+        max_concurrent_workflow_tasks=settings.max_concurrent_workflow_tasks,
+        drain_timeout=settings.drain_timeout,
+    )
+
+
+async def run_worker(worker: Worker, stop: asyncio.Event) -> None:
+    """
+    Runs a worker until ``stop`` is set, then drains it.
+
+    The worker stops polling at once; running activities get the worker's graceful shutdown
+    timeout to finish before they are cancelled.
+
+    :param worker: The worker to run.
+    :param stop: Event requesting the shutdown.
+    """
+    run_task = asyncio.create_task(worker.run())
+    stop_task = asyncio.create_task(stop.wait())
+    await asyncio.wait([run_task, stop_task], return_when=asyncio.FIRST_COMPLETED)
+    stop_task.cancel()
+    if not run_task.done():
+        logger.info(f"Draining worker on task queue '{worker.task_queue}'.")
+        await worker.shutdown()
+    await run_task
+
+
+async def serve(application_name: str, role: str, settings: WorkerSettings) -> None:
+    """
+    Connects to Temporal and runs the worker of one process until SIGTERM or SIGINT.
+
+    :param application_name: The application name, which determines the task queue.
+    :param role: ``main`` or ``cpu``.
+    :param settings: The worker settings.
+    """
+    started = time.perf_counter()
+    if role == "cpu":
+        # Each CPU process is one unit of parallelism; do not fan out into a keyword pool per process.
+        os.environ.setdefault("KEYWORD_WORKERS", "1")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Signal handlers are not available on Windows event loops.
+            pass
+
+    workflow_client = get_workflow_client(application_name=application_name)
+    await workflow_client.load()
+    try:
+        client = install_data_converter(workflow_client.client)
+        worker = build_role_worker(client, workflow_client.worker_task_queue, role, settings)
+        logger.info(
+            f"Worker process {os.getpid()} ({role}) polling task queue '{worker.task_queue}', "
+            f"{time.perf_counter() - started:.2f}s after start."
+        )
+        await run_worker(worker, stop)
+    finally:
+        await close_connection_pool()
+        shutdown_keyword_engine()
+        await workflow_client.close()
+
+
+def _process_main(application_name: str, role: str, settings: WorkerSettings) -> None:
+    asyncio.run(serve(application_name, role, settings))
+
+
+def start_worker_processes(application_name: str, settings: WorkerSettings) -> List[multiprocessing.Process]:
+    """
+    Starts ``settings.processes`` main-queue and ``settings.cpu_processes`` CPU worker processes.
+
+    Processes are spawned rather than forked, so none of them inherits the parent's event
+    loop, connection pool or gRPC channels.
+
+    :param application_name: The application name, which determines the task queue.
+    :param settings: The worker settings.
+    :return: The started processes.
+    """
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for role, count in (("main", settings.processes), ("cpu", settings.cpu_processes)):
+        for index in range(count):
+            process = context.Process(
+                target=_process_main, args=(application_name, role, settings), name=f"worker-{role}-{index}", daemon=False
+            )
+            process.start()
+            processes.append(process)
+    logger.info(f"Started {settings.processes} worker processes and {settings.cpu_processes} CPU worker processes.")
+    return processes
+
+
+def stop_worker_processes(processes: List[multiprocessing.Process], drain_timeout: float) -> None:
+    """
+    Asks every worker process to drain, and kills those still running after the drain timeout.
+
+    :param processes: The processes returned by start_worker_processes.
+    :param drain_timeout: The workers' drain timeout, in seconds.
+    """
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        # Leave time for the activities to be cancelled and their results reported after the drain.
+        process.join(timeout=drain_timeout + 10)
+        if process.is_alive():
+            logger.warning(f"Worker process {process.name} did not stop in time; killing it.")
+            process.kill()
+            process.join()
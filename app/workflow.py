@@ -1,7 +1,7 @@
 
 import asyncio
 from datetime import timedelta
-from typing import Any, Callable, Dict, List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 from application_sdk.observability.decorators.observability_decorator import observability
 from application_sdk.observability.logger_adaptor import get_logger
@@ -10,78 +10,217 @@ from application_sdk.observability.traces_adaptor import get_traces
 from temporalio import workflow
 from temporalio.common import RetryPolicy
 
-from app.activities import GitHubActivities
+if TYPE_CHECKING:
+    # Activities are scheduled by name, so the sandbox never imports their implementation
+    # (GitHub client, HTTP stack, YAKE, pyarrow) when it validates and runs the workflow.
+    from app.activities import GitHubActivities
 
 logger = get_logger(__name__)
 workflow.logger = logger
 metrics = get_metrics()
 traces = get_traces()
 
+DEFAULT_BATCH_CONCURRENCY = 10
+
+# With ``cpu_task_queue`` set in the workflow arguments, keyword extraction and quality metrics
+# are scheduled on "<task queue>-cpu", served by dedicated CPU worker processes, so they scale
+# separately from the I/O-bound fetch activities. The choice is part of the workflow input, so
+# it is recorded in history and replays the same whatever the replaying worker's settings.
+CPU_TASK_QUEUE_SUFFIX = "-cpu"
+
+# How long an activity may wait on the CPU task queue for a worker. Nothing polls the queue when
+# ``cpu_task_queue`` is set without CPU worker processes; the activity then fails instead of hanging.
+CPU_SCHEDULE_TO_START_TIMEOUT = timedelta(minutes=10)
+
+
+def enriches_readme(workflow_args: Dict[str, Any]) -> bool:
+    """
+    Tells whether the workflow arguments ask for README enrichment (``enrich`` is ``true`` or lists ``readme``).
+    """
+    enrich = workflow_args.get("enrich")
+    return enrich is True or (isinstance(enrich, (list, tuple)) and "readme" in enrich)
+
+
+def cpu_task_queue(task_queue: str) -> str:
+    """
+    Returns the task queue of the CPU-bound activities for a workflow task queue.
+    """
+    return f"{task_queue}{CPU_TASK_QUEUE_SUFFIX}"
+
 
 @workflow.defn
 class GitHubWorkflow:
 
     @observability(logger=logger, metrics=metrics, traces=traces)
     @workflow.run
-    async def run(self, workflow_config: Dict[str, Any]):
+    async def run(self, workflow_config: Dict[str, Any]) -> Dict[str, Any]:
         """
         Run the GitHub metadata extraction workflow.
 
+        A single account is extracted from ``username`` (or GITHUB_USERNAME on the worker).
+        With ``incremental`` set, only repositories updated since the previous run are
+        fetched and tagged, and the merged result is saved as the next run's snapshot.
+        With ``enrich`` set (``true`` or a list of fields), repositories get their language
+        bytes, topics, contributor count and README before keywords are extracted.
+        With ``cpu_task_queue`` set, the CPU-bound activities run on the CPU task queue.
+        With ``claim_check`` set, repository lists travel between activities as small
+        references to the claim-check store instead of inline payloads. README enrichment
+        always uses it, since README text quickly outgrows Temporal's payload size limit.
+        When ``accounts`` holds a list of usernames/orgs, the workflow runs in batch mode
+        instead and extracts each of them in a child workflow.
+
         :param workflow_config: The workflow arguments.
+        :return: The data quality metrics of the account, or the batch summary.
         """
-        activities_instance = GitHubActivities()
-
         workflow_args = workflow_config
 
+        if workflow_args.get("accounts"):
+            return await self._run_batch(workflow_args)
+        return await self._run_account(workflow_args)
+
+    async def _run_account(self, workflow_args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the preflight -> fetch -> keywords -> metrics pipeline for one account.
+
+        :param workflow_args: The workflow arguments.
+        :return: The data quality metrics of the account.
+        """
+        output_dir = workflow_args.get("output_dir", "")
+        if enriches_readme(workflow_args) and not workflow_args.get("claim_check"):
+            workflow_args = {**workflow_args, "claim_check": True}
+        cpu_queue: Optional[str] = cpu_task_queue(workflow.info().task_queue) if workflow_args.get("cpu_task_queue") else None
+        cpu_schedule_to_start: Optional[timedelta] = CPU_SCHEDULE_TO_START_TIMEOUT if cpu_queue else None
+
         retry_policy = RetryPolicy(
             maximum_attempts=6,
             backoff_coefficient=2,
         )
 
         # 1. Run preflight check activity to validate credentials
-        await workflow.execute_activity_method(
-            activities_instance.preflight_check,
+        await workflow.execute_activity(
+            "preflight_check",
             workflow_args,
             retry_policy=retry_policy,
             start_to_close_timeout=timedelta(seconds=60),
         )
 
         # 2. Fetch raw user and repository data in parallel
-        user_metadata_task = workflow.execute_activity_method(
-            activities_instance.fetch_user_metadata_activity,
+        user_metadata_task = workflow.execute_activity(
+            "fetch_user_metadata_activity",
             workflow_args,
             retry_policy=retry_policy,
             start_to_close_timeout=timedelta(minutes=5),
         )
 
-        repo_metadata_task = workflow.execute_activity_method(
-            activities_instance.fetch_repositories_metadata_activity,
+        repo_metadata_task = workflow.execute_activity(
+            "fetch_repositories_metadata_activity",
             workflow_args,
             retry_policy=retry_policy,
             start_to_close_timeout=timedelta(minutes=5),
+            heartbeat_timeout=timedelta(minutes=2),
         )
 
         user_metadata, repo_metadata = await asyncio.gather(user_metadata_task, repo_metadata_task)
-        
+
+        if workflow_args.get("enrich"):
+            repo_metadata = await workflow.execute_activity(
+                "enrich_repositories_activity",
+                args=[workflow_args, repo_metadata],
+                retry_policy=retry_policy,
+                start_to_close_timeout=timedelta(minutes=30),
+                heartbeat_timeout=timedelta(minutes=2),
+            )
         
         # 3. Process the fetched data for simple quality metrics and automated tagging.
-        repo_metadata_with_tags = await workflow.execute_activity_method(
-            activities_instance.extract_keywords_activity,
-            repo_metadata,
+        # Scoring README text takes far longer than descriptions alone; the activity heartbeats while it runs.
+        keyword_timeout = timedelta(minutes=30) if enriches_readme(workflow_args) else timedelta(seconds=60)
+        repo_metadata_with_tags = await workflow.execute_activity(
+            "extract_keywords_activity",
+            args=[repo_metadata, output_dir],
+            task_queue=cpu_queue,
             retry_policy=retry_policy,
-            start_to_close_timeout=timedelta(seconds=60),
+            schedule_to_start_timeout=cpu_schedule_to_start,
+            start_to_close_timeout=keyword_timeout,
+            heartbeat_timeout=timedelta(minutes=2),
         )
+        if workflow_args.get("incremental"):
+            # Only persist the snapshot once the whole account is tagged, so a failed run is redone next time.
+            await workflow.execute_activity(
+                "save_repository_snapshot_activity",
+                args=[workflow_args, repo_metadata_with_tags],
+                retry_policy=retry_policy,
+                start_to_close_timeout=timedelta(seconds=60),
+            )
+
         raw_data ={"user_data": user_metadata, "repo_data": repo_metadata_with_tags}
  
-        await workflow.execute_activity_method(
-            activities_instance.fetch_data_quality_metrics_activity,
-            raw_data,
+        return await workflow.execute_activity(
+            "fetch_data_quality_metrics_activity",
+            args=[raw_data, output_dir],
+            task_queue=cpu_queue,
             retry_policy=retry_policy,
+            schedule_to_start_timeout=cpu_schedule_to_start,
             start_to_close_timeout=timedelta(seconds=60),
         )
 
+    async def _run_batch(self, workflow_args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract every account in ``accounts`` through child workflows.
+
+        At most ``batch_concurrency`` children (default 10) run at once. Each child writes
+        its files under ``<output_dir>/<account>``. A failing account is recorded in the
+        summary instead of failing the whole batch.
+
+        :param workflow_args: The workflow arguments, including ``accounts``.
+        :return: An aggregated summary with per-account metrics and failures.
+        """
+        accounts: List[str] = list(dict.fromkeys(workflow_args["accounts"]))
+        semaphore = asyncio.Semaphore(workflow_args.get("batch_concurrency", DEFAULT_BATCH_CONCURRENCY))
+        base_output_dir = workflow_args.get("output_dir") or "output"
+        parent_id = workflow.info().workflow_id
+
+        child_base_args = {
+            key: value for key, value in workflow_args.items() if key not in ("accounts", "batch_concurrency")
+        }
+
+        async def run_child(account: str) -> Any:
+            async with semaphore:
+                try:
+                    return await workflow.execute_child_workflow(
+                        GitHubWorkflow.run,
+                        {**child_base_args, "username": account, "output_dir": f"{base_output_dir}/{account}"},
+                        id=f"{parent_id}-{account}",
+                    )
+                except Exception as e:
+                    return e
+
+        results = await asyncio.gather(*(run_child(account) for account in accounts))
+
+        summary: Dict[str, Any] = {
+            "total_accounts": len(accounts),
+            "succeeded": [],
+            "failed": {},
+            "total_public_repos": 0,
+            "total_followers": 0,
+            "metrics": {},
+        }
+        for account, result in zip(accounts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Extraction failed for account '{account}': {result}")
+                summary["failed"][account] = str(result)
+                continue
+            summary["succeeded"].append(account)
+            summary["metrics"][account] = result
+            summary["total_public_repos"] += result.get("total_public_repos", 0)
+            summary["total_followers"] += result.get("total_followers", 0)
+
+        logger.info(
+            f"Batch extraction finished: {len(summary['succeeded'])} succeeded, {len(summary['failed'])} failed."
+        )
+        return summary
+
     @staticmethod
-    def get_activities(activities: GitHubActivities) -> List[Callable[..., Any]]:
+    def get_activities(activities: "GitHubActivities") -> List[Callable[..., Any]]:
         """
         Get the list of activities for the workflow.
         """
@@ -91,4 +230,6 @@ class GitHubWorkflow:
             activities.fetch_repositories_metadata_activity,
             activities.fetch_data_quality_metrics_activity,
             activities.extract_keywords_activity,
+            activities.save_repository_snapshot_activity,
+            activities.enrich_repositories_activity,
         ]
\ No newline at end of file
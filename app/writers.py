@@ -0,0 +1,183 @@
+import asyncio
+import gzip
+import importlib.util
+import json
+import os
+import queue
+import textwrap
+import threading
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+from application_sdk.observability.logger_adaptor import get_logger
+
+from app.records import dumps
+
+logger = get_logger(__name__)
+
+OUTPUT_FORMATS = ("json", "ndjson")
+OUTPUT_COMPRESSIONS = ("none", "gzip", "zstd")
+
+_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Queue item telling the writer thread to finish the file.
+_CLOSE = object()
+
+
+def output_file_name(stem: str, output_format: str = "json", compression: str = "none") -> str:
+    """
+    Builds the name of an output file, e.g. ``github_repo_metadata.ndjson.gz``.
+
+    :param stem: The file name without extension.
+    :param output_format: ``json`` or ``ndjson``.
+    :param compression: ``none``, ``gzip`` or ``zstd``.
+    :return: The file name.
+    """
+    return f"{stem}.{output_format}{_COMPRESSION_SUFFIXES[compression]}"
+
+
+def _open_text(path: str, compression: str) -> IO[str]:
+    """
+    Opens a file for writing text, compressed on the fly if requested.
+    """
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        zstandard = importlib.import_module("zstandard")
+        return zstandard.open(path, "wt", encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+class RecordWriter:
+    """
+    Streams records to an output file from a background thread.
+
+    Callers hand over chunks of records (e.g. each page of a listing as it completes) with
+    write(), which only queues them, so encoding and disk I/O never block the event loop.
+    Records are serialized one at a time and the file is written under a temporary name and
+    renamed into place once complete, so readers never see a partial file and a failed
+    activity leaves the previous output untouched.
+
+    The ``json`` format produces the same indented array as ``json.dump(records, f, indent=4)``;
+    ``ndjson`` writes one compact record per line. Either can be gzip or zstd compressed
+    (zstd needs the ``zstandard`` package).
+
+    Use it as an async context manager.
+    """
+
+    def __init__(self, path: str, output_format: str = "json", compression: str = "none"):
+        """
+        Args:
+            path: Final path of the output file.
+            output_format: ``json`` or ``ndjson``.
+            compression: ``none``, ``gzip`` or ``zstd``.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Expected one of {', '.join(OUTPUT_FORMATS)}.")
+        if compression not in OUTPUT_COMPRESSIONS:
+            raise ValueError(f"Unknown output compression '{compression}'. Expected one of {', '.join(OUTPUT_COMPRESSIONS)}.")
+        if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+            raise ValueError("zstd output compression requires the 'zstandard' package.")
+        self.path = path
+        self.output_format = output_format
+        self.compression = compression
+        self.count = 0
+        self._tmp_path = f"{path}.tmp"
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._aborted = False
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queues a chunk of records to be appended to the file.
+
+        :param records: The records, in output order.
+        """
+        chunk = list(records)
+        if chunk:
+            self.count += len(chunk)
+            self._queue.put(chunk)
+
+    def _encode(self, record: Dict[str, Any], first: bool) -> str:
+        if self.output_format == "ndjson":
+            return dumps(record).decode() + "\n"
+        # An element of an indent=4 array: the record indented one level, separated by commas.
+        return ("\n" if first else ",\n") + textwrap.indent(json.dumps(record, indent=4), "    ")
+
+    def _run(self) -> None:
+        """
+        Writer thread: drains the queue into the temporary file until the close marker arrives.
+        """
+        try:
+            with _open_text(self._tmp_path, self.compression) as f:
+                first = True
+                if self.output_format == "json":
+                    f.write("[")
+                while (chunk := self._queue.get()) is not _CLOSE:
+                    if self._aborted:
+                        continue
+                    for record in chunk:
+                        f.write(self._encode(record, first))
+                        first = False
+                if self.output_format == "json":
+                    f.write("]" if first else "\n]")
+        except BaseException as e:
+            self._error = e
+            # Keep draining until the close marker so _finish() can join the thread.
+            while self._queue.get() is not _CLOSE:
+                pass
+
+    def _finish(self, commit: bool) -> None:
+        self._queue.put(_CLOSE)
+        self._thread.join()
+        if commit and self._error is None:
+            os.replace(self._tmp_path, self.path)
+        elif os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    async def __aenter__(self) -> "RecordWriter":
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name=f"record-writer-{os.path.basename(self.path)}", daemon=True)
+        self._thread.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._aborted = exc_type is not None
+        await asyncio.to_thread(self._finish, not self._aborted)
+        if self._error is not None and not self._aborted:
+            raise self._error
+        if not self._aborted:
+            logger.info(f"Wrote {self.count} records to '{self.path}'.")
+
+
+async def write_records(path: str, records: List[Dict[str, Any]], output_format: str = "json", compression: str = "none") -> None:
+    """
+    Writes a complete list of records with a RecordWriter.
+
+    :param path: Final path of the output file.
+    :param records: The records.
+    :param output_format: ``json`` or ``ndjson``.
+    :param compression: ``none``, ``gzip`` or ``zstd``.
+    """
+    async with RecordWriter(path, output_format, compression) as writer:
+        writer.write(records)
+
+
+def _write_json(path: str, data: Any) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+async def write_json(path: str, data: Any) -> None:
+    """
+    Writes a single JSON document (e.g. a profile or a metrics summary) off the event loop.
+    The file is swapped in atomically.
+
+    :param path: Final path of the output file.
+    :param data: The JSON-serializable document.
+    """
+    await asyncio.to_thread(_write_json, path, data)
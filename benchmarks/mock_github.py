@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.clients import REPOS_PER_PAGE
+
+# Vocabulary of the generated repository descriptions, so YAKE has realistic text to score.
+WORDS = (
+    "fast async python library client server api graph data pipeline stream parser compiler "
+    "framework toolkit plugin extension cli terminal web browser mobile cloud native kubernetes "
+    "container database cache queue scheduler workflow metadata search index vector embedding "
+    "model training inference dashboard monitoring logging tracing metrics security auth token "
+    "rust go typescript java lightweight minimal modern scalable distributed realtime open source"
+).split()
+
+LANGUAGES = ["Python", "Go", "Rust", "TypeScript", "Java", None]
+
+
+@dataclass
+class MockGitHubConfig:
+    """
+    Shape and behaviour of the fake GitHub API.
+
+    Attributes:
+        accounts: Number of generated accounts, named ``account0``, ``account1``, ...
+        repos_per_account: Number of public repositories of each account.
+        latency_ms: Mean simulated server latency per request.
+        jitter_ms: Maximum random deviation from the mean latency.
+        failure_rate: Share of requests answered with a secondary rate limit (429, ``Retry-After: 0``).
+        rate_limit: Quota advertised in the ``X-RateLimit-*`` headers per window; GitHub's
+            hourly quota of an authenticated token by default.
+        rate_limit_window: Seconds until the advertised quota resets.
+        seed: Seed of the generated data, latencies and failures.
+    """
+
+    accounts: int = 5
+    repos_per_account: int = 500
+    latency_ms: float = 20.0
+    jitter_ms: float = 5.0
+    failure_rate: float = 0.0
+    rate_limit: int = 5000
+    rate_limit_window: float = 3600.0
+    seed: int = 0
+
+
+class MockGitHubAPI:
+    """
+    In-process fake of the GitHub endpoints used by the extractor, served through httpx.MockTransport.
+
+    It answers ``/users/{login}``, ``/users/{login}/repos`` (with ``Link`` pagination headers,
+    ``sort=updated``), and the extractor's GraphQL queries, with ETags honoured through
+    ``If-None-Match``, rate-limit headers, simulated latency and injected failures. Every
+    request is counted by status so benchmarks can report cache hits and retries.
+    """
+
+    def __init__(self, config: MockGitHubConfig):
+        """
+        Args:
+            config: Shape and behaviour of the fake API.
+        """
+        self.config = config
+        self._random = random.Random(config.seed)
+        self.accounts: Dict[str, List[Dict[str, Any]]] = {
+            f"account{i}": [self._generate_repo(i, n) for n in range(config.repos_per_account)]
+            for i in range(config.accounts)
+        }
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self._remaining = config.rate_limit
+        self._reset_at = time.time() + config.rate_limit_window
+
+    def _generate_repo(self, account: int, n: int) -> Dict[str, Any]:
+        created = 1_400_000_000 + self._random.randrange(200_000_000)
+        updated = created + self._random.randrange(100_000_000)
+        return {
+            "name": f"repo{n:06d}",
+            "description": " ".join(self._random.choices(WORDS, k=self._random.randint(6, 20))).capitalize(),
+            "language": self._random.choice(LANGUAGES),
+            "stargazers_count": int(self._random.paretovariate(1.2)) - 1,
+            "forks_count": self._random.randrange(50),
+            "open_issues_count": self._random.randrange(30),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created)),
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(updated)),
+            "html_url": f"https://github.com/account{account}/repo{n:06d}",
+        }
+
+    def transport(self) -> httpx.MockTransport:
+        """
+        Returns a transport answering requests from this fake API. One is needed per event loop.
+        """
+        return httpx.MockTransport(self.handle)
+
+    def _rate_limit_headers(self) -> Dict[str, str]:
+        if time.time() >= self._reset_at:
+            self._remaining = self.config.rate_limit
+            self._reset_at = time.time() + self.config.rate_limit_window
+        self._remaining = max(self._remaining - 1, 0)
+        return {
+            "X-RateLimit-Limit": str(self.config.rate_limit),
+            "X-RateLimit-Remaining": str(self._remaining),
+            "X-RateLimit-Reset": str(int(self._reset_at)),
+        }
+
+    def _respond(self, request: httpx.Request, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        content = json.dumps(body).encode()
+        etag = f'"{hashlib.sha1(content).hexdigest()}"'
+        headers = {**self._rate_limit_headers(), **(headers or {}), "ETag": etag}
+        if status == 200 and request.headers.get("if-none-match") == etag:
+            status, content = 304, b""
+        else:
+            headers["Content-Type"] = "application/json"
+        self.statuses[status] += 1
+        return httpx.Response(status, content=content, headers=headers, request=request)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Answers one request after the simulated latency.
+        """
+        self.requests += 1
+        latency = self.config.latency_ms + self._random.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+        if self._random.random() < self.config.failure_rate:
+            return self._respond(request, 429, {"message": "You have exceeded a secondary rate limit."}, {"Retry-After": "0"})
+
+        parts = request.url.path.strip("/").split("/")
+        if parts == ["graphql"]:
+            return self._graphql(request)
+        if len(parts) >= 2 and parts[0] == "users" and parts[1] in self.accounts:
+            if len(parts) == 2:
+                return self._respond(request, 200, self._user(parts[1]))
+            if parts[2:] == ["repos"]:
+                return self._repos_page(request, parts[1])
+        return self._respond(request, 404, {"message": "Not Found"})
+
+    def _user(self, login: str) -> Dict[str, Any]:
+        return {
+            "login": login,
+            "name": login.title(),
+            "type": "User",
+            "followers": len(login) * 10,
+            "following": len(login),
+            "public_gists": 3,
+            "public_repos": len(self.accounts[login]),
+            "created_at": "2015-01-01T00:00:00Z",
+        }
+
+    def _repos_page(self, request: httpx.Request, login: str) -> httpx.Response:
+        params = request.url.params
+        page = int(params.get("page", "1"))
+        per_page = int(params.get("per_page", "30"))
+        repos = self.accounts[login]
+        if params.get("sort") == "updated":
+            repos = sorted(repos, key=lambda repo: repo["updated_at"], reverse=params.get("direction", "desc") == "desc")
+        last_page = max(math.ceil(len(repos) / per_page), 1)
+        headers = {}
+        if page < last_page:
+            base = f"{request.url.scheme}://{request.url.host}{request.url.path}"
+            headers["Link"] = (
+                f'<{base}?page={page + 1}&per_page={per_page}>; rel="next", '
+                f'<{base}?page={last_page}&per_page={per_page}>; rel="last"'
+            )
+        return self._respond(request, 200, repos[(page - 1) * per_page:page * per_page], headers)
+
+    def _graphql(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        variables = payload.get("variables", {})
+        login = variables.get("login")
+        if login not in self.accounts:
+            return self._respond(request, 200, {"data": {"repositoryOwner": None}})
+        if "repositories(first" not in payload["query"]:
+            user = self._user(login)
+            owner = {
+                "__typename": "User",
+                "login": login,
+                "name": user["name"],
+                "createdAt": user["created_at"],
+                "followers": {"totalCount": user["followers"]},
+                "following": {"totalCount": user["following"]},
+                "gists": {"totalCount": user["public_gists"]},
+                "repositories": {"totalCount": user["public_repos"]},
+            }
+            return self._respond(request, 200, {"data": {"repositoryOwner": owner}})
+
+        repos = self.accounts[login]
+        order = variables.get("orderBy") or {}
+        if order.get("field") == "UPDATED_AT":
+            repos = sorted(repos, key=lambda repo: repo["updated_at"], reverse=order.get("direction") == "DESC")
+        start = int(variables["cursor"]) if variables.get("cursor") else 0
+        end = min(start + REPOS_PER_PAGE, len(repos))
+        nodes = [
+            {
+                "name": repo["name"],
+                "description": repo["description"],
+                "primaryLanguage": {"name": repo["language"]} if repo["language"] else None,
+                "stargazerCount": repo["stargazers_count"],
+                "forkCount": repo["forks_count"],
+                "issues": {"totalCount": repo["open_issues_count"]},
+                "pullRequests": {"totalCount": 0},
+                "createdAt": repo["created_at"],
+                "updatedAt": repo["updated_at"],
+                "url": repo["html_url"],
+            }
+            for repo in repos[start:end]
+        ]
+        connection = {"pageInfo": {"hasNextPage": end < len(repos), "endCursor": str(end)}, "nodes": nodes}
+        return self._respond(request, 200, {"data": {"repositoryOwner": {"repositories": connection}}})
+
+
+class TimedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a transport and records the client-observed latency of every request.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, latencies: List[float]):
+        """
+        Args:
+            transport: The transport to time.
+            latencies: List receiving each request's latency in seconds.
+        """
+        self.transport = transport
+        self.latencies = latencies
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        self.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -0,0 +1,263 @@
+"""
+Benchmarks the extractor against an in-process fake GitHub API.
+
+Usage::
+
+    python -m benchmarks.run --accounts 5 --repos 1000 --latency-ms 20 --output bench_output.json
+
+Results are written as JSON (one object with ``meta`` and ``results``) so runs on different
+commits can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from benchmarks.mock_github import MockGitHubAPI, MockGitHubConfig, TimedTransport
+
+from app import activities as activities_module
+from app.activities import GitHubActivities
+from app.cache import InMemoryResponseCache
+from app.clients import GitHubClient, GitHubConnectionPool
+from app.keywords import KeywordEngine
+from app.ratelimit import RateLimitScheduler
+
+SCENARIOS = ("client", "activities", "keywords")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def _peak_rss_mb() -> Dict[str, float]:
+    """
+    Returns the peak resident set size of this process and of its finished children, in MiB.
+    """
+    # ru_maxrss is reported in KiB on Linux and in bytes on macOS.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor,
+    }
+
+
+def _summarize(api: MockGitHubAPI, latencies: List[float], statuses_before: Dict[int, int], elapsed: float) -> Dict[str, Any]:
+    statuses = {str(status): count - statuses_before.get(status, 0) for status, count in api.statuses.items()}
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+        "latency_p99_ms": _percentile(latencies, 0.99) * 1000,
+        "latency_mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "statuses": {status: count for status, count in statuses.items() if count},
+    }
+
+
+def _build_stack(api: MockGitHubAPI, args: argparse.Namespace, latencies: List[float]):
+    pool = GitHubConnectionPool(http2=False, transport_factory=lambda: TimedTransport(api.transport(), latencies))
+    scheduler = RateLimitScheduler(
+        requests_per_second=args.max_rps, burst=args.burst, reserve=args.rate_limit_reserve, spread_below=args.rate_limit_spread_below
+    )
+    return pool, InMemoryResponseCache(), scheduler
+
+
+async def bench_client(api: MockGitHubAPI, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Lists every account's repositories with GitHubClient, once cold and once against a warm
+    conditional-request cache (all pages revalidated with ETags).
+    """
+    latencies: List[float] = []
+    pool, cache, scheduler = _build_stack(api, args, latencies)
+    client = GitHubClient(
+        pat="benchmark", page_concurrency=args.page_concurrency, pool=pool, cache=cache, scheduler=scheduler, api_mode=args.api_mode
+    )
+    semaphore = asyncio.Semaphore(args.account_concurrency)
+
+    async def list_account(account: str) -> int:
+        async with semaphore:
+            return len(await client.get_repositories_metadata(account))
+
+    results = {}
+    for run in ("cold", "warm"):
+        latencies.clear()
+        statuses_before = dict(api.statuses)
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(list_account(account) for account in api.accounts))
+        results[run] = {**_summarize(api, latencies, statuses_before, time.perf_counter() - start), "repositories": sum(counts)}
+    results["rate_limit"] = scheduler.state()
+    await pool.aclose()
+    return results
+
+
+async def bench_activities(api: MockGitHubAPI, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs the activities of a workflow end-to-end for every account, one account after another,
+    writing outputs to a temporary directory.
+    """
+    latencies: List[float] = []
+    pool, cache, scheduler = _build_stack(api, args, latencies)
+    engine = KeywordEngine(max_workers=args.keyword_workers, cache=None)
+    durations: Dict[str, float] = {}
+    activities = GitHubActivities()
+
+    async def timed(name: str, coro):
+        start = time.perf_counter()
+        result = await coro
+        durations[name] = durations.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    statuses_before = dict(api.statuses)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as output_dir, ExitStack() as stack:
+        for name, value in {
+            "pat": "benchmark",
+            "api_mode": args.api_mode,
+            "page_concurrency": args.page_concurrency,
+            "get_connection_pool": lambda: pool,
+            "get_response_cache": lambda: cache,
+            "get_rate_limit_scheduler": lambda: scheduler,
+            "get_keyword_engine": lambda: engine,
+        }.items():
+            stack.enter_context(patch.object(activities_module, name, value))
+        for account in api.accounts:
+            workflow_args = {"username": account, "output_dir": os.path.join(output_dir, account)}
+            user = await timed("fetch_user_metadata_activity", activities.fetch_user_metadata_activity(workflow_args))
+            repos = await timed("fetch_repositories_metadata_activity", activities.fetch_repositories_metadata_activity(workflow_args))
+            tagged = await timed(
+                "extract_keywords_activity", activities.extract_keywords_activity(repos, workflow_args["output_dir"])
+            )
+            await timed(
+                "fetch_data_quality_metrics_activity",
+                activities.fetch_data_quality_metrics_activity({"user_data": user, "repo_data": tagged}, workflow_args["output_dir"]),
+            )
+    elapsed = time.perf_counter() - start
+    engine.shutdown()
+    await pool.aclose()
+    return {
+        **_summarize(api, latencies, statuses_before, elapsed),
+        "activity_seconds": durations,
+        "accounts_per_second": len(api.accounts) / elapsed if elapsed else 0.0,
+        "rate_limit": scheduler.state(),
+    }
+
+
+async def bench_keywords(api: MockGitHubAPI, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Scores every generated description with YAKE through a fresh KeywordEngine (no memo).
+    """
+    descriptions = [repo["description"] for repos in api.accounts.values() for repo in repos]
+    engine = KeywordEngine(max_workers=args.keyword_workers, cache=None)
+    try:
+        start = time.perf_counter()
+        await engine.extract(descriptions)
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.shutdown()
+    return {
+        "descriptions": len(descriptions),
+        "seconds": elapsed,
+        "seconds_per_1k_descriptions": elapsed / len(descriptions) * 1000 if descriptions else 0.0,
+        "workers": engine.max_workers,
+        "batch_size": engine.batch_size,
+    }
+
+
+BENCHMARKS = {"client": bench_client, "activities": bench_activities, "keywords": bench_keywords}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Runs the selected scenarios against a fresh fake API each and returns the report.
+
+    :param args: Parsed command-line arguments.
+    :return: A JSON-serializable report with ``meta`` and per-scenario ``results``.
+    """
+    config = MockGitHubConfig(
+        accounts=args.accounts,
+        repos_per_account=args.repos,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        rate_limit=args.rate_limit,
+        rate_limit_window=args.rate_limit_window,
+        seed=args.seed,
+    )
+    results: Dict[str, Any] = {}
+    for scenario in args.scenarios:
+        results[scenario] = await BENCHMARKS[scenario](MockGitHubAPI(config), args)
+        results[scenario]["peak_rss_mb"] = _peak_rss_mb()
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": {key: value for key, value in vars(args).items() if key != "output"},
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the GitHub extractor against a fake GitHub API.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--accounts", type=int, default=5, help="Number of generated accounts.")
+    parser.add_argument("--repos", type=int, default=500, help="Repositories per account.")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Mean simulated latency per request.")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Maximum deviation from the mean latency.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests rejected with a 429.")
+    parser.add_argument("--api-mode", choices=("rest", "graphql"), default="rest")
+    parser.add_argument("--page-concurrency", type=int, default=4)
+    parser.add_argument("--account-concurrency", type=int, default=5, help="Accounts listed in parallel in the client scenario.")
+    # The scheduler and quota default to production: the worker's settings and GitHub's hourly quota.
+    parser.add_argument(
+        "--max-rps", type=float, default=float(os.getenv("GITHUB_MAX_REQUESTS_PER_SECOND", "10")),
+        help="Request rate ceiling of the rate-limit scheduler.",
+    )
+    parser.add_argument("--burst", type=int, default=int(os.getenv("GITHUB_REQUEST_BURST", "10")))
+    parser.add_argument("--rate-limit-reserve", type=int, default=int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "50")))
+    parser.add_argument("--rate-limit-spread-below", type=float, default=float(os.getenv("GITHUB_RATE_LIMIT_SPREAD_BELOW", "0.2")))
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Quota advertised by the fake API per window.")
+    parser.add_argument("--rate-limit-window", type=float, default=3600.0, help="Seconds until the advertised quota resets.")
+    parser.add_argument("--keyword-workers", type=int, default=None, help="YAKE pool processes (default: CPU count).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_output.json", help="Report path, or '-' for stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run_benchmarks(args))
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote benchmark report to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Profiles worker cold start: how long importing the worker's modules takes, and which imports dominate.
+
+Usage::
+
+    python -m benchmarks.startup --modules app.workflow app.activities app.workers --top 15 --output startup_profile.json
+
+Every module is imported in a fresh interpreter under ``python -X importtime``, so results do
+not depend on what was imported before. Results are written as JSON (one object with
+``meta`` and ``results``), like benchmarks.run, so runs on different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from benchmarks.run import _git_commit
+
+DEFAULT_MODULES = ("app.workflow", "app.activities", "app.workers", "main")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parses the ``-X importtime`` report of one interpreter.
+
+    :param stderr: The interpreter's standard error.
+    :return: One entry per imported module with ``module``, ``self_ms``, ``cumulative_ms``
+        and ``depth`` (0 for modules imported directly by the profiled import).
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        entries.append({
+            "module": stripped,
+            "self_ms": int(fields[0]) / 1000,
+            "cumulative_ms": int(fields[1]) / 1000,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return entries
+
+
+def profile_module(module: str, top: int) -> Dict[str, Any]:
+    """
+    Imports a module in a fresh interpreter and summarizes where the time went.
+
+    :param module: The module to import.
+    :param top: Number of slowest imports (by self time) to report.
+    :return: Wall time of the interpreter, total import time, and the slowest imports.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=False
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    entries = parse_importtime(completed.stderr)
+    top_level = next((entry for entry in reversed(entries) if entry["module"] == module), None)
+    return {
+        "wall_ms": wall * 1000,
+        "import_ms": top_level["cumulative_ms"] if top_level else sum(entry["self_ms"] for entry in entries),
+        "modules_imported": len(entries),
+        "slowest_self": sorted(entries, key=lambda entry: entry["self_ms"], reverse=True)[:top],
+        "slowest_cumulative": [
+            entry for entry in sorted(entries, key=lambda entry: entry["cumulative_ms"], reverse=True)
+            if entry["module"] != module
+        ][:top],
+    }
+
+
+def run_profile(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Profiles every selected module ``args.repeat`` times and keeps the median run.
+
+    :param args: Parsed command-line arguments.
+    :return: A JSON-serializable report with ``meta`` and per-module ``results``.
+    """
+    results = {}
+    for module in args.modules:
+        runs = [profile_module(module, args.top) for _ in range(args.repeat)]
+        median_import = statistics.median(run["import_ms"] for run in runs)
+        results[module] = min(runs, key=lambda run: abs(run["import_ms"] - median_import))
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": {key: value for key, value in vars(args).items() if key != "output"},
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Profile the import time of the worker's modules.")
+    parser.add_argument("--modules", nargs="+", default=list(DEFAULT_MODULES))
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports reported per module.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the median one is reported.")
+    parser.add_argument("--output", default="startup_profile.json", help="Report path, or '-' for stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    report = run_profile(args)
+    for module, result in report["results"].items():
+        print(f"{module}: {result['import_ms']:.0f} ms import, {result['wall_ms']:.0f} ms interpreter", file=sys.stderr)
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote startup profile to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
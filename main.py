@@ -3,6 +3,10 @@ import os
 from dotenv import load_dotenv
 
 from app.activities import GitHubActivities
+from app.clients import close_connection_pool
+from app.keywords import shutdown_keyword_engine
+from app.payloads import install_data_converter
+from app.workers import PASSTHROUGH_MODULES, get_worker_settings, start_worker_processes, stop_worker_processes
 from app.workflow import GitHubWorkflow
 from application_sdk.application import BaseApplication
 from application_sdk.observability.logger_adaptor import get_logger
@@ -35,22 +39,24 @@ async def main(daemon: bool = True):
     # Setup workflow and activities
     await app.setup_workflow(
         workflow_and_activities_classes=[(GitHubWorkflow, GitHubActivities)],
-        passthrough_modules=[
-            "requests",
-            "httpx",
-            "urllib3",
-            "warnings",
-            "os",
-            "grpc",
-            "pyatlan",
-        ],
+        passthrough_modules=PASSTHROUGH_MODULES,
     )
+    # The SDK worker always adds its defaults (including "app"); use the same list as the worker processes.
+    app.worker.passthrough_modules = list(PASSTHROUGH_MODULES)
+    # Serialize payloads with orjson and compress large ones (GITHUB_PAYLOAD_COMPRESSION), for the worker and the server alike.
+    app.workflow_client.client = install_data_converter(app.workflow_client.client)
 
-    # Start the worker to execute activities
-    await app.start_worker()
+    # Start the worker to execute activities: in this process by default, or in dedicated
+    # worker processes (GITHUB_WORKER_PROCESSES / GITHUB_CPU_WORKER_PROCESSES) that drain on shutdown.
+    worker_settings = get_worker_settings()
+    worker_processes = []
+    if worker_settings.processes:
+        worker_processes = start_worker_processes(APPLICATION_NAME, worker_settings)
+    else:
+        await app.start_worker()
 
     # Define workflow arguments
-    workflow_args = {"username": username, "pat": pat}
+    workflow_args = {"username": username, "pat": pat, "cpu_task_queue": worker_settings.cpu_processes > 0}
 
     # Start the workflow
     print("Starting workflow with args:", workflow_args)
@@ -60,7 +66,13 @@ async def main(daemon: bool = True):
     # )
     # logger.info(f"Workflow started with ID: {workflow_id}")
     await app.setup_server(workflow_class = GitHubWorkflow)
-    await app.start_server()
+    try:
+        await app.start_server()
+    finally:
+        await asyncio.to_thread(stop_worker_processes, worker_processes, worker_settings.drain_timeout)
+        # Release the pooled GitHub connections and keyword processes shared by all activities on this worker.
+        await close_connection_pool()
+        shutdown_keyword_engine()
 
 if __name__ == "__main__":
     asyncio.run(main())
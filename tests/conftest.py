@@ -41,7 +41,7 @@ async def temporal_client():
             env.client,
             task_queue="github_extractor_task_queue",
             workflows=[GitHubWorkflow],
-            activities=[GitHubActivities().preflight_check, GitHubActivities().fetch_user_metadata_activity, GitHubActivities().fetch_repositories_metadata_activity, GitHubActivities().extract_keywords_activity, GitHubActivities().fetch_data_quality_metrics_activity],
+            activities=[GitHubActivities().preflight_check, GitHubActivities().fetch_user_metadata_activity, GitHubActivities().fetch_repositories_metadata_activity, GitHubActivities().extract_keywords_activity, GitHubActivities().fetch_data_quality_metrics_activity, GitHubActivities().save_repository_snapshot_activity, GitHubActivities().enrich_repositories_activity],
         )
         async with worker:
             yield env.client
\ No newline at end of file
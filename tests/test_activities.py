@@ -1,16 +1,23 @@
+import dataclasses
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, patch
+import gzip
+import httpx
 import json
 import os
+import pyarrow.parquet as pq
 import yake
+from temporalio.testing import ActivityEnvironment
 
 from app.activities import GitHubActivities
+from app.clients import RepositoryFilter
+from app.storage import DataStore, is_reference, load_records, store_records
 
 @pytest.fixture(autouse=True)
-def mock_file_open():
-    """Mock builtins.open to prevent actual file writing."""
-    with patch("builtins.open", MagicMock()) as mock:
-        yield mock
+def output_dir(tmp_path, monkeypatch):
+    """Run each test in a temporary directory so output files do not land in the repository."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
 
 @pytest.mark.asyncio
 async def test_preflight_check_success(mock_github_client):
@@ -21,18 +28,30 @@ async def test_preflight_check_success(mock_github_client):
     mock_github_client.get_user_metadata.assert_called_once()
 
 @pytest.mark.asyncio
-async def test_fetch_user_metadata_activity(mock_github_client, mock_file_open):
+async def test_fetch_user_metadata_activity(mock_github_client, output_dir):
     """Test fetch_user_metadata_activity saves the correct file."""
     activities = GitHubActivities()
-    await activities.fetch_user_metadata_activity({})
-    mock_file_open.assert_called_once()
+    result = await activities.fetch_user_metadata_activity({})
+    with open(output_dir / "github_user_metadata.json") as f:
+        assert json.load(f) == result
 
 @pytest.mark.asyncio
-async def test_fetch_repositories_metadata_activity(mock_github_client, mock_file_open):
+async def test_fetch_repositories_metadata_activity(mock_github_client, output_dir):
     """Test fetch_repositories_metadata_activity saves the correct file."""
     activities = GitHubActivities()
-    await activities.fetch_repositories_metadata_activity({})
-    mock_file_open.assert_called_once()
+    result = await activities.fetch_repositories_metadata_activity({})
+    with open(output_dir / "github_repo_metadata.json") as f:
+        assert json.load(f) == result
+    assert list(output_dir.glob("*.tmp")) == []
+
+@pytest.mark.asyncio
+async def test_fetch_repositories_metadata_activity_ndjson_gzip(mock_github_client, output_dir):
+    """Test repositories are streamed to a compressed NDJSON file when configured."""
+    with patch("app.activities.output_format", "ndjson"), patch("app.activities.output_compression", "gzip"):
+        activities = GitHubActivities()
+        result = await activities.fetch_repositories_metadata_activity({})
+    with gzip.open(output_dir / "github_repo_metadata.ndjson.gz", "rt") as f:
+        assert [json.loads(line) for line in f] == result
 
 @pytest.mark.asyncio
 async def test_extract_keywords_activity(mock_yake_extractor):
@@ -46,7 +65,7 @@ async def test_extract_keywords_activity(mock_yake_extractor):
     assert result[0]["auto_tags"] == ["python project", "cool code"]
 
 @pytest.mark.asyncio
-async def test_fetch_data_quality_metrics_activity(mock_file_open):
+async def test_fetch_data_quality_metrics_activity(output_dir):
     """Test fetch_data_quality_metrics_activity calculates metrics correctly."""
     activities = GitHubActivities()
     raw_data = {
@@ -64,4 +83,142 @@ async def test_fetch_data_quality_metrics_activity(mock_file_open):
     assert result["average_stars_per_repo"] == 15.0
     assert result["repos_with_description_percentage"] == 50.0
     assert result["repos_with_auto_tags_percentage"] == 50.0
-    mock_file_open.assert_called_once()
\ No newline at end of file
+    with open(output_dir / "github_quality_metrics.json") as f:
+        assert json.load(f) == result
+
+@pytest.mark.asyncio
+async def test_fetch_repositories_metadata_activity_incremental(mock_github_client):
+    """Test incremental mode fetches only repositories newer than the snapshot watermark and merges them."""
+    snapshot = {
+        "watermark": "2024-01-01T00:00:00Z",
+        "filters": dataclasses.asdict(RepositoryFilter()),
+        "runs_since_full": 0,
+        "repos": [{"name": "repo0", "full_name": "testuser/repo0", "updated_at": "2024-01-01T00:00:00Z", "auto_tags": ["kept"]}],
+    }
+    with patch("app.activities.get_snapshot_store") as mock_store:
+        mock_store.return_value.load = AsyncMock(return_value=snapshot)
+        activities = GitHubActivities()
+        result = await activities.fetch_repositories_metadata_activity({"username": "testuser", "incremental": True})
+    mock_github_client.get_repositories_metadata.assert_called_once()
+    assert mock_github_client.get_repositories_metadata.call_args.kwargs["updated_since"] == "2024-01-01T00:00:00Z"
+    assert [repo["name"] for repo in result] == ["repo0", "repo1", "repo2"]
+    assert result[0]["auto_tags"] == ["kept"]
+
+@pytest.mark.asyncio
+async def test_fetch_repositories_metadata_activity_reconciles_on_full_listing(mock_github_client):
+    """Test a due full listing replaces the snapshot, dropping repositories no longer listed."""
+    snapshot = {
+        "watermark": "2024-01-01T00:00:00Z",
+        "filters": dataclasses.asdict(RepositoryFilter()),
+        "runs_since_full": 9,
+        "repos": [{"name": "deleted", "updated_at": "2024-01-01T00:00:00Z", "auto_tags": ["gone"]}],
+    }
+    with patch("app.activities.get_snapshot_store") as mock_store:
+        mock_store.return_value.load = AsyncMock(return_value=snapshot)
+        activities = GitHubActivities()
+        result = await activities.fetch_repositories_metadata_activity({"username": "testuser", "incremental": True})
+    assert "updated_since" not in mock_github_client.get_repositories_metadata.call_args.kwargs
+    assert [repo["name"] for repo in result] == ["repo1", "repo2"]
+
+@pytest.mark.asyncio
+async def test_save_repository_snapshot_activity_counts_runs_since_full_listing(output_dir):
+    """Test snapshots record the filters and how many incremental runs followed the last full listing."""
+    activities = GitHubActivities()
+    repos = [{"name": "repo1", "full_name": "testuser/repo1", "updated_at": "2024-01-01T00:00:00Z"}]
+    workflow_args = {"username": "testuser", "incremental": True}
+    for _ in range(3):
+        await activities.save_repository_snapshot_activity(workflow_args, repos)
+    with open(output_dir / ".github_state" / "testuser.json") as f:
+        snapshot = json.load(f)
+    assert snapshot["filters"] == dataclasses.asdict(RepositoryFilter())
+    assert snapshot["runs_since_full"] == 2
+
+class _MemoryDataStore(DataStore):
+    """Claim-check store kept in memory."""
+
+    def __init__(self):
+        self.objects = {}
+
+    async def put(self, key, data):
+        self.objects[key] = data
+
+    async def get(self, key):
+        return self.objects[key]
+
+@pytest.mark.asyncio
+async def test_extract_keywords_activity_claim_check(mock_yake_extractor):
+    """Test extract_keywords_activity resolves a reference input and returns a reference."""
+    store = _MemoryDataStore()
+    with patch("app.storage.get_data_store", return_value=store):
+        reference = await store_records([{"description": "A python project with cool code"}], "repositories")
+        activities = GitHubActivities()
+        result = await activities.extract_keywords_activity(reference)
+        assert is_reference(result)
+        tagged = await load_records(result)
+    assert tagged[0]["auto_tags"] == ["python project", "cool code"]
+
+@pytest.mark.asyncio
+async def test_fetch_data_quality_metrics_activity_parquet(output_dir):
+    """Test the metrics activity writes the repositories as Parquet when enabled."""
+    user_response = httpx.Response(200, json={"login": "testuser", "type": "User"}, request=httpx.Request("GET", "http://test"))
+    mock_client = AsyncMock()
+    mock_client.get.return_value = user_response
+    activities = GitHubActivities()
+    with patch("httpx.AsyncClient", return_value=mock_client), patch("app.activities.get_request_coalescer", return_value=None), \
+            patch("app.activities.get_response_cache", return_value=None):
+        user_data = await activities.fetch_user_metadata_activity({"username": "testuser", "output_dir": str(output_dir)})
+    raw_data = {
+        "user_data": user_data,
+        "repo_data": [{"name": "repo1", "language": "Python", "star_count": 10, "updated_at": "2024-01-01T00:00:00Z"}],
+    }
+    with patch("app.activities.parquet_output", True):
+        result = await activities.fetch_data_quality_metrics_activity(raw_data)
+    table = pq.read_table(output_dir / "github_repo_metadata.parquet")
+    assert table.column("account").to_pylist() == ["testuser"]
+    assert table.column("name").to_pylist() == ["repo1"]
+    assert result["repos_per_language"] == {"Python": 1}
+
+@pytest.mark.asyncio
+async def test_enrich_repositories_activity_skips_enriched_repositories(mock_github_client):
+    """Test only repositories missing a selected field are enriched."""
+    mock_github_client.enrich_repositories = AsyncMock()
+    repos = [{"name": "repo0", "topics": ["kept"]}, {"name": "repo1"}]
+    activities = GitHubActivities()
+    await activities.enrich_repositories_activity({"username": "testuser", "enrich": ["topics"]}, repos)
+    owner, pending, fields = mock_github_client.enrich_repositories.call_args.args
+    assert owner == "testuser"
+    assert [repo["name"] for repo in pending] == ["repo1"]
+    assert fields == ("topics",)
+
+@pytest.mark.asyncio
+async def test_enrich_repositories_activity_resumes_from_checkpoint(mock_github_client):
+    """Test a retried enrichment keeps the chunks checkpointed by the failed attempt."""
+    calls = []
+
+    async def enrich(owner, repos, fields, concurrency):
+        calls.append([repo["name"] for repo in repos])
+        if len(calls) == 2:
+            raise RuntimeError("timed out")
+        for repo in repos:
+            repo["topics"] = [repo["name"]]
+
+    mock_github_client.enrich_repositories = AsyncMock(side_effect=enrich)
+    heartbeats = []
+    env = ActivityEnvironment()
+    env.on_heartbeat = lambda *details: heartbeats.append(details[0] if details else None)
+    args = {"username": "testuser", "enrich": ["topics"]}
+    with patch("app.activities.enrich_checkpoint_repos", 1):
+        with pytest.raises(RuntimeError):
+            await env.run(GitHubActivities().enrich_repositories_activity, args, [{"name": "repo0"}, {"name": "repo1"}])
+        retry = ActivityEnvironment()
+        retry.info = dataclasses.replace(env.info, attempt=2, heartbeat_details=[heartbeats[-1]])
+        result = await retry.run(GitHubActivities().enrich_repositories_activity, args, [{"name": "repo0"}, {"name": "repo1"}])
+    assert calls == [["repo0"], ["repo1"], ["repo1"]]
+    assert result == [{"name": "repo0", "topics": ["repo0"]}, {"name": "repo1", "topics": ["repo1"]}]
+
+@pytest.mark.asyncio
+async def test_extract_keywords_activity_scores_readme(mock_yake_extractor):
+    """Test the README of an enriched repository is part of the keyword input."""
+    activities = GitHubActivities()
+    await activities.extract_keywords_activity([{"description": "A tool", "readme": "Readme text about parsing"}])
+    mock_yake_extractor.extract_keywords.assert_called_once_with("A tool\n\nReadme text about parsing")
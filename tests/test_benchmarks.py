@@ -0,0 +1,53 @@
+import pytest
+
+from benchmarks.run import parse_args, run_benchmarks
+from benchmarks.startup import parse_importtime, profile_module
+
+
+@pytest.mark.asyncio
+async def test_client_benchmark_reports_cold_and_warm_runs():
+    """Test the client benchmark lists every generated repository and revalidates all pages from the cache."""
+    args = parse_args(["--scenarios", "client", "--accounts", "2", "--repos", "150", "--latency-ms", "0", "--jitter-ms", "0"])
+    report = await run_benchmarks(args)
+    cold, warm = report["results"]["client"]["cold"], report["results"]["client"]["warm"]
+    assert cold["repositories"] == warm["repositories"] == 300
+    assert cold["statuses"] == {"200": 4}
+    assert warm["statuses"] == {"304": 4}
+    assert report["meta"]["config"]["accounts"] == 2
+    # Production pacing against GitHub's hourly quota: a fresh quota runs at the ceiling.
+    rate_limit = report["results"]["client"]["rate_limit"]["core"]
+    assert rate_limit["limit"] == 5000
+    assert rate_limit["requests_per_second"] == args.max_rps
+
+
+@pytest.mark.asyncio
+async def test_client_benchmark_retries_injected_rate_limits():
+    """Test requests rejected by the fake API's secondary rate limit are retried rather than failing the run."""
+    args = parse_args(["--scenarios", "client", "--accounts", "1", "--repos", "500", "--latency-ms", "0", "--jitter-ms", "0", "--failure-rate", "0.3"])
+    report = await run_benchmarks(args)
+    cold = report["results"]["client"]["cold"]
+    assert cold["repositories"] == 500
+    assert cold["statuses"].get("429", 0) > 0
+
+
+def test_parse_importtime_report():
+    """Test -X importtime lines are parsed into per-module self and cumulative times with their depth."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     yake.core\n"
+        "import time:      3000 |       3120 |   yake\n"
+        "import time:       500 |       3620 | app.keywords\n"
+        "some unrelated warning\n"
+    )
+    entries = parse_importtime(stderr)
+    assert [entry["module"] for entry in entries] == ["yake.core", "yake", "app.keywords"]
+    assert [entry["depth"] for entry in entries] == [2, 1, 0]
+    assert entries[1]["self_ms"] == 3.0 and entries[2]["cumulative_ms"] == 3.62
+
+
+def test_workflow_import_skips_activity_dependencies():
+    """Test importing the workflow does not pull in the activity implementations or their heavy dependencies."""
+    result = profile_module("app.workflow", top=5000)
+    imported = {entry["module"] for entry in result["slowest_self"]}
+    assert "app.workflow" in imported
+    assert not imported & {"app.activities", "app.clients", "yake", "application_sdk.clients.atlan"}
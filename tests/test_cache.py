@@ -0,0 +1,63 @@
+import pytest
+import httpx
+from unittest.mock import AsyncMock, patch
+
+from app.cache import CachedResponse, InMemoryResponseCache, SQLiteResponseCache, build_cache_key
+from app.clients import GitHubClient
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_evicts_least_recently_used():
+    """Test the in-memory backend keeps only the most recently used entries."""
+    cache = InMemoryResponseCache(max_entries=2)
+    await cache.set("a", CachedResponse(content=b"1"))
+    await cache.set("b", CachedResponse(content=b"2"))
+    await cache.get("a")
+    await cache.set("c", CachedResponse(content=b"3"))
+    assert await cache.get("b") is None
+    assert (await cache.get("a")).content == b"1"
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_is_bounded_by_body_size():
+    """Test the in-memory backend evicts by total body size and skips bodies over the budget."""
+    cache = InMemoryResponseCache(max_bytes=10)
+    await cache.set("a", CachedResponse(content=b"x" * 4))
+    await cache.set("b", CachedResponse(content=b"x" * 4))
+    await cache.set("c", CachedResponse(content=b"x" * 4))
+    assert await cache.get("a") is None
+    assert cache.size == 8
+    await cache.set("b", CachedResponse(content=b"x" * 11))
+    assert await cache.get("b") is None
+    assert cache.size == 4
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_persists_and_evicts(tmp_path):
+    """Test the SQLite backend survives re-opening and honours its size bound."""
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteResponseCache(path, max_entries=1)
+    await cache.set("a", CachedResponse(content=b"1", headers={"etag": '"x"'}))
+    await cache.set("b", CachedResponse(content=b"2", headers={"etag": '"y"'}))
+    reopened = SQLiteResponseCache(path, max_entries=1)
+    assert await reopened.get("a") is None
+    assert (await reopened.get("b")).etag == '"y"'
+
+def test_cache_key_separates_identities():
+    """Test responses fetched with different credentials do not share cache entries."""
+    assert build_cache_key("/users/x", "token a") != build_cache_key("/users/x", "token b")
+    assert "token a" not in build_cache_key("/users/x", "token a")
+
+@pytest.mark.asyncio
+async def test_client_serves_304_from_cache():
+    """Test a revalidated request sends If-None-Match and returns the cached body on 304."""
+    request = httpx.Request("GET", "http://test")
+    mock_client = AsyncMock()
+    mock_client.headers = httpx.Headers({"Authorization": "token test_pat"})
+    mock_client.get.side_effect = [
+        httpx.Response(200, json={"login": "testuser", "name": "Test User"}, headers={"ETag": '"abc"'}, request=request),
+        httpx.Response(304, request=request),
+    ]
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", cache=InMemoryResponseCache())
+        first = await client.get_user_metadata("testuser")
+        second = await client.get_user_metadata("testuser")
+    assert first == second
+    assert mock_client.get.call_args_list[1].kwargs["headers"] == {"If-None-Match": '"abc"'}
@@ -0,0 +1,84 @@
+import dataclasses
+import os
+import pytest
+import httpx
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+from temporalio.testing import ActivityEnvironment
+
+from app.checkpoint import ActivityPaginationCheckpointer
+from app.clients import GitHubClient
+
+def _page(names):
+    return httpx.Response(200, json=[{"name": name} for name in names], request=httpx.Request('GET', 'http://test'))
+
+PAGES = {
+    1: _page([f"a{i}" for i in range(100)]),
+    2: _page([f"b{i}" for i in range(100)]),
+    3: _page(["c0"]),
+}
+
+async def _list_repositories(base_dir, fail_on_page=None):
+    """Paginate like fetch_repositories_metadata_activity does, optionally failing on one page."""
+    requested = []
+
+    def get(url):
+        page = int(httpx.URL(url).params["page"])
+        requested.append(page)
+        if page == fail_on_page:
+            raise httpx.ConnectError("connection reset")
+        return PAGES.get(page, _page([]))
+
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = get
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        async with ActivityPaginationCheckpointer(base_dir) as checkpointer:
+            checkpoint = checkpointer.restore()
+            repos = await GitHubClient(pat="test_pat").get_repositories_metadata("testuser", checkpoint=checkpoint)
+    return repos, requested
+
+@pytest.mark.asyncio
+async def test_retried_attempt_resumes_from_last_heartbeat(tmp_path):
+    """Test a retry resumes pagination from the page after the last checkpointed one."""
+    heartbeats = []
+    env = ActivityEnvironment()
+    env.on_heartbeat = lambda *details: heartbeats.append(details[0] if details else None)
+    with pytest.raises(httpx.ConnectError):
+        await env.run(_list_repositories, str(tmp_path), 3)
+    assert heartbeats[-1]["position"] == 3
+    assert heartbeats[-1]["count"] == 200
+
+    retry = ActivityEnvironment()
+    retry.info = dataclasses.replace(env.info, attempt=2, heartbeat_details=[heartbeats[-1]])
+    repos, requested = await retry.run(_list_repositories, str(tmp_path))
+    assert requested == [3, 4]
+    assert len(repos) == 201
+    assert [repos[0]["name"], repos[100]["name"], repos[200]["name"]] == ["a0", "b0", "c0"]
+    # The checkpoint file is removed once the listing succeeded.
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_checkpointer_is_noop_outside_activity(tmp_path):
+    """Test pagination without an activity context starts from the first page and writes nothing."""
+    repos, requested = await _list_repositories(str(tmp_path))
+    assert requested == [1, 2, 3, 4]
+    assert len(repos) == 201
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_abandoned_checkpoint_files_are_removed(tmp_path):
+    """Test checkpoint files older than the maximum age are removed when a new listing starts."""
+    abandoned = tmp_path / "old-run-1.ndjson"
+    abandoned.write_bytes(b'{"name": "a0"}\n')
+    os.utime(abandoned, (0, 0))
+    retrying = tmp_path / "recent-run-1.ndjson"
+    retrying.write_bytes(b'{"name": "b0"}\n')
+
+    async def start():
+        async with ActivityPaginationCheckpointer(str(tmp_path), max_age=timedelta(hours=1)) as checkpointer:
+            checkpointer.restore()
+
+    await ActivityEnvironment().run(start)
+    assert not abandoned.exists()
+    # A recent file may still belong to an activity waiting for its retry.
+    assert retrying.exists()
@@ -1,7 +1,8 @@
+import asyncio
 import pytest
 import httpx
 from unittest.mock import AsyncMock, patch
-from app.clients import GitHubClient
+from app.clients import GitHubClient, GitHubConnectionPool, RepositoryFilter
 
 @pytest.fixture
 def mock_httpx_client():
@@ -45,4 +46,233 @@ async def test_get_user_metadata_http_error():
     with patch("httpx.AsyncClient.get", new=AsyncMock(side_effect=httpx.HTTPStatusError("Not Found", request=httpx.Request("GET", "http://test"), response=httpx.Response(404)))):
         client = GitHubClient(pat="test_pat")
         with pytest.raises(httpx.HTTPStatusError):
-            await client.get_user_metadata("invaliduser")
\ No newline at end of file
+            await client.get_user_metadata("invaliduser")
+
+def _repos_page(names, page, last_page=None):
+    """Build a repos page response, optionally advertising the last page in the Link header."""
+    headers = {}
+    if last_page:
+        headers["Link"] = f'<https://api.github.com/user/1/repos?page={last_page}&per_page=100>; rel="last"'
+    return httpx.Response(200, json=[{"name": name} for name in names], headers=headers, request=httpx.Request('GET', f'http://test/?page={page}'))
+
+@pytest.mark.asyncio
+async def test_get_repositories_metadata_concurrent_uses_link_header():
+    """Test concurrent pagination reads the last page from the Link header and keeps page order."""
+    pages = {
+        1: _repos_page([f"a{i}" for i in range(100)], 1, last_page=3),
+        2: _repos_page([f"b{i}" for i in range(100)], 2),
+        3: _repos_page(["c0"], 3),
+    }
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = lambda url: pages[int(httpx.URL(url).params["page"])]
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", page_concurrency=4)
+        repos = await client.get_repositories_metadata("testuser")
+    assert len(repos) == 201
+    assert [repos[0]["name"], repos[100]["name"], repos[200]["name"]] == ["a0", "b0", "c0"]
+    # No trailing empty-page request.
+    assert mock_client.get.call_count == 3
+
+@pytest.mark.asyncio
+async def test_get_repositories_metadata_concurrent_single_page():
+    """Test concurrent pagination stops after a short first page."""
+    mock_client = AsyncMock()
+    mock_client.get.return_value = _repos_page(["repo1"], 1)
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", page_concurrency=4)
+        repos = await client.get_repositories_metadata("testuser")
+    assert [repo["name"] for repo in repos] == ["repo1"]
+    assert mock_client.get.call_count == 1
+
+@pytest.mark.asyncio
+async def test_connection_pool_shares_transport_between_clients():
+    """Test clients borrowing from the pool share one transport and are closed by the pool."""
+    pool = GitHubConnectionPool(http2=False)
+    first = GitHubClient(pat="token_a", pool=pool)
+    second = GitHubClient(pat="token_b", pool=pool)
+    client_a = await first._get_client()
+    client_b = await second._get_client()
+    assert client_a is not client_b
+    assert client_a._transport is client_b._transport
+    assert client_a.headers["Authorization"] == "token token_a"
+    assert await GitHubClient(pat="token_a", pool=pool)._get_client() is client_a
+
+    await pool.aclose()
+    assert pool._transports == {}
+
+@pytest.mark.asyncio
+async def test_get_repositories_metadata_concurrent_sizes_public_listing_from_public_repos():
+    """Test public_repos sizes the fan-out without a Link header, but only for unfiltered public listings."""
+    def get(url):
+        page = int(httpx.URL(url).params["page"])
+        return _repos_page([f"p{page}-{i}" for i in range({1: 100, 2: 100, 3: 1}.get(page, 0))], page)
+
+    for filters, expected_pages in ((None, [1, 2, 3]), (RepositoryFilter(visibility="all"), [1, 2, 3, 4])):
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = get
+        with patch("httpx.AsyncClient", return_value=mock_client):
+            client = GitHubClient(pat="test_pat", page_concurrency=4)
+            await client.get_repositories_metadata("octo-org", public_repos=201, owner_type="Organization", filters=filters)
+        assert sorted(int(httpx.URL(call.args[0]).params["page"]) for call in mock_client.get.call_args_list) == expected_pages
+
+@pytest.mark.asyncio
+async def test_get_repositories_metadata_concurrent_cancels_pages_on_failure():
+    """Test a failing page cancels the page fetches still running."""
+    cancelled = []
+
+    async def get(url):
+        page = int(httpx.URL(url).params["page"])
+        if page == 1:
+            return _repos_page([f"a{i}" for i in range(100)], 1, last_page=3)
+        if page == 2:
+            raise httpx.ConnectError("connection reset")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(page)
+            raise
+
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = get
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", page_concurrency=4)
+        with pytest.raises(httpx.ConnectError):
+            await client.get_repositories_metadata("testuser")
+    assert cancelled == [3]
+
+@pytest.mark.asyncio
+async def test_graphql_mode_matches_rest_output():
+    """Test GraphQL mode paginates with cursors and produces REST-shaped repository dicts."""
+    def node(name):
+        return {
+            "name": name, "nameWithOwner": f"testuser/{name}", "description": "a desc", "primaryLanguage": {"name": "Python"},
+            "stargazerCount": 10, "forkCount": 2, "issues": {"totalCount": 3}, "pullRequests": {"totalCount": 1},
+            "createdAt": "date1", "updatedAt": "date2", "url": f"https://github.com/testuser/{name}",
+        }
+    def page(nodes, has_next, cursor):
+        return httpx.Response(200, json={"data": {"repositoryOwner": {"repositories": {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": cursor}, "nodes": nodes,
+        }}}}, request=httpx.Request('POST', 'http://test/graphql'))
+    mock_client = AsyncMock()
+    mock_client.post.side_effect = [page([node("repo1")], True, "c1"), page([node("repo2")], False, None)]
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", api_mode="graphql")
+        repos = await client.get_repositories_metadata("testuser")
+    assert repos[0] == {
+        "name": "repo1", "full_name": "testuser/repo1", "description": "a desc", "language": "Python", "star_count": 10, "fork_count": 2,
+        "issue_count": 4, "created_at": "date1", "updated_at": "date2", "url": "https://github.com/testuser/repo1",
+    }
+    assert [repo["name"] for repo in repos] == ["repo1", "repo2"]
+    assert mock_client.post.call_args_list[1].kwargs["json"]["variables"]["cursor"] == "c1"
+
+@pytest.mark.asyncio
+async def test_enrich_repositories_fetches_selected_fields():
+    """Test enrichment fetches each selected sub-resource per repository and tolerates missing ones."""
+    def respond(url, **kwargs):
+        request = httpx.Request("GET", f"https://api.github.com{url}")
+        path = httpx.URL(url).path
+        if path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 1200}, request=request)
+        if path.endswith("/contributors"):
+            headers = {"Link": '<https://api.github.com/repositories/1/contributors?per_page=1&anon=1&page=7>; rel="last"'}
+            return httpx.Response(200, json=[{"login": "a"}], headers=headers, request=request)
+        if path == "/repos/testuser/repo2/readme":
+            return httpx.Response(404, json={"message": "Not Found"}, request=request)
+        assert kwargs["headers"]["Accept"] == "application/vnd.github.raw+json"
+        return httpx.Response(200, text="# Title\nA long readme", request=request)
+
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = respond
+    repos = [{"name": "repo1"}, {"name": "repo2"}]
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", readme_max_chars=7)
+        await client.enrich_repositories("testuser", repos, ("languages", "contributor_count", "readme"), concurrency=3)
+    assert repos[0] == {"name": "repo1", "languages": {"Python": 1200}, "contributor_count": 7, "readme": "# Title"}
+    assert repos[1]["readme"] is None
+    assert "topics" not in repos[0]
+    assert mock_client.get.call_count == 6
+
+@pytest.mark.asyncio
+async def test_enrich_repositories_uses_the_owner_of_each_repository():
+    """Test repositories of other owners (e.g. from a member listing) are enriched under their full name."""
+    mock_client = AsyncMock()
+    mock_client.get.return_value = httpx.Response(200, json={"names": ["cli"]}, request=httpx.Request("GET", "http://test"))
+    repos = [{"name": "repo1", "full_name": "octo-org/repo1"}, {"name": "repo2", "full_name": None}]
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat")
+        await client.enrich_repositories("testuser", repos, ("topics",), concurrency=1)
+    assert [call.args[0] for call in mock_client.get.call_args_list] == ["/repos/octo-org/repo1/topics", "/repos/testuser/repo2/topics"]
+
+@pytest.mark.asyncio
+async def test_enrich_repositories_rejects_unknown_fields():
+    """Test unknown enrichment fields fail before any request is sent."""
+    client = GitHubClient(pat="test_pat")
+    with pytest.raises(ValueError):
+        await client.enrich_repositories("testuser", [{"name": "repo1"}], ("stars",))
+
+@pytest.mark.asyncio
+async def test_get_repositories_metadata_lists_organizations_with_filters():
+    """Test organizations are listed through /orgs with server-side filters, and archived repos dropped client-side."""
+    mock_client = AsyncMock()
+    mock_client.get.return_value = httpx.Response(
+        200,
+        json=[{"name": "repo1", "archived": False}, {"name": "repo2", "archived": True}, {"name": "repo3", "fork": True}],
+        request=httpx.Request("GET", "http://test"),
+    )
+    filters = RepositoryFilter(sort="pushed", exclude_forks=True, exclude_archived=True)
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", page_concurrency=4)
+        repos = await client.get_repositories_metadata("octo-org", owner_type="Organization", filters=filters)
+    assert [repo["name"] for repo in repos] == ["repo1"]
+    mock_client.get.assert_called_once_with("/orgs/octo-org/repos?type=public&sort=pushed&page=1&per_page=100")
+
+@pytest.mark.asyncio
+async def test_get_repositories_metadata_lists_private_repositories_of_token_owner():
+    """Test private repositories of the token's own user are listed through /user/repos."""
+    def respond(url, **kwargs):
+        request = httpx.Request("GET", f"https://api.github.com{url}")
+        if url == "/user":
+            return httpx.Response(200, json={"login": "TestUser"}, request=request)
+        if "page=1&" in url:
+            return httpx.Response(200, json=[{"name": "secret", "private": True}], request=request)
+        return httpx.Response(200, json=[], request=request)
+
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = respond
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat")
+        repos = await client.get_repositories_metadata("testuser", filters=RepositoryFilter(visibility="all"))
+    assert [repo["name"] for repo in repos] == ["secret"]
+    assert mock_client.get.call_args_list[1].args[0] == "/user/repos?visibility=all&affiliation=owner&page=1&per_page=100"
+
+def test_repository_filter_graphql_variables():
+    """Test GraphQL listings get every filter as a query argument."""
+    variables = RepositoryFilter(visibility="all", sort="created", exclude_forks=True, exclude_archived=True).graphql_variables()
+    assert variables == {
+        "privacy": None,
+        "isFork": False,
+        "isArchived": False,
+        "orderBy": {"field": "CREATED_AT", "direction": "DESC"},
+    }
+    with pytest.raises(ValueError):
+        RepositoryFilter(visibility="internal")
+
+@pytest.mark.asyncio
+async def test_graphql_mode_type_filter_keeps_public_visibility():
+    """Test a type other than public/private keeps the public privacy argument and drops private nodes."""
+    def node(name, private):
+        return {
+            "name": name, "stargazerCount": 0, "forkCount": 0, "issues": {"totalCount": 0}, "pullRequests": {"totalCount": 0},
+            "createdAt": "date1", "updatedAt": "date2", "url": f"https://github.com/testuser/{name}",
+            "isFork": True, "isArchived": False, "isPrivate": private,
+        }
+    mock_client = AsyncMock()
+    mock_client.post.return_value = httpx.Response(200, json={"data": {"repositoryOwner": {"repositories": {
+        "pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": [node("fork1", False), node("fork2", True)],
+    }}}}, request=httpx.Request('POST', 'http://test/graphql'))
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat", api_mode="graphql")
+        repos = await client.get_repositories_metadata("testuser", filters=RepositoryFilter(type="forks"))
+    variables = mock_client.post.call_args.kwargs["json"]["variables"]
+    assert (variables["privacy"], variables["isFork"]) == ("PUBLIC", True)
+    assert [repo["name"] for repo in repos] == ["fork1"]
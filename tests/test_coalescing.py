@@ -0,0 +1,132 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.clients import GitHubClient, GitHubConnectionPool
+from app.coalescing import RequestCoalescer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight():
+    """Test concurrent calls with the same key make the call once and all get its result."""
+    coalescer = RequestCoalescer(ttl=0)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"login": "octocat"}
+
+    results = await asyncio.gather(*(coalescer.run("user", call) for _ in range(5)))
+    assert calls == 1
+    assert results == [{"login": "octocat"}] * 5
+    assert coalescer.coalesced == 4
+    # Without a TTL nothing is memoized.
+    await coalescer.run("user", call)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_results_are_memoized_until_ttl(monkeypatch):
+    """Test a result is served from the memo until its TTL elapses."""
+    coalescer = RequestCoalescer(ttl=30)
+    now = [1000.0]
+    monkeypatch.setattr("app.coalescing.time.monotonic", lambda: now[0])
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return len(calls)
+
+    assert await coalescer.run("key", call) == 1
+    assert await coalescer.run("key", call) == 1
+    assert coalescer.hits == 1
+    now[0] += 31
+    assert await coalescer.run("key", call) == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_but_not_memoized():
+    """Test a failing call raises for every waiter and is retried by the next call."""
+    coalescer = RequestCoalescer(ttl=30)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if calls == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    results = await asyncio.gather(coalescer.run("key", call), coalescer.run("key", call), return_exceptions=True)
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert await coalescer.run("key", call) == "ok"
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_is_retried_by_waiter():
+    """Test a waiter makes the call itself when the caller that started it is cancelled."""
+    coalescer = RequestCoalescer(ttl=30)
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast():
+        return "ok"
+
+    owner = asyncio.create_task(coalescer.run("key", slow))
+    await started.wait()
+    waiter = asyncio.create_task(coalescer.run("key", fast))
+    await asyncio.sleep(0)
+    owner.cancel()
+    assert await waiter == "ok"
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_profile_across_clients():
+    """Test clients sharing a coalescer fetch a profile once, but separately per token."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"login": "octocat", "followers": 3})
+
+    pool = GitHubConnectionPool(http2=False, transport_factory=lambda: httpx.MockTransport(handler))
+    coalescer = RequestCoalescer(ttl=30)
+    users = await asyncio.gather(*(
+        GitHubClient(pat="token_a", pool=pool, coalescer=coalescer).get_user_metadata("octocat") for _ in range(3)
+    ))
+    await GitHubClient(pat="token_a", pool=pool, coalescer=coalescer).get_user_metadata("octocat")
+    await GitHubClient(pat="token_b", pool=pool, coalescer=coalescer).get_user_metadata("octocat")
+    await pool.aclose()
+
+    assert all(user["followers"] == 3 for user in users)
+    assert requests == ["token token_a", "token token_b"]
+
+
+@pytest.mark.asyncio
+async def test_client_memoizes_profiles_but_not_listing_pages():
+    """Test listing pages are coalesced but not kept in the memo, unlike profiles."""
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/users/octocat":
+            return httpx.Response(200, json={"login": "octocat"})
+        return httpx.Response(200, json=[])
+
+    pool = GitHubConnectionPool(http2=False, transport_factory=lambda: httpx.MockTransport(handler))
+    coalescer = RequestCoalescer(ttl=30)
+    client = GitHubClient(pat="token_a", pool=pool, coalescer=coalescer)
+    for _ in range(2):
+        await client.get_user_metadata("octocat")
+        await client.get_repositories_metadata("octocat")
+    await pool.aclose()
+
+    assert paths == ["/users/octocat", "/users/octocat/repos", "/users/octocat/repos"]
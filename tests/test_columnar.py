@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pytest
+
+from app.columnar import REPOSITORY_SCHEMA, compute_quality_metrics, repositories_to_table
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+
+REPOS = [
+    {"name": "repo1", "description": "a desc", "language": "Python", "star_count": 10, "updated_at": "2024-12-22T00:00:00Z", "auto_tags": ["tag1"]},
+    {"name": "repo2", "description": None, "language": "Python", "star_count": 20, "updated_at": "2022-01-01T00:00:00Z", "auto_tags": []},
+    {"name": "repo3", "description": "", "language": None, "star_count": None, "updated_at": None, "extra": "ignored"},
+]
+
+
+def test_repositories_to_table_uses_stable_schema():
+    """Test dictionaries are projected onto the schema, with parsed timestamps and the account column."""
+    table = repositories_to_table(REPOS, account="testuser")
+    assert table.schema == REPOSITORY_SCHEMA
+    assert table.column("account").to_pylist() == ["testuser"] * 3
+    assert table.column("updated_at")[0].as_py() == datetime(2024, 12, 22, tzinfo=timezone.utc)
+    assert table.column("updated_at")[2].as_py() is None
+
+
+def test_compute_quality_metrics():
+    """Test the vectorized metrics match the per-repository definitions and add the new aggregates."""
+    metrics = compute_quality_metrics(repositories_to_table(REPOS), {"followers": 100, "following": 50, "public_gists": 20}, now=NOW)
+    assert metrics["total_public_repos"] == 3
+    assert metrics["total_followers"] == 100
+    assert metrics["average_stars_per_repo"] == 10.0
+    assert metrics["repos_with_description_percentage"] == pytest.approx(100 / 3)
+    assert metrics["repos_with_auto_tags_percentage"] == pytest.approx(100 / 3)
+    assert metrics["repos_per_language"] == {"Python": 2}
+    assert metrics["star_percentiles"]["p50"] == 10.0
+    assert metrics["median_days_since_update"] == (10 + 1096) / 2
+    assert metrics["stale_repos_percentage"] == pytest.approx(100 / 3)
+
+
+def test_compute_quality_metrics_empty():
+    """Test an account without repositories yields zeroed metrics."""
+    metrics = compute_quality_metrics(pa.Table.from_pylist([], schema=REPOSITORY_SCHEMA))
+    assert metrics["total_public_repos"] == 0
+    assert metrics["average_stars_per_repo"] == 0
+    assert metrics["star_percentiles"] == {"p50": 0, "p90": 0, "p99": 0}
+    assert metrics["median_days_since_update"] is None
@@ -0,0 +1,110 @@
+import pytest
+from dataclasses import asdict
+import httpx
+from unittest.mock import AsyncMock, patch
+
+from app.clients import GitHubClient, RepositoryFilter
+from app.incremental import SnapshotStore, get_watermark, merge_repositories, needs_full_listing, reconcile_repositories
+
+def test_merge_repositories_replaces_changed_and_keeps_tags():
+    """Test changed repositories replace stale entries while unchanged ones keep their auto_tags."""
+    previous = [
+        {"name": "a", "updated_at": "2024-01-01T00:00:00Z", "auto_tags": ["old"]},
+        {"name": "b", "updated_at": "2024-01-02T00:00:00Z", "auto_tags": ["kept"]},
+    ]
+    changed = [{"name": "c", "updated_at": "2024-03-01T00:00:00Z"}, {"name": "a", "updated_at": "2024-02-01T00:00:00Z"}]
+    merged = merge_repositories(previous, changed)
+    assert [repo["name"] for repo in merged] == ["a", "b", "c"]
+    assert "auto_tags" not in merged[0]
+    assert merged[1]["auto_tags"] == ["kept"]
+    assert get_watermark(merged) == "2024-03-01T00:00:00Z"
+
+def test_merge_repositories_drops_filtered_out_repositories():
+    """Test updated repositories the listing filtered out are removed from the snapshot."""
+    previous = [{"name": "a", "updated_at": "2024-01-01T00:00:00Z"}, {"name": "b", "updated_at": "2024-01-02T00:00:00Z"}]
+    merged = merge_repositories(previous, [], removed=["a"])
+    assert [repo["name"] for repo in merged] == ["b"]
+
+def test_merge_repositories_keys_on_full_name():
+    """Test same-named repositories of different owners are kept apart."""
+    previous = [{"name": "docs", "full_name": "octocat/docs", "updated_at": "2024-01-01T00:00:00Z", "auto_tags": ["kept"]}]
+    changed = [{"name": "docs", "full_name": "octo-org/docs", "updated_at": "2024-02-01T00:00:00Z"}]
+    merged = merge_repositories(previous, changed)
+    assert [repo["full_name"] for repo in merged] == ["octocat/docs", "octo-org/docs"]
+    assert merged[0]["auto_tags"] == ["kept"]
+
+def test_reconcile_repositories_drops_missing_and_keeps_unchanged_tags():
+    """Test a full listing drops deleted or renamed repositories and keeps work done on unchanged ones."""
+    previous = [
+        {"name": "deleted", "updated_at": "2024-01-01T00:00:00Z", "auto_tags": ["x"]},
+        {"name": "same", "updated_at": "2024-01-02T00:00:00Z", "auto_tags": ["kept"]},
+        {"name": "edited", "updated_at": "2024-01-03T00:00:00Z", "auto_tags": ["stale"]},
+    ]
+    current = [
+        {"name": "edited", "updated_at": "2024-02-01T00:00:00Z"},
+        {"name": "same", "updated_at": "2024-01-02T00:00:00Z"},
+        {"name": "renamed", "updated_at": "2024-02-02T00:00:00Z"},
+    ]
+    reconciled = reconcile_repositories(previous, current)
+    assert [repo["name"] for repo in reconciled] == ["edited", "same", "renamed"]
+    assert "auto_tags" not in reconciled[0]
+    assert reconciled[1]["auto_tags"] == ["kept"]
+
+def test_needs_full_listing():
+    """Test full listings happen without a snapshot, on filter changes and every few runs."""
+    filters = asdict(RepositoryFilter())
+    snapshot = {"watermark": "2024-01-01T00:00:00Z", "filters": filters, "runs_since_full": 0, "repos": []}
+    assert needs_full_listing(None, filters, 10)
+    assert not needs_full_listing(snapshot, filters, 10)
+    assert needs_full_listing(snapshot, asdict(RepositoryFilter(exclude_archived=True)), 10)
+    assert needs_full_listing({**snapshot, "runs_since_full": 9}, filters, 10)
+    assert not needs_full_listing({**snapshot, "runs_since_full": 9}, filters, 0)
+    # Snapshots saved before filters were recorded are reconciled once.
+    assert needs_full_listing({"watermark": "2024-01-01T00:00:00Z", "repos": []}, filters, 10)
+    # So are snapshots whose repositories do not carry their owner yet.
+    assert needs_full_listing({**snapshot, "repos": [{"name": "a", "updated_at": "2024-01-01T00:00:00Z"}]}, filters, 10)
+
+@pytest.mark.asyncio
+async def test_snapshot_store_round_trip(tmp_path):
+    """Test snapshots are saved with their watermark and loaded back per account."""
+    store = SnapshotStore(str(tmp_path))
+    assert await store.load("TestUser") is None
+    watermark = await store.save("TestUser", [{"name": "a", "updated_at": "2024-01-01T00:00:00Z"}])
+    snapshot = await store.load("testuser")
+    assert watermark == snapshot["watermark"] == "2024-01-01T00:00:00Z"
+    assert snapshot["repos"][0]["name"] == "a"
+
+@pytest.mark.asyncio
+async def test_client_stops_paginating_at_watermark():
+    """Test incremental fetching sorts by update time and stops at the first older repository."""
+    page = httpx.Response(200, json=[
+        {"name": "new", "updated_at": "2024-03-01T00:00:00Z"},
+        {"name": "same", "updated_at": "2024-02-01T00:00:00Z"},
+        {"name": "old", "updated_at": "2024-01-01T00:00:00Z"},
+    ], request=httpx.Request('GET', 'http://test'))
+    mock_client = AsyncMock()
+    mock_client.get.return_value = page
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat")
+        repos = await client.get_repositories_metadata("testuser", updated_since="2024-02-01T00:00:00Z")
+    assert [repo["name"] for repo in repos] == ["new", "same"]
+    mock_client.get.assert_called_once_with("/users/testuser/repos?sort=updated&direction=desc&page=1&per_page=100")
+
+@pytest.mark.asyncio
+async def test_client_reports_updated_repositories_filtered_out():
+    """Test incremental REST listings report the updated repositories their filter dropped."""
+    page = httpx.Response(200, json=[
+        {"name": "kept", "updated_at": "2024-03-01T00:00:00Z", "archived": False},
+        {"name": "archived", "updated_at": "2024-02-15T00:00:00Z", "archived": True},
+        {"name": "old", "updated_at": "2024-01-01T00:00:00Z"},
+    ], request=httpx.Request('GET', 'http://test'))
+    mock_client = AsyncMock()
+    mock_client.get.return_value = page
+    excluded = []
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(pat="test_pat")
+        repos = await client.get_repositories_metadata(
+            "testuser", updated_since="2024-02-01T00:00:00Z", filters=RepositoryFilter(exclude_archived=True), excluded=excluded
+        )
+    assert [repo["name"] for repo in repos] == ["kept"]
+    assert excluded == ["archived"]
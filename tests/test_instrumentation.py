@@ -0,0 +1,80 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.cache import InMemoryResponseCache
+from app.clients import GitHubClient
+from app.instrumentation import RequestInstrumentation, endpoint_template
+from app.ratelimit import RateLimitScheduler
+
+
+@pytest.mark.parametrize("url, template", [
+    ("/users/octocat", "/users/{username}"),
+    ("/users/octocat/repos?page=3&per_page=100", "/users/{username}/repos"),
+    ("/repos/octocat/hello/languages", "/repos/{owner}/{repo}/languages"),
+    ("https://api.github.com/graphql", "/graphql"),
+    ("/graphql", "/graphql"),
+    ("/user", "/user"),
+    ("/user/repos?visibility=private&page=2&per_page=100", "/user/repos"),
+    ("/orgs/github/repos?type=sources", "/orgs/{org}/repos"),
+])
+def test_endpoint_template(url, template):
+    """Test request paths are reduced to templates free of account names and query strings."""
+    assert endpoint_template(url) == template
+
+
+def _recorded(metrics, name):
+    return [call.kwargs for call in metrics.record_metric.call_args_list if call.kwargs["name"] == name]
+
+
+@pytest.mark.asyncio
+async def test_client_records_metrics_and_span_per_request():
+    """Test every HTTP call records latency, bytes, retries, headroom, throttle wait and a span."""
+    metrics, traces = MagicMock(), MagicMock()
+    request = httpx.Request("GET", "https://api.github.com/users/testuser")
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}, request=request),
+        httpx.Response(200, json={"login": "testuser"}, headers={"X-RateLimit-Remaining": "4999"}, request=request),
+    ]
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = responses
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(
+            pat="test_pat",
+            scheduler=RateLimitScheduler(reserve=0),
+            instrumentation=RequestInstrumentation(metrics=metrics, traces=traces),
+        )
+        await client.get_user_metadata("testuser")
+
+    durations = _recorded(metrics, "github_request_duration_ms")
+    assert [d["labels"]["status"] for d in durations] == ["429", "200"]
+    assert all(d["labels"]["endpoint"] == "/users/{username}" for d in durations)
+    assert len(_recorded(metrics, "github_request_retries")) == 1
+    assert _recorded(metrics, "github_rate_limit_remaining")[0]["value"] == 4999
+    assert _recorded(metrics, "github_response_bytes")[-1]["value"] == len(responses[1].content)
+    spans = [call.kwargs for call in traces.record_trace.call_args_list]
+    assert [span["status_code"] for span in spans] == ["ERROR", "OK"]
+    assert {span["trace_id"] for span in spans} == {client.trace_id}
+    assert spans[0]["kind"] == "CLIENT"
+
+
+@pytest.mark.asyncio
+async def test_client_records_cache_hits_and_listing_pages():
+    """Test 304 answers count as cache hits and listings record their page count."""
+    metrics, traces = MagicMock(), MagicMock()
+    request = httpx.Request("GET", "https://api.github.com/users/testuser/repos")
+    page = httpx.Response(200, json=[{"name": "repo1"}], headers={"ETag": '"v1"'}, request=request)
+    empty = httpx.Response(200, json=[], headers={"ETag": '"v2"'}, request=request)
+    mock_client = AsyncMock()
+    mock_client.headers = {}
+    mock_client.get.side_effect = [page, empty, httpx.Response(304, request=request), httpx.Response(304, request=request)]
+    with patch("httpx.AsyncClient", return_value=mock_client):
+        client = GitHubClient(
+            pat="test_pat", cache=InMemoryResponseCache(), instrumentation=RequestInstrumentation(metrics=metrics, traces=traces)
+        )
+        await client.get_repositories_metadata("testuser")
+        await client.get_repositories_metadata("testuser")
+
+    assert len(_recorded(metrics, "github_cache_hits")) == 2
+    assert [d["value"] for d in _recorded(metrics, "github_listing_pages")] == [1, 1]
@@ -0,0 +1,74 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.keywords import KeywordCache, KeywordEngine
+
+DESCRIPTIONS = [
+    "A fast web framework for building APIs with Python",
+    None,
+    "Command line tool for managing cloud infrastructure",
+    "",
+    "Machine learning library for natural language processing",
+]
+
+@pytest.mark.asyncio
+async def test_keyword_engine_process_pool_matches_inline():
+    """Test batched extraction in pool processes returns the same keywords, in order, as the inline path."""
+    inline = await KeywordEngine(batch_size=100).extract(DESCRIPTIONS)
+    engine = KeywordEngine(max_workers=2, batch_size=1)
+    try:
+        pooled = await engine.extract(DESCRIPTIONS)
+    finally:
+        engine.shutdown()
+    assert pooled == inline
+    assert inline[1] == [] and inline[3] == []
+    assert all(inline[i] for i in (0, 2, 4))
+
+@pytest.mark.asyncio
+async def test_keyword_engine_empty_input():
+    """Test descriptions without text never reach YAKE."""
+    assert await KeywordEngine().extract([None, ""]) == [[], []]
+
+@pytest.mark.asyncio
+async def test_keyword_cache_skips_unchanged_descriptions(tmp_path):
+    """Test memoized descriptions are not re-scored, including after a restart via the SQLite tier."""
+    path = str(tmp_path / "keywords.sqlite")
+    engine = KeywordEngine(cache=KeywordCache(path=path))
+    first = await engine.extract(DESCRIPTIONS)
+    assert engine.cache.stats()["misses"] == 3
+
+    restarted = KeywordEngine(cache=KeywordCache(path=path))
+    with patch("app.keywords._extract_batch", side_effect=AssertionError("YAKE should not run")):
+        second = await restarted.extract(DESCRIPTIONS)
+    assert second == first
+    assert restarted.cache.stats()["hits"] == 3
+
+@pytest.mark.asyncio
+async def test_keyword_engine_caches_each_batch_as_it_completes():
+    """Test batches scored before a failure stay cached, so a retry only scores the rest."""
+    engine = KeywordEngine(batch_size=1, cache=KeywordCache())
+    engine._executor = ThreadPoolExecutor(max_workers=1)
+
+    def extract(batch, config):
+        if batch == [DESCRIPTIONS[4]]:
+            raise RuntimeError("worker lost")
+        return [["keyword"] for _ in batch]
+
+    with patch("app.keywords._extract_batch", side_effect=extract):
+        with pytest.raises(RuntimeError):
+            await engine.extract(DESCRIPTIONS)
+    assert engine.cache.stats()["entries"] == 2
+    engine.shutdown()
+
+@pytest.mark.asyncio
+async def test_keyword_engine_scores_at_most_max_chars():
+    """Test long texts such as READMEs are truncated before they reach YAKE."""
+    engine = KeywordEngine(max_chars=10)
+    with patch("app.keywords._extract_batch", return_value=[["keyword"]]) as extract:
+        await engine.extract(["x" * 100])
+    assert extract.call_args.args[0] == ["x" * 10]
+
+def test_keyword_cache_key_depends_on_config():
+    """Test a different extractor configuration does not reuse cached keywords."""
+    assert KeywordCache.build_key("text", {"top": 5}) != KeywordCache.build_key("text", {"top": 10})
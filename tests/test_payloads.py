@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, JSONPlainPayloadConverter
+
+from app.payloads import CompressionPayloadCodec, FastJSONPayloadConverter, build_data_converter, get_payload_codec
+
+
+def test_payload_converter_matches_default():
+    """Test ASCII payloads are byte-identical to the default JSON converter and decode back."""
+    value = {"username": "octocat", "repo_data": [{"name": "repo1", "auto_tags": ["a"]}], "batch": 2}
+    payload = FastJSONPayloadConverter().to_payload(value)
+    assert payload.data == JSONPlainPayloadConverter().to_payload(value).data
+    assert FastJSONPayloadConverter().from_payload(payload) == value
+
+
+def test_payload_converter_decodes_like_default_for_non_ascii():
+    """Test non-ASCII payloads differ in bytes from the default converter's but decode to the same values either way."""
+    value = {"description": "Café ☕ 日本語", "auto_tags": ["naïve"]}
+    fast = FastJSONPayloadConverter().to_payload(value)
+    default = JSONPlainPayloadConverter().to_payload(value)
+    assert fast.data != default.data
+    assert JSONPlainPayloadConverter().from_payload(fast) == value
+    assert FastJSONPayloadConverter().from_payload(default) == value
+
+
+def test_payload_converter_falls_back_for_unsupported_values():
+    """Test values orjson rejects still serialize through the default encoder."""
+    payload = FastJSONPayloadConverter().to_payload({1: "a"})
+    assert json.loads(payload.data) == {"1": "a"}
+
+
+def test_build_data_converter_roundtrip():
+    """Test the data converter keeps the default chain with the fast JSON converter."""
+    converter = build_data_converter()
+    assert converter.payload_codec is DataConverter.default.payload_codec
+    payloads = converter.payload_converter.to_payloads([{"a": 1}, None, b"raw"])
+    assert converter.payload_converter.from_payloads(payloads) == [{"a": 1}, None, b"raw"]
+
+
+@pytest.mark.asyncio
+async def test_codec_compresses_large_payloads_transparently():
+    """Test payloads above the threshold are compressed, recorded as metrics and restored exactly."""
+    metrics = MagicMock()
+    codec = CompressionPayloadCodec("gzip", threshold=1024, metrics=metrics)
+    repos = [{"name": f"repo{i}", "url": f"https://github.com/octocat/repo{i}", "updated_at": "2024-01-01T00:00:00Z"} for i in range(200)]
+    large, small = build_data_converter().payload_converter.to_payloads([repos, {"username": "octocat"}])
+
+    encoded = await codec.encode([large, small])
+    assert encoded[0].metadata["encoding"] == b"binary/gzip"
+    assert len(encoded[0].data) < len(large.data) / 4
+    assert encoded[1] is small
+    assert await codec.decode(encoded) == [large, small]
+    ratio = [call for call in metrics.record_metric.call_args_list if call.kwargs["name"] == "temporal_payload_compression_ratio"]
+    assert ratio[0].kwargs["value"] > 4
+
+
+@pytest.mark.asyncio
+async def test_codec_skips_incompressible_payloads():
+    """Test a payload that would not shrink is sent unchanged."""
+    payload = Payload(metadata={"encoding": b"binary/plain"}, data=os.urandom(512))
+    codec = CompressionPayloadCodec("gzip", threshold=16, metrics=MagicMock())
+    assert await codec.encode([payload]) == [payload]
+
+
+@pytest.mark.asyncio
+async def test_data_converter_roundtrip_with_codec():
+    """Test values survive the full converter with compression, whatever algorithm decodes them."""
+    converter = build_data_converter(CompressionPayloadCodec("gzip", threshold=0, metrics=MagicMock()))
+    value = {"repo_data": [{"name": "repo1", "auto_tags": ["a"]}] * 50}
+    payloads = await converter.encode([value])
+    assert payloads[0].metadata["encoding"] == b"binary/gzip"
+    assert json.loads(Payload.FromString(gzip.decompress(payloads[0].data)).data) == value
+    assert await converter.decode(payloads) == [value]
+
+
+def test_get_payload_codec_from_environment():
+    """Test the codec follows the environment settings and rejects unknown algorithms."""
+    with patch.dict("os.environ", {"GITHUB_PAYLOAD_COMPRESSION": "gzip", "GITHUB_PAYLOAD_COMPRESSION_THRESHOLD": "100"}):
+        codec = get_payload_codec()
+    assert (codec.algorithm, codec.threshold) == ("gzip", 100)
+    with patch.dict("os.environ", {"GITHUB_PAYLOAD_COMPRESSION": "none"}):
+        assert get_payload_codec() is None
+    with patch.dict("os.environ", {"GITHUB_PAYLOAD_COMPRESSION": "brotli"}), pytest.raises(ValueError):
+        get_payload_codec()
@@ -0,0 +1,80 @@
+import time
+import pytest
+import httpx
+from unittest.mock import AsyncMock, patch
+
+from app.clients import GitHubClient
+from app.ratelimit import RateLimitScheduler, is_rate_limited, rate_limit_resource
+
+def _response(status_code=200, headers=None, json=None):
+    return httpx.Response(status_code, headers=headers or {}, json=json if json is not None else {}, request=httpx.Request("GET", "http://test"))
+
+def test_scheduler_tracks_quota_headers():
+    """Test the scheduler records quota headers and slows down to make the quota last."""
+    scheduler = RateLimitScheduler(requests_per_second=100, reserve=0)
+    scheduler.update(_response(headers={"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(int(time.time()) + 100)}))
+    state = scheduler.state()["core"]
+    assert state["limit"] == 5000
+    assert state["remaining"] == 100
+    assert state["requests_per_second"] <= 1.1
+    assert state["blocked_for_seconds"] == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_does_not_throttle_fresh_quota():
+    """Test a nearly full quota is spent at the configured ceiling rather than spread until the reset."""
+    scheduler = RateLimitScheduler(requests_per_second=1000, burst=10, reserve=50)
+    scheduler.update(_response(headers={"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4990", "X-RateLimit-Reset": str(int(time.time()) + 3600)}))
+    assert scheduler.state()["core"]["requests_per_second"] == 1000
+    start = time.monotonic()
+    for _ in range(30):
+        await scheduler.acquire()
+    assert time.monotonic() - start < 0.5
+
+def test_scheduler_blocks_on_retry_after():
+    """Test Retry-After blocks further requests for the advertised time."""
+    scheduler = RateLimitScheduler()
+    response = _response(429, headers={"Retry-After": "30"})
+    assert is_rate_limited(response)
+    scheduler.update(response)
+    assert 29 < scheduler.blocked_for() <= 30
+    assert 29 < scheduler.blocked_for("graphql") <= 30
+
+def test_scheduler_blocks_until_reset_when_exhausted():
+    """Test an exhausted quota blocks requests until the reset time."""
+    scheduler = RateLimitScheduler(reserve=10)
+    scheduler.update(_response(headers={"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": str(int(time.time()) + 60)}))
+    assert scheduler.state()["core"]["blocked_for_seconds"] > 50
+
+def test_scheduler_keeps_one_bucket_per_resource():
+    """Test GraphQL and REST quotas are tracked apart, and exhausting one does not hold back the other."""
+    scheduler = RateLimitScheduler(reserve=10)
+    reset = str(int(time.time()) + 600)
+    scheduler.update(_response(headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": reset}))
+    scheduler.update(_response(headers={"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "5", "X-RateLimit-Reset": reset}))
+    assert scheduler.remaining("core") == 4000
+    assert scheduler.remaining("graphql") == 5
+    assert scheduler.blocked_for("graphql") > 500
+    assert scheduler.blocked_for("core") == 0
+
+def test_rate_limit_resource():
+    """Test requests are mapped to the rate-limit resource they draw from."""
+    assert rate_limit_resource("/users/testuser/repos?page=2") == "core"
+    assert rate_limit_resource("/graphql") == "graphql"
+    assert rate_limit_resource("https://api.github.com/graphql") == "graphql"
+    assert rate_limit_resource("/search/repositories?q=x") == "search"
+
+@pytest.mark.asyncio
+async def test_client_retries_rate_limited_request():
+    """Test a rate-limited request is retried after the scheduler back-off instead of failing."""
+    mock_client = AsyncMock()
+    mock_client.get.side_effect = [
+        _response(403, headers={"Retry-After": "1", "X-RateLimit-Remaining": "0"}),
+        _response(200, json={"login": "testuser"}),
+    ]
+    scheduler = RateLimitScheduler(reserve=0)
+    with patch("httpx.AsyncClient", return_value=mock_client), patch("app.ratelimit.asyncio.sleep", new=AsyncMock()) as sleep:
+        client = GitHubClient(pat="test_pat", scheduler=scheduler)
+        user = await client.get_user_metadata("testuser")
+    assert user["name"] == "testuser"
+    assert mock_client.get.call_count == 2
+    sleep.assert_awaited_once()
@@ -0,0 +1,88 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.records import Repository, User, decode, decode_list, dumps, loads
+
+REPO = {
+    "name": "repo1",
+    "full_name": "octocat/repo1",
+    "description": "A repository",
+    "language": "Python",
+    "stargazers_count": 10,
+    "forks_count": 2,
+    "open_issues_count": 1,
+    "created_at": "2020-01-01T00:00:00Z",
+    "updated_at": "2021-01-01T00:00:00Z",
+    "html_url": "https://github.com/octocat/repo1",
+    "owner": {"login": "octocat", "id": 1},
+    "license": {"key": "mit"},
+}
+
+
+@pytest.fixture(params=["msgspec", "stdlib"])
+def decoder(request):
+    """Runs a test with msgspec decoding and with the loads-and-project fallback."""
+    if request.param == "msgspec":
+        pytest.importorskip("msgspec")
+        yield
+    else:
+        with patch("app.records.msgspec", None):
+            yield
+
+
+def test_decode_list_projects_repositories(decoder):
+    """Test a page of repositories decodes into records keeping only the extracted fields."""
+    repos = decode_list(json.dumps([REPO, {"name": "repo2"}]).encode(), Repository)
+    assert [type(repo) for repo in repos] == [Repository, Repository]
+    assert repos[0].to_dict() == {
+        "name": "repo1",
+        "full_name": "octocat/repo1",
+        "description": "A repository",
+        "language": "Python",
+        "star_count": 10,
+        "fork_count": 2,
+        "issue_count": 1,
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2021-01-01T00:00:00Z",
+        "url": "https://github.com/octocat/repo1",
+    }
+    assert repos[1].description is None
+
+
+def test_decode_user_applies_fallbacks(decoder):
+    """Test missing user fields get the fallback values of the user metadata."""
+    user = decode(b'{"login": "octocat", "followers": 5, "plan": {"name": "free"}}', User).to_dict()
+    assert user["name"] == "octocat"
+    assert user["followers"] == 5
+    assert user["bio"] == "No bio provided."
+    assert user["public_repos"] == 0
+
+
+def test_decode_fallback_matches_msgspec():
+    """Test the loads-and-project fallback produces the same records as msgspec."""
+    pytest.importorskip("msgspec")
+    content = json.dumps([REPO, {"name": "repo2", "fork": True, "archived": True}]).encode()
+    user = b'{"login": "octocat", "type": "Organization", "followers": 5}'
+    fast = ([repo.to_dict() for repo in decode_list(content, Repository)], decode_list(content, Repository), decode(user, User))
+    with patch("app.records.msgspec", None):
+        slow = ([repo.to_dict() for repo in decode_list(content, Repository)], decode_list(content, Repository), decode(user, User))
+    assert fast == slow
+
+
+def test_records_are_slotted():
+    """Test records do not carry a per-instance __dict__."""
+    assert not hasattr(Repository(), "__dict__")
+    assert not hasattr(User(), "__dict__")
+
+
+def test_dumps_loads_roundtrip():
+    """Test the serializer produces compact JSON that parses back to the same value."""
+    value = {"name": "repo1", "auto_tags": ["a", "b"], "star_count": 3, "description": None}
+    data = dumps(value)
+    assert isinstance(data, bytes)
+    assert loads(data) == value
+    assert json.loads(data) == value
+    with patch("app.records.orjson", None):
+        assert dumps(value) == json.dumps(value, separators=(",", ":")).encode()
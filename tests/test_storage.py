@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.storage import LocalDataStore, ObjectStoreDataStore, is_reference, load_records, store_records
+
+@pytest.mark.asyncio
+async def test_store_and_load_records_by_reference(tmp_path):
+    """Test a dataset round-trips through a small reference carrying size and checksum."""
+    store = LocalDataStore(str(tmp_path))
+    records = [{"name": "repo1", "description": "a desc"}, {"name": "repo2", "description": None}]
+    reference = await store_records(records, "repositories", store=store)
+    assert is_reference(reference)
+    assert reference["count"] == 2
+    assert reference["size"] > 0
+    assert await load_records(reference, store=store) == records
+
+@pytest.mark.asyncio
+async def test_load_records_passes_inline_data_through():
+    """Test inline datasets are returned unchanged."""
+    records = [{"name": "repo1"}]
+    assert await load_records(records) is records
+
+@pytest.mark.asyncio
+async def test_load_records_detects_corruption(tmp_path):
+    """Test a reference whose stored data changed is rejected."""
+    store = LocalDataStore(str(tmp_path))
+    reference = await store_records([{"name": "repo1"}], "repositories", store=store)
+    await store.put(reference["$ref"], b"[]")
+    with pytest.raises(ValueError):
+        await load_records(reference, store=store)
+
+@pytest.mark.asyncio
+async def test_local_store_removes_expired_data(tmp_path):
+    """Test writing to the local store removes stored files older than its max age."""
+    store = LocalDataStore(str(tmp_path))
+    expired = await store_records([{"name": "repo1"}], "repositories", store=store)
+    expired_path = tmp_path / expired["$ref"]
+    old = time.time() - store.max_age.total_seconds() - 60
+    os.utime(expired_path, (old, old))
+    recent = await store_records([{"name": "repo2"}], "repositories", store=store)
+    assert not expired_path.exists()
+    assert (tmp_path / recent["$ref"]).exists()
+
+@pytest.mark.asyncio
+async def test_object_store_removes_temporary_file_when_upload_fails(tmp_path, monkeypatch):
+    """Test the temporary upload file does not leak when the object store upload raises."""
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    upload = AsyncMock(side_effect=RuntimeError("object store unavailable"))
+    with patch("app.storage.ObjectStore.upload_file", upload):
+        with pytest.raises(RuntimeError):
+            await ObjectStoreDataStore().put("claim-check/abc-repositories.json", b"[]")
+    upload.assert_awaited_once()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.clients import GitHubClient, GitHubConnectionPool
+from app.ratelimit import RateLimitScheduler
+from app.tokens import TokenPool
+
+
+def _response(status_code=200, headers=None):
+    return httpx.Response(status_code, headers=headers or {}, json={}, request=httpx.Request("GET", "http://test"))
+
+
+def _pool(tokens):
+    return TokenPool(tokens, scheduler_factory=lambda: RateLimitScheduler(requests_per_second=1000, burst=100, reserve=10))
+
+
+@pytest.mark.asyncio
+async def test_pool_routes_to_token_with_most_headroom():
+    """Test requests go to the token with the most remaining quota."""
+    pool = _pool(["token_a", "token_b", "token_a"])
+    assert len(pool.credentials) == 2
+    first, _ = await pool.acquire()
+    pool.release(first, _response(headers={"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": str(int(time.time()) + 3600)}))
+    second, _ = await pool.acquire()
+    assert second is not first
+    pool.release(second, _response(headers={"X-RateLimit-Remaining": "4000"}))
+    third, _ = await pool.acquire()
+    assert third is second
+
+
+@pytest.mark.asyncio
+async def test_exhausted_token_is_parked():
+    """Test a token rate limited until its reset is skipped while another token is available."""
+    pool = _pool(["token_a", "token_b"])
+    first, _ = await pool.acquire()
+    pool.release(first, _response(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 600)}))
+    assert first.scheduler.blocked_for() > 500
+    for _ in range(3):
+        credential, wait = await pool.acquire()
+        assert credential is not first and wait == 0
+        pool.release(credential, _response())
+
+
+@pytest.mark.asyncio
+async def test_token_parked_on_graphql_still_serves_rest():
+    """Test a token out of GraphQL points is skipped for GraphQL requests only."""
+    pool = _pool(["token_a", "token_b"])
+    first, _ = await pool.acquire("graphql")
+    reset = str(int(time.time()) + 600)
+    pool.release(first, _response(headers={"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}), "graphql")
+    second, _ = await pool.acquire("graphql")
+    assert second is not first
+    pool.release(second, _response(headers={"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "4000"}), "graphql")
+    pool.release(second, _response(headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "100", "X-RateLimit-Reset": reset}))
+    rest, wait = await pool.acquire()
+    assert rest is first and wait == 0
+
+
+@pytest.mark.asyncio
+async def test_revoked_tokens_are_dropped():
+    """Test a token rejected with a 401 is never used again, and an empty pool raises."""
+    pool = _pool(["token_a"])
+    credential, _ = await pool.acquire()
+    pool.release(credential, _response(401))
+    assert pool.available() == 0
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
+    with pytest.raises(ValueError):
+        TokenPool([])
+
+
+@pytest.mark.asyncio
+async def test_client_spreads_requests_and_skips_revoked_token():
+    """Test a client with a token pool moves past a revoked token and spreads requests over the others."""
+    used = []
+
+    def handler(request):
+        token = request.headers["Authorization"]
+        used.append(token)
+        if token == "token revoked":
+            return httpx.Response(401, json={"message": "Bad credentials"})
+        return httpx.Response(200, json={"login": "octocat"}, headers={"X-RateLimit-Remaining": "4000"})
+
+    connections = GitHubConnectionPool(http2=False, transport_factory=lambda: httpx.MockTransport(handler))
+    tokens = _pool(["revoked", "token_a", "token_b"])
+    client = GitHubClient(tokens=tokens, pool=connections)
+    users = await asyncio.gather(*(client.get_user_metadata(f"user{i}") for i in range(6)))
+    await connections.aclose()
+
+    assert [user["name"] for user in users] == ["octocat"] * 6
+    assert used.count("token revoked") == 1
+    assert {"token token_a", "token token_b"} <= set(used)
+    assert tokens.available() == 2
@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+from temporalio.workflow import _Definition
+
+from app.workers import CPU_ACTIVITIES, PASSTHROUGH_MODULES, WorkerSettings, build_role_worker, get_worker_settings, run_worker
+from app.workflow import GitHubWorkflow
+
+
+def _activity_names(worker_kwargs):
+    return {getattr(activity, "__name__", None) for activity in worker_kwargs["activities"]}
+
+
+def test_get_worker_settings_from_environment():
+    """Test settings are read from the environment and CPU processes need main-queue processes."""
+    env = {
+        "GITHUB_WORKER_PROCESSES": "4",
+        "GITHUB_CPU_WORKER_PROCESSES": "2",
+        "GITHUB_MAX_CONCURRENT_ACTIVITIES": "20",
+        "GITHUB_MAX_CONCURRENT_WORKFLOW_TASKS": "50",
+        "GITHUB_WORKER_DRAIN_TIMEOUT": "15",
+    }
+    with patch.dict("os.environ", env):
+        settings = get_worker_settings()
+    assert (settings.processes, settings.cpu_processes) == (4, 2)
+    assert (settings.max_concurrent_activities, settings.max_concurrent_workflow_tasks) == (20, 50)
+    assert settings.drain_timeout == 15
+    with patch.dict("os.environ", {"GITHUB_WORKER_PROCESSES": "0", "GITHUB_CPU_WORKER_PROCESSES": "1"}):
+        with pytest.raises(ValueError):
+            get_worker_settings()
+
+
+def test_split_queues_route_activities_by_role():
+    """Test the CPU queue serves only CPU-bound activities and the main queue keeps workflows and every activity."""
+    settings = WorkerSettings(processes=2, cpu_processes=1, max_concurrent_activities=20, max_concurrent_workflow_tasks=50, drain_timeout=5)
+    with patch("app.workers.Worker") as worker_class:
+        build_role_worker(MagicMock(), "github_extractor", "main", settings)
+        build_role_worker(MagicMock(), "github_extractor", "cpu", settings)
+    main_kwargs, cpu_kwargs = (call.kwargs for call in worker_class.call_args_list)
+
+    assert main_kwargs["task_queue"] == "github_extractor"
+    assert main_kwargs["workflows"] and "fetch_repositories_metadata_activity" in _activity_names(main_kwargs)
+    # Workflows started without cpu_task_queue still run their CPU-bound activities on the main queue.
+    assert set(CPU_ACTIVITIES) <= _activity_names(main_kwargs)
+    assert main_kwargs["max_concurrent_workflow_tasks"] == 50
+    assert main_kwargs["graceful_shutdown_timeout"].total_seconds() == 5
+
+    assert cpu_kwargs["task_queue"] == "github_extractor-cpu"
+    assert cpu_kwargs["workflows"] == []
+    assert _activity_names(cpu_kwargs) == set(CPU_ACTIVITIES)
+    assert cpu_kwargs["max_concurrent_activities"] == 1
+
+
+def test_single_queue_keeps_all_activities():
+    """Test without CPU processes the main queue runs every activity."""
+    with patch("app.workers.Worker") as worker_class:
+        build_role_worker(MagicMock(), "github_extractor", "main", WorkerSettings(processes=1))
+        with pytest.raises(ValueError):
+            build_role_worker(MagicMock(), "github_extractor", "gpu", WorkerSettings(processes=1))
+    assert set(CPU_ACTIVITIES) <= _activity_names(worker_class.call_args.kwargs)
+
+
+@pytest.mark.asyncio
+async def test_run_worker_drains_on_stop():
+    """Test setting the stop event shuts the worker down and waits for its run to return."""
+    stopped = asyncio.Event()
+    worker = MagicMock(task_queue="github_extractor")
+
+    async def run():
+        await stopped.wait()
+
+    async def shutdown():
+        stopped.set()
+
+    worker.run = run
+    worker.shutdown = MagicMock(side_effect=shutdown)
+    stop = asyncio.Event()
+    task = asyncio.create_task(run_worker(worker, stop))
+    await asyncio.sleep(0)
+    stop.set()
+    await asyncio.wait_for(task, timeout=1)
+    worker.shutdown.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_workflow_loads_in_sandbox_without_app_passthrough():
+    """Test the workflow module imports inside the sandbox with the shared passthrough list, which excludes app."""
+    assert "app" not in PASSTHROUGH_MODULES
+    runner = SandboxedWorkflowRunner(restrictions=SandboxRestrictions.default.with_passthrough_modules(*PASSTHROUGH_MODULES))
+    runner.prepare_workflow(_Definition.must_from_class(GitHubWorkflow))
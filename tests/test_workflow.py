@@ -1,5 +1,7 @@
 import pytest
-from app.workflow import GitHubWorkflow
+from unittest.mock import AsyncMock, patch
+
+from app.workflow import CPU_SCHEDULE_TO_START_TIMEOUT, GitHubWorkflow, enriches_readme
 
 @pytest.mark.asyncio
 async def test_github_workflow_happy_path(temporal_client):
@@ -15,4 +17,42 @@ async def test_github_workflow_happy_path(temporal_client):
     # The test will pass as long as the workflow executes without throwing an exception.
     # The individual activity tests (in test_activities.py) ensure the correctness of the
     # data manipulation and file writing. This test verifies the correct flow of the
-    # workflow itself.
\ No newline at end of file
+    # workflow itself.
+
+@pytest.mark.asyncio
+async def test_github_workflow_batch_mode(temporal_client):
+    """Test batch mode extracts every account through child workflows and aggregates a summary."""
+    summary = await temporal_client.execute_workflow(
+        GitHubWorkflow.run,
+        {"accounts": ["testuser", "otheruser", "testuser"], "batch_concurrency": 2},
+        id="test-batch-workflow-id",
+        task_queue="github_extractor_task_queue",
+    )
+
+    # Duplicate accounts are extracted once.
+    assert summary["total_accounts"] == 2
+    assert len(summary["succeeded"]) + len(summary["failed"]) == 2
+
+def test_enriches_readme():
+    """Test README enrichment is detected, which forces the claim-check path."""
+    assert enriches_readme({"enrich": True})
+    assert enriches_readme({"enrich": ["topics", "readme"]})
+    assert not enriches_readme({"enrich": ["topics"]})
+    assert not enriches_readme({})
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cpu_task_queue, queue, schedule_to_start", [
+    (True, "github_extractor_task_queue-cpu", CPU_SCHEDULE_TO_START_TIMEOUT),
+    (False, None, None),
+])
+async def test_cpu_activities_fail_when_no_worker_polls_the_cpu_queue(cpu_task_queue, queue, schedule_to_start):
+    """Test CPU-queue activities get a schedule-to-start timeout, so a missing CPU worker fails the activity."""
+    with patch("app.workflow.workflow") as mock_workflow:
+        mock_workflow.info.return_value.task_queue = "github_extractor_task_queue"
+        mock_workflow.execute_activity = AsyncMock(return_value={})
+        await GitHubWorkflow()._run_account({"username": "testuser", "cpu_task_queue": cpu_task_queue})
+    calls = {call.args[0]: call.kwargs for call in mock_workflow.execute_activity.call_args_list}
+    for name in ("extract_keywords_activity", "fetch_data_quality_metrics_activity"):
+        assert calls[name]["task_queue"] == queue
+        assert calls[name]["schedule_to_start_timeout"] == schedule_to_start
+    assert "schedule_to_start_timeout" not in calls["fetch_repositories_metadata_activity"]
@@ -0,0 +1,55 @@
+import gzip
+import json
+
+import pytest
+
+from app.writers import RecordWriter, output_file_name, write_json, write_records
+
+
+@pytest.mark.parametrize("records", [[], [{"name": "repo1"}], [{"name": "repo1", "tags": ["a", "b"]}, {"name": "repo2", "description": None}]])
+@pytest.mark.asyncio
+async def test_json_output_matches_json_dump(tmp_path, records):
+    """Test the streamed JSON array is byte-identical to json.dump with indent=4."""
+    path = tmp_path / "repos.json"
+    await write_records(str(path), records)
+    assert path.read_text() == json.dumps(records, indent=4)
+
+
+@pytest.mark.asyncio
+async def test_ndjson_gzip_streams_chunks_in_order(tmp_path):
+    """Test chunks written one after another end up as compressed NDJSON lines in order."""
+    path = tmp_path / output_file_name("repos", "ndjson", "gzip")
+    async with RecordWriter(str(path), "ndjson", "gzip") as writer:
+        writer.write([{"name": "repo1"}])
+        writer.write([{"name": "repo2"}, {"name": "repo3"}])
+    assert path.name == "repos.ndjson.gz"
+    with gzip.open(path, "rt") as f:
+        assert [json.loads(line)["name"] for line in f] == ["repo1", "repo2", "repo3"]
+    assert writer.count == 3
+
+
+@pytest.mark.asyncio
+async def test_failure_keeps_previous_output(tmp_path):
+    """Test a writer interrupted by an error leaves the existing file untouched and no temporary file."""
+    path = tmp_path / "repos.json"
+    path.write_text("previous")
+    with pytest.raises(RuntimeError):
+        async with RecordWriter(str(path)) as writer:
+            writer.write([{"name": "repo1"}])
+            raise RuntimeError("listing failed")
+    assert path.read_text() == "previous"
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+@pytest.mark.asyncio
+async def test_write_json(tmp_path):
+    """Test a single document is written indented."""
+    path = tmp_path / "metrics.json"
+    await write_json(str(path), {"total_public_repos": 2})
+    assert path.read_text() == json.dumps({"total_public_repos": 2}, indent=4)
+
+
+def test_unknown_format_is_rejected():
+    """Test an unsupported output format fails fast."""
+    with pytest.raises(ValueError):
+        RecordWriter("repos.csv", output_format="csv")